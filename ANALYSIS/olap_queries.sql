@@ -1,63 +1,81 @@
 USE job_warehouse;
 
+-- These queries read the ETL-maintained aggregate tables
+-- (DATABASE DESIGN/aggregate_tables.sql) rather than FactJobPosting.
+
 -- 1. Job demand by industry
 SELECT
     i.industry_name AS industry,
-    COUNT(*) AS job_postings
-FROM FactJobPosting f
-JOIN DimIndustry i ON f.industry_id = i.industry_id
+    SUM(a.posting_count) AS job_postings
+FROM AggJobPostingDaily a
+JOIN DimIndustry i ON a.industry_id = i.industry_id
 GROUP BY i.industry_name
 ORDER BY job_postings DESC;
 
 -- 2. Job demand by location
 SELECT
     l.city AS location,
-    COUNT(*) AS job_postings
-FROM FactJobPosting f
-JOIN DimLocation l ON f.location_id = l.location_id
+    SUM(a.posting_count) AS job_postings
+FROM AggJobPostingDaily a
+JOIN DimLocation l ON a.location_id = l.location_id
 GROUP BY l.city
 ORDER BY job_postings DESC;
 
 -- 3. Top hiring companies
 SELECT
     c.company_name AS company,
-    COUNT(*) AS job_postings
-FROM FactJobPosting f
-JOIN DimCompany c ON f.company_id = c.company_id
+    SUM(a.posting_count) AS job_postings
+FROM AggCompanyPostings a
+JOIN DimCompany c ON a.company_id = c.company_id
 GROUP BY c.company_name
 ORDER BY job_postings DESC
 LIMIT 20;
 
 -- 4. Salary trend by industry (monthly)
 SELECT
-    t.year,
-    t.month,
+    t.posting_year AS year,
+    t.posting_month AS month,
     i.industry_name,
-    AVG(f.salary_min) AS avg_salary_min,
-    AVG(f.salary_max) AS avg_salary_max
-FROM FactJobPosting f
-JOIN DimTime t ON f.time_id = t.time_id
-JOIN DimIndustry i ON f.industry_id = i.industry_id
-WHERE f.salary_min IS NOT NULL
-  AND f.salary_max IS NOT NULL
-GROUP BY t.year, t.month, i.industry_name
-ORDER BY t.year, t.month;
+    SUM(a.salary_min_sum) / SUM(a.salary_count) AS avg_salary_min,
+    SUM(a.salary_max_sum) / SUM(a.salary_count) AS avg_salary_max
+FROM AggJobPostingDaily a
+JOIN DimTime t ON a.time_id = t.time_id
+JOIN DimIndustry i ON a.industry_id = i.industry_id
+WHERE a.salary_count > 0
+GROUP BY t.posting_year, t.posting_month, i.industry_name
+ORDER BY year, month;
 
 -- 5. Job posting trend by week
 SELECT
-    t.year,
+    t.posting_year AS year,
     WEEK(t.posting_date, 1) AS week_of_year,
-    COUNT(*) AS job_postings
-FROM FactJobPosting f
-JOIN DimTime t ON f.time_id = t.time_id
-GROUP BY t.year, WEEK(t.posting_date, 1)
-ORDER BY t.year, week_of_year;
+    SUM(a.posting_count) AS job_postings
+FROM AggJobPostingDaily a
+JOIN DimTime t ON a.time_id = t.time_id
+GROUP BY t.posting_year, WEEK(t.posting_date, 1)
+ORDER BY year, week_of_year;
 
 -- 6. Agency comparison
 SELECT
     s.agency_name AS agency,
-    COUNT(*) AS job_postings
-FROM FactJobPosting f
-JOIN DimSourceAgency s ON f.source_id = s.source_id
+    SUM(a.posting_count) AS job_postings
+FROM AggJobPostingDaily a
+JOIN DimSourceAgency s ON a.source_id = s.source_id
 GROUP BY s.agency_name
-ORDER BY job_postings DESC;
\ No newline at end of file
+ORDER BY job_postings DESC;
+
+-- 7. Posting detail for one month (reads FactJobPosting; the posting_date
+--    range prunes the scan to that month's partition, see
+--    DATABASE DESIGN/partition_fact_table.sql)
+SELECT
+    posting_date,
+    job_title,
+    company_name,
+    industry_name,
+    city,
+    salary_min,
+    salary_max
+FROM vw_job_summary
+WHERE posting_date >= '2024-01-01'
+  AND posting_date < '2024-02-01'
+ORDER BY posting_date;
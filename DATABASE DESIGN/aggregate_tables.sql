@@ -0,0 +1,99 @@
+-- aggregate_tables.sql
+-- Target platform: MySQL 8.0 (job_warehouse)
+--
+-- Summary tables kept up to date by the ETL: after each batch's fact insert
+-- the batch is grouped in memory and merged here with
+-- INSERT ... ON DUPLICATE KEY UPDATE (see ETL/helpers/aggregates.py), so the
+-- OLAP queries and views read a few thousand rows instead of the fact table.
+--
+-- Salary sums, counts and extremes are stored rather than averages so the
+-- averages can be re-derived at any roll-up:
+--     AVG(salary_min) = SUM(salary_min_sum) / SUM(salary_count)
+--
+-- Running this script on an existing warehouse creates the tables and
+-- rebuilds them from FactJobPosting; it is safe to re-run to repair drift.
+
+USE job_warehouse;
+
+-- Grain: posting day x industry x location x source agency
+CREATE TABLE IF NOT EXISTS AggJobPostingDaily (
+    time_id INT NOT NULL,
+    industry_id INT NOT NULL,
+    location_id INT NOT NULL,
+    source_id INT NOT NULL,
+    posting_count INT NOT NULL DEFAULT 0,
+    salary_count INT NOT NULL DEFAULT 0,  -- postings with both salary_min and salary_max
+    salary_min_sum DECIMAL(16,2) NOT NULL DEFAULT 0,
+    salary_max_sum DECIMAL(16,2) NOT NULL DEFAULT 0,
+    salary_min_min DECIMAL(10,2),
+    salary_max_max DECIMAL(10,2),
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (time_id, industry_id, location_id, source_id),
+    INDEX idx_agg_industry (industry_id),
+    INDEX idx_agg_location (location_id),
+    INDEX idx_agg_source (source_id)
+);
+
+-- Grain: company x industry (top companies, distinct companies per industry)
+CREATE TABLE IF NOT EXISTS AggCompanyPostings (
+    company_id INT NOT NULL,
+    industry_id INT NOT NULL,
+    posting_count INT NOT NULL DEFAULT 0,
+    salary_count INT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (company_id, industry_id),
+    INDEX idx_agg_company_industry (industry_id)
+);
+
+-- Rebuild from the fact table
+TRUNCATE TABLE AggJobPostingDaily;
+INSERT INTO AggJobPostingDaily (time_id, industry_id, location_id, source_id, posting_count, salary_count,
+                                salary_min_sum, salary_max_sum, salary_min_min, salary_max_max)
+SELECT
+    time_id,
+    industry_id,
+    location_id,
+    source_id,
+    COUNT(*),
+    SUM(salary_min IS NOT NULL AND salary_max IS NOT NULL),
+    COALESCE(SUM(CASE WHEN salary_max IS NOT NULL THEN salary_min END), 0),
+    COALESCE(SUM(CASE WHEN salary_min IS NOT NULL THEN salary_max END), 0),
+    MIN(CASE WHEN salary_max IS NOT NULL THEN salary_min END),
+    MAX(CASE WHEN salary_min IS NOT NULL THEN salary_max END)
+FROM FactJobPosting
+GROUP BY time_id, industry_id, location_id, source_id;
+
+TRUNCATE TABLE AggCompanyPostings;
+INSERT INTO AggCompanyPostings (company_id, industry_id, posting_count, salary_count)
+SELECT
+    company_id,
+    industry_id,
+    COUNT(*),
+    SUM(salary_min IS NOT NULL AND salary_max IS NOT NULL)
+FROM FactJobPosting
+GROUP BY company_id, industry_id;
+
+-- vw_industry_analysis now reads the aggregates. vw_job_summary lists
+-- individual postings, so it stays on FactJobPosting.
+CREATE OR REPLACE VIEW vw_industry_analysis AS
+SELECT
+    i.industry_name,
+    d.total_jobs,
+    d.jobs_with_salary,
+    d.avg_salary,
+    c.unique_companies
+FROM (
+    SELECT
+        industry_id,
+        SUM(posting_count) AS total_jobs,
+        SUM(salary_count) AS jobs_with_salary,
+        (SUM(salary_min_sum) + SUM(salary_max_sum)) / (2 * NULLIF(SUM(salary_count), 0)) AS avg_salary
+    FROM AggJobPostingDaily
+    GROUP BY industry_id
+) d
+JOIN (
+    SELECT industry_id, COUNT(*) AS unique_companies
+    FROM AggCompanyPostings
+    GROUP BY industry_id
+) c ON c.industry_id = d.industry_id
+JOIN DimIndustry i ON i.industry_id = d.industry_id;
@@ -0,0 +1,89 @@
+-- partition_fact_table.sql
+-- Target platform: MySQL 8.0 (job_warehouse)
+--
+-- Converts an existing FactJobPosting to RANGE COLUMNS(posting_date)
+-- partitioning with one partition per posting month, so date-bounded queries
+-- only read the months they ask for and old months can be dropped whole.
+--
+-- MySQL requires the partitioning column in every unique key and does not
+-- allow foreign keys on partitioned tables, so this script:
+--   * copies posting_date from DimTime onto each fact row,
+--   * adds posting_date to the primary key and unique_posting,
+--   * drops the six dimension foreign keys (the ETL resolves every key
+--     through its dimension cache before inserting).
+--
+-- Partitions are created for every month that already has rows, followed by
+-- pmax (MAXVALUE). With etl.partitioning.enabled the ETL splits new months
+-- off pmax before loading them and applies etl.partitioning.retention_months.
+-- With etl.maintain_aggregates the rows of dropped partitions are subtracted
+-- from the aggregate tables in the same maintenance step.
+
+USE job_warehouse;
+
+ALTER TABLE FactJobPosting
+    DROP FOREIGN KEY FactJobPosting_ibfk_1,
+    DROP FOREIGN KEY FactJobPosting_ibfk_2,
+    DROP FOREIGN KEY FactJobPosting_ibfk_3,
+    DROP FOREIGN KEY FactJobPosting_ibfk_4,
+    DROP FOREIGN KEY FactJobPosting_ibfk_5,
+    DROP FOREIGN KEY FactJobPosting_ibfk_6;
+
+ALTER TABLE FactJobPosting ADD COLUMN posting_date DATE NULL AFTER source_id;
+
+UPDATE FactJobPosting f
+JOIN DimTime t ON f.time_id = t.time_id
+SET f.posting_date = t.posting_date;
+
+ALTER TABLE FactJobPosting
+    MODIFY posting_date DATE NOT NULL,
+    DROP PRIMARY KEY,
+    ADD PRIMARY KEY (fact_id, posting_date),
+    DROP INDEX unique_posting,
+    ADD UNIQUE KEY unique_posting (time_id, company_id, job_id, industry_id, location_id, source_id, posting_date);
+
+-- One partition per month from the earliest to the latest posting
+SET @first_month = (SELECT CAST(DATE_FORMAT(COALESCE(MIN(posting_date), CURDATE()), '%Y-%m-01') AS DATE) FROM FactJobPosting);
+SET @last_month = (SELECT CAST(DATE_FORMAT(COALESCE(MAX(posting_date), CURDATE()), '%Y-%m-01') AS DATE) FROM FactJobPosting);
+SET SESSION group_concat_max_len = 1000000;
+
+WITH RECURSIVE months (month_start) AS (
+    SELECT CAST(@first_month AS DATE)
+    UNION ALL
+    SELECT month_start + INTERVAL 1 MONTH FROM months WHERE month_start < @last_month
+)
+SELECT GROUP_CONCAT(
+           CONCAT('PARTITION p', DATE_FORMAT(month_start, '%Y%m'),
+                  ' VALUES LESS THAN (''', month_start + INTERVAL 1 MONTH, ''')')
+           ORDER BY month_start SEPARATOR ', ')
+INTO @month_partitions
+FROM months;
+
+SET @partition_ddl = CONCAT(
+    'ALTER TABLE FactJobPosting PARTITION BY RANGE COLUMNS(posting_date) (',
+    @month_partitions,
+    ', PARTITION pmax VALUES LESS THAN (MAXVALUE))'
+);
+PREPARE partition_stmt FROM @partition_ddl;
+EXECUTE partition_stmt;
+DEALLOCATE PREPARE partition_stmt;
+
+-- Expose the fact's own posting_date so filters on the view prune partitions
+CREATE OR REPLACE VIEW vw_job_summary AS
+SELECT
+    j.job_title,
+    c.company_name,
+    i.industry_name,
+    l.city,
+    f.posting_date,
+    f.salary_min,
+    f.salary_max,
+    f.salary_avg,
+    s.agency_name,
+    j.experience_level,
+    j.education_level
+FROM FactJobPosting f
+JOIN DimJob j ON f.job_id = j.job_id
+JOIN DimCompany c ON f.company_id = c.company_id
+JOIN DimIndustry i ON f.industry_id = i.industry_id
+JOIN DimLocation l ON f.location_id = l.location_id
+JOIN DimSourceAgency s ON f.source_id = s.source_id;
@@ -0,0 +1,47 @@
+-- quarantine_table.sql
+-- Target platform: MySQL 8.0 (job_warehouse)
+--
+-- Postings the ETL's data quality gate kept out of the warehouse (see
+-- ETL/helpers/data_quality.py and data_quality in ETL/etl_config.yaml).
+-- Used when data_quality.quarantine_table is on; the rows are also written
+-- to ETL/state/quarantine/<run_id>.csv when quarantine_path is set.
+--
+-- source_row is the row's 0-based position among the data rows of
+-- source_file (header excluded, lines pandas skipped as malformed not
+-- counted), also when an incremental run read only the rows appended since.
+--
+-- reasons lists the codes of every rule a row failed, separated by ';':
+--     missing_<field>         a required_fields column is blank
+--     missing_posting_date    the posting date is missing or unparseable
+--     future_posting_date     the posting date is after the load date
+--     salary_below_min        salary_min < min_salary
+--     salary_above_max        salary_max > max_salary
+--     salary_min_above_max    salary_min > salary_max
+--     unresolved_<dimension>  no dimension key could be resolved for the row
+
+USE job_warehouse;
+
+CREATE TABLE IF NOT EXISTS QuarantineJobPostings (
+    quarantine_id INT AUTO_INCREMENT PRIMARY KEY,
+    run_id CHAR(32) NOT NULL,
+    source_file VARCHAR(255),
+    source_row INT,
+    reasons VARCHAR(255) NOT NULL,
+    job_title VARCHAR(255),
+    company_name VARCHAR(255),
+    industry VARCHAR(255),
+    location VARCHAR(100),
+    salary_range VARCHAR(100),
+    job_type VARCHAR(50),
+    experience_level VARCHAR(50),
+    education_level VARCHAR(100),
+    posting_date DATE,
+    source_agency VARCHAR(100),
+    salary_min DECIMAL(10,2),
+    salary_max DECIMAL(10,2),
+    quarantined_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_quarantine_run (run_id)
+);
+
+-- Rejections per rule and run
+-- SELECT run_id, reasons, COUNT(*) FROM QuarantineJobPostings GROUP BY run_id, reasons;
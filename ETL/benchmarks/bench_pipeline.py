@@ -0,0 +1,175 @@
+"""Time each ETL stage on synthetic postings and emit the results as JSON.
+
+Stages: generate, clean_data, transform_dataframe, merge_near_duplicates,
+drop_seen, load_to_staging, load_warehouse (split into its
+dimension/fact/aggregate/mark-processed steps), and the industry-demand
+query against the fact table and against the aggregate table. Each result carries seconds, rows, rows/sec, the
+stage's RSS and the process peak RSS so runs can be compared across commits.
+
+The default backend is an in-memory SQLite stand-in (no services needed).
+--backend mysql uses the database configured in .env; point DB_NAME at a
+scratch copy of the schema, the benchmark inserts into it.
+
+    cd ETL
+    python benchmarks/bench_pipeline.py --rows 100000
+    python benchmarks/bench_pipeline.py --rows 1000000 --output results.jsonl
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from etl_job_postings import JobETL, logger
+from helpers.cleaning_rules import transform_dataframe
+from helpers.dedup import SeenHashIndex
+from helpers.instrumentation import PipelineInstrumentation
+from sqlite_backend import SQLitePool
+from synthetic_data import generate_postings
+
+BACKENDS = ('sqlite', 'mysql')
+
+QUERIES = {
+    'query_fact_join': """
+        SELECT i.industry_name, COUNT(*) AS job_postings
+        FROM FactJobPosting f
+        JOIN DimIndustry i ON f.industry_id = i.industry_id
+        GROUP BY i.industry_name
+        ORDER BY job_postings DESC
+    """,
+    'query_aggregate': """
+        SELECT i.industry_name, SUM(a.posting_count) AS job_postings
+        FROM AggJobPostingDaily a
+        JOIN DimIndustry i ON a.industry_id = i.industry_id
+        GROUP BY i.industry_name
+        ORDER BY job_postings DESC
+    """,
+}
+
+class SQLiteJobETL(JobETL):
+    """JobETL on the embedded SQLite stand-in instead of a MySQL pool."""
+
+    def __init__(self, path=':memory:'):
+        self.sqlite_path = path
+        super().__init__()
+
+    def setup_database_connection(self):
+        self.pool = SQLitePool(self.sqlite_path)
+        self.connection = self.pool.get_connection()
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def make_etl(backend, sqlite_path):
+    etl = SQLiteJobETL(sqlite_path) if backend == 'sqlite' else JobETL()
+    # Measure the stages themselves, not state carried over from earlier runs:
+    # empty seen and near-duplicate indexes (never saved) still drop repeats
+    # within the batch
+    state_dir = tempfile.mkdtemp(prefix='bench_')
+    etl.seen_index = SeenHashIndex(os.path.join(state_dir, 'seen_postings.npy'))
+    etl.config['deduplication']['near_duplicate_index_path'] = os.path.join(state_dir, 'near_duplicates.json')
+    etl.near_duplicate_index = etl.load_near_duplicate_index()
+    etl.watermarks = None
+    etl.partitions = None
+    etl.config['etl']['parallel_dimensions'] = False
+    return etl
+
+def run(rows, backend='sqlite', seed=42, sqlite_path=':memory:'):
+    etl = make_etl(backend, sqlite_path)
+    metrics = PipelineInstrumentation()
+    # load_warehouse records its own sub-stages into the same run
+    etl.metrics = metrics
+
+    with metrics.stage('generate') as stage:
+        raw = generate_postings(rows, seed=seed)
+        stage.rows_out = len(raw)
+
+    with metrics.stage('clean_data', rows_in=len(raw)) as stage:
+        clean = etl.clean_data(raw)
+        stage.rows_out = len(clean)
+
+    with metrics.stage('transform_dataframe', rows_in=len(raw)) as stage:
+        stage.rows_out = len(transform_dataframe(raw, etl.config))
+
+    with metrics.stage('merge_near_duplicates', rows_in=len(clean)) as stage:
+        clean = etl.merge_near_duplicates(clean)
+        stage.rows_out = len(clean)
+
+    with metrics.stage('drop_seen', rows_in=len(clean)) as stage:
+        clean = etl.drop_seen_postings(clean)
+        stage.rows_out = len(clean)
+
+    with metrics.stage('load_to_staging', rows_in=len(clean)) as stage:
+        stage.rows_out = etl.load_to_staging(clean)
+        etl.connection.commit()
+
+    with metrics.stage('load_warehouse', rows_in=len(clean)) as stage:
+        stage.rows_out = len(etl.load_warehouse(clean))
+        etl.connection.commit()
+
+    cursor = etl.connection.cursor()
+    for name, query in QUERIES.items():
+        with metrics.stage(name) as stage:
+            cursor.execute(query)
+            stage.rows_out = len(cursor.fetchall())
+    cursor.close()
+    etl.connection.close()
+
+    stages = []
+    for summary in metrics.summary():
+        stages.append({
+            'stage': summary['stage'],
+            'seconds': round(summary['seconds'], 6),
+            'rows_in': summary['rows_in'],
+            'rows_out': summary['rows_out'],
+            'rows_per_sec': round(summary['rows_per_sec'], 1) if summary['rows_per_sec'] else None,
+            'rss_mb': round(summary['rss_mb'], 1) if summary['rss_mb'] else None,
+            'process_peak_rss_mb': round(summary['process_peak_rss_mb'], 1) if summary['process_peak_rss_mb'] else None,
+        })
+    return {
+        'benchmark': 'pipeline',
+        'run_id': metrics.run_id,
+        'started': metrics.started.isoformat(),
+        'backend': backend,
+        'rows': rows,
+        'seed': seed,
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'stages': stages,
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--backend', choices=BACKENDS, default='sqlite')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--sqlite-path', default=':memory:')
+    parser.add_argument('--output', help='append the result as one JSON line to this file')
+    args = parser.parse_args()
+
+    logger.setLevel('WARNING')
+    result = run(args.rows, args.backend, args.seed, args.sqlite_path)
+    if args.output:
+        with open(args.output, 'a', encoding='utf-8') as handle:
+            handle.write(json.dumps(result) + '\n')
+
+    print(f"{'stage':<28}{'rows':>10}{'seconds':>10}{'rows/sec':>12}{'RSS MiB':>10}")
+    for stage in result['stages']:
+        rows = stage['rows_out'] or stage['rows_in'] or 0
+        print(f"{stage['stage']:<28}{rows:>10}{stage['seconds']:>10.2f}"
+              f"{stage['rows_per_sec'] or 0:>12.0f}{stage['rss_mb'] or 0:>10.0f}")
+    if not args.output:
+        print(json.dumps(result))
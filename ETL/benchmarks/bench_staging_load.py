@@ -0,0 +1,66 @@
+"""Compare executemany and LOAD DATA LOCAL INFILE staging loads.
+
+Runs against the database configured in .env (by default the docker MySQL
+from docker/docker-compose.yml, which enables local_infile). The cleaned
+job.csv is replicated up to --rows and loaded once per method. Unprocessed
+StagingJobPostings rows are deleted before and after each run.
+
+    cd ETL
+    python benchmarks/bench_staging_load.py --rows 200000
+"""
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from etl_job_postings import JobETL, logger
+
+METHODS = ('executemany', 'load_data')
+
+def build_frame(etl, rows):
+    data_path = os.getenv('DATA_PATH', '../DATA COLLECTION LAYER/Source Systems/job.csv')
+    source = etl.clean_data(next(etl.extract(data_path)))
+    repeats = -(-rows // len(source))
+    return pd.concat([source] * repeats, ignore_index=True).head(rows)
+
+def run(rows, methods):
+    etl = JobETL()
+    etl.config['etl']['streaming'] = False
+    etl.watermarks = None
+    frame = build_frame(etl, rows)
+    results = []
+
+    for method in methods:
+        # Reconfigure the pool so allow_local_infile matches the method under
+        # test; its connections reconnect with it as they are borrowed
+        etl.load_method = method
+        etl.connection.close()
+        etl.pool.set_config(**etl.connection_config())
+        etl.connection = etl.pool.get_connection()
+
+        etl.clear_staging()
+        start = time.perf_counter()
+        loaded = etl.load_to_staging(frame)
+        etl.connection.commit()
+        elapsed = time.perf_counter() - start
+        etl.clear_staging()
+
+        results.append((method if etl.load_method == method else f"{method} (fell back)", loaded, elapsed))
+
+    etl.connection.close()
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--method', choices=METHODS, action='append')
+    args = parser.parse_args()
+
+    logger.setLevel('WARNING')
+    print(f"{'method':<24}{'rows':>10}{'seconds':>10}{'rows/sec':>12}")
+    for method, loaded, elapsed in run(args.rows, args.method or METHODS):
+        print(f"{method:<24}{loaded:>10}{elapsed:>10.2f}{loaded / elapsed:>12.0f}")
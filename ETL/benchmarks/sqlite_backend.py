@@ -0,0 +1,177 @@
+"""Embedded SQLite stand-in for the job_warehouse MySQL schema.
+
+Just enough of mysql.connector's connection/cursor/pool interface for JobETL
+to run unchanged: %s placeholders, INSERT IGNORE, NOW() and
+INSERT ... ON DUPLICATE KEY UPDATE are rewritten to SQLite syntax and
+sqlite3 errors surface as mysql.connector.Error. Timings are indicative only;
+use the docker MySQL for absolute numbers.
+"""
+import re
+import sqlite3
+from datetime import date, datetime
+
+from mysql.connector import Error
+
+sqlite3.register_adapter(date, lambda value: value.isoformat())
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(sep=' '))
+
+# Mirrors docker/backup.sql plus DATABASE DESIGN/aggregate_tables.sql and quarantine_table.sql;
+# NOCASE stands in for MySQL's case-insensitive collation on unique names
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS StagingJobPostings (
+    staging_id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp_col TIMESTAMP, job_title TEXT,
+    company_name TEXT, industry TEXT, location TEXT, salary_range TEXT, job_type TEXT,
+    experience_level TEXT, education_level TEXT, posting_date DATE, source_agency TEXT,
+    salary_min REAL, salary_max REAL, is_processed INTEGER DEFAULT 0, process_date TIMESTAMP,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE IF NOT EXISTS DimTime (
+    time_id INTEGER PRIMARY KEY AUTOINCREMENT, posting_date DATE NOT NULL UNIQUE, posting_day INTEGER,
+    posting_month INTEGER, posting_quarter INTEGER, posting_year INTEGER, posting_weekday TEXT, is_weekend INTEGER
+);
+CREATE TABLE IF NOT EXISTS DimCompany (
+    company_id INTEGER PRIMARY KEY AUTOINCREMENT, company_name TEXT NOT NULL UNIQUE COLLATE NOCASE,
+    company_type TEXT DEFAULT 'Private'
+);
+CREATE TABLE IF NOT EXISTS DimJob (
+    job_id INTEGER PRIMARY KEY AUTOINCREMENT, job_title TEXT NOT NULL, job_type TEXT,
+    experience_level TEXT, education_level TEXT
+);
+CREATE TABLE IF NOT EXISTS DimIndustry (
+    industry_id INTEGER PRIMARY KEY AUTOINCREMENT, industry_name TEXT NOT NULL UNIQUE COLLATE NOCASE
+);
+CREATE TABLE IF NOT EXISTS DimLocation (
+    location_id INTEGER PRIMARY KEY AUTOINCREMENT, city TEXT NOT NULL, province TEXT, UNIQUE (city, province)
+);
+CREATE TABLE IF NOT EXISTS DimSourceAgency (
+    source_id INTEGER PRIMARY KEY AUTOINCREMENT, agency_name TEXT NOT NULL UNIQUE COLLATE NOCASE, platform_type TEXT
+);
+CREATE TABLE IF NOT EXISTS FactJobPosting (
+    fact_id INTEGER PRIMARY KEY AUTOINCREMENT, time_id INTEGER NOT NULL REFERENCES DimTime (time_id),
+    company_id INTEGER NOT NULL REFERENCES DimCompany (company_id), job_id INTEGER NOT NULL REFERENCES DimJob (job_id),
+    industry_id INTEGER NOT NULL REFERENCES DimIndustry (industry_id),
+    location_id INTEGER NOT NULL REFERENCES DimLocation (location_id),
+    source_id INTEGER NOT NULL REFERENCES DimSourceAgency (source_id), job_count INTEGER DEFAULT 1,
+    salary_min REAL, salary_max REAL,
+    salary_avg REAL GENERATED ALWAYS AS ((salary_min + salary_max) / 2) STORED,
+    has_salary INTEGER GENERATED ALWAYS AS (salary_min IS NOT NULL) STORED,
+    load_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (time_id, company_id, job_id, industry_id, location_id, source_id)
+);
+CREATE INDEX IF NOT EXISTS idx_fact_industry ON FactJobPosting (industry_id);
+CREATE INDEX IF NOT EXISTS idx_fact_location ON FactJobPosting (location_id);
+CREATE TABLE IF NOT EXISTS AggJobPostingDaily (
+    time_id INTEGER NOT NULL, industry_id INTEGER NOT NULL, location_id INTEGER NOT NULL, source_id INTEGER NOT NULL,
+    posting_count INTEGER NOT NULL DEFAULT 0, salary_count INTEGER NOT NULL DEFAULT 0,
+    salary_min_sum REAL NOT NULL DEFAULT 0, salary_max_sum REAL NOT NULL DEFAULT 0,
+    salary_min_min REAL, salary_max_max REAL, updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (time_id, industry_id, location_id, source_id)
+);
+CREATE TABLE IF NOT EXISTS AggCompanyPostings (
+    company_id INTEGER NOT NULL, industry_id INTEGER NOT NULL, posting_count INTEGER NOT NULL DEFAULT 0,
+    salary_count INTEGER NOT NULL DEFAULT 0, updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (company_id, industry_id)
+);
+CREATE TABLE IF NOT EXISTS QuarantineJobPostings (
+    quarantine_id INTEGER PRIMARY KEY AUTOINCREMENT, run_id TEXT NOT NULL, source_file TEXT, source_row INTEGER,
+    reasons TEXT NOT NULL, job_title TEXT, company_name TEXT, industry TEXT, location TEXT, salary_range TEXT,
+    job_type TEXT, experience_level TEXT, education_level TEXT, posting_date DATE, source_agency TEXT,
+    salary_min REAL, salary_max REAL, quarantined_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE IF NOT EXISTS ETL_Logs (
+    log_id INTEGER PRIMARY KEY AUTOINCREMENT, log_type TEXT, process_name TEXT, record_count INTEGER,
+    status TEXT, error_message TEXT, start_time TIMESTAMP, end_time TIMESTAMP, duration_seconds INTEGER,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+VALUES_FUNCTION = re.compile(r"VALUES\((\w+)\)")
+
+def translate(sql):
+    sql = sql.replace("%s", "?").replace("INSERT IGNORE", "INSERT OR IGNORE").replace("UPDATE IGNORE", "UPDATE OR IGNORE").replace("NOW()", "CURRENT_TIMESTAMP")
+    if "ON DUPLICATE KEY UPDATE" in sql:
+        sql = sql.replace("ON DUPLICATE KEY UPDATE", "ON CONFLICT DO UPDATE SET")
+        sql = VALUES_FUNCTION.sub(r"excluded.\1", sql)
+        sql = sql.replace("LEAST(", "MIN(").replace("GREATEST(", "MAX(")
+    return sql
+
+class SQLiteCursor:
+    def __init__(self, connection, dictionary=False):
+        self._cursor = connection.cursor()
+        self._dictionary = dictionary
+
+    def execute(self, sql, params=()):
+        try:
+            self._cursor.execute(translate(sql), tuple(params or ()))
+        except sqlite3.Error as e:
+            raise Error(msg=str(e))
+
+    def executemany(self, sql, rows):
+        try:
+            self._cursor.executemany(translate(sql), rows)
+        except sqlite3.Error as e:
+            raise Error(msg=str(e))
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    def _row(self, row):
+        if row is None or not self._dictionary:
+            return row
+        return dict(zip([column[0] for column in self._cursor.description], row))
+
+    def fetchone(self):
+        return self._row(self._cursor.fetchone())
+
+    def fetchmany(self, size=1):
+        return [self._row(row) for row in self._cursor.fetchmany(size)]
+
+    def fetchall(self):
+        return [self._row(row) for row in self._cursor.fetchall()]
+
+    def close(self):
+        self._cursor.close()
+
+class SQLiteConnection:
+    """A borrowed handle on the shared database; close() returns it like a pooled connection."""
+
+    def __init__(self, database):
+        self._database = database
+
+    def cursor(self, dictionary=False, **kwargs):
+        return SQLiteCursor(self._database, dictionary)
+
+    def commit(self):
+        self._database.commit()
+
+    def rollback(self):
+        self._database.rollback()
+
+    def is_connected(self):
+        return True
+
+    def close(self):
+        pass
+
+class SQLitePool:
+    """Stands in for mysql.connector.pooling.MySQLConnectionPool over one SQLite database.
+
+    SQLite allows a single writer, so every borrowed connection shares one
+    handle; run it with etl.parallel_dimensions off.
+    """
+
+    def __init__(self, path=":memory:", pool_size=1):
+        self.pool_size = pool_size
+        self._database = sqlite3.connect(path, check_same_thread=False, detect_types=sqlite3.PARSE_DECLTYPES)
+        self._database.executescript(SCHEMA)
+
+    def get_connection(self):
+        return SQLiteConnection(self._database)
+
+    def close(self):
+        self._database.close()
@@ -0,0 +1,219 @@
+"""Generate synthetic job postings in the layout of Source Systems/job.csv.
+
+Industries, locations, experience and education levels come from the
+mappings in etl_config.yaml (plus a few of the unmapped spellings seen in the
+real file), salaries use the same string variants as the agencies do, and a
+share of rows are exact or near re-posts so deduplication has work to do.
+Output is reproducible for a given --seed.
+
+    cd ETL
+    python benchmarks/synthetic_data.py --rows 1000000 --output /tmp/postings.csv
+    python benchmarks/synthetic_data.py --rows 1000000 --files 6 --output /tmp/sources/
+"""
+import argparse
+import os
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import yaml
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'etl_config.yaml')
+COLUMNS = [
+    'Timestamp', 'Job Title', 'Company Name', 'Industry', 'Location', 'Salary', 'Job Type',
+    'Experience Level', 'Education Level', 'Posting Date', 'Source Agency',
+]
+
+SOURCE_AGENCIES = {
+    'Facebook Page': 0.33, 'CamHR': 0.19, 'BongThom': 0.17,
+    'LinkedIn Cambodia': 0.14, 'Khmer24 Jobs': 0.11, 'Jobify Cambodia': 0.06,
+}
+JOB_TYPES = {'Full-time': 0.94, 'Part-time': 0.02, 'Internship': 0.015, 'Contract': 0.015, 'Freelance': 0.01}
+# Raw spellings that the industry mapping does not cover
+UNMAPPED_INDUSTRIES = ['Catering', 'Clothing', 'General Business Services ', 'Hospitality ', 'Tech solution']
+JOB_ROLES = [
+    'Sales Executive', 'Marketing Executive', 'Digital Marketing Officer', 'Accountant', 'Finance Officer',
+    'HR Officer', 'Admin Assistant', 'IT Officer', 'Web Developer', 'Software Engineer', 'Data Analyst',
+    'Customer Service Representative', 'Cashier', 'Receptionist', 'Driver', 'Warehouse Supervisor',
+    'Teacher', 'Nurse', 'Chef', 'Waiter', 'Project Manager', 'Civil Engineer', 'Graphic Designer',
+    'Logistics Coordinator', 'Loan Officer', 'Credit Officer', 'Branch Manager', 'Seller', 'Barista',
+    'Security Guard', 'Electrician', 'Procurement Officer', 'Content Creator', 'Intern / Trainee',
+]
+JOB_LEVELS = ['', '', '', 'Senior ', 'Junior ', 'Assistant ', 'Head of ']
+COMPANY_WORDS = [
+    'Angkor', 'Mekong', 'Royal', 'Golden', 'Khmer', 'Capital', 'Prime', 'Asia', 'Pacific', 'Lotus',
+    'Star', 'Unity', 'Smart', 'Green', 'Metro', 'Naga', 'Sun', 'Blue', 'Phnom', 'Tonle',
+]
+COMPANY_SUFFIXES = ['Co., Ltd.', 'Group', 'Bank', 'Trading', 'Holdings', 'Plc.', 'Cambodia', 'Services']
+
+# Salary string variants and their share of postings
+SALARY_FORMATS = {
+    'usd_range': 0.55,  # USD 1,200 – 2,000
+    'usd_plain': 0.08,  # USD 300 - 500
+    'usd_suffix': 0.04,  # 300-500 USD
+    'negotiable': 0.17,
+    'not_disclosed': 0.13,
+    'above': 0.02,  # Above USD 4,000
+    'no_allowance': 0.01,
+}
+
+def load_vocabularies(config_path=CONFIG_PATH):
+    with open(config_path, 'r') as file:
+        rules = yaml.safe_load(file).get('cleaning_rules', {})
+    locations = list(rules.get('location_mapping', {}))
+    return {
+        'industries': list(rules.get('industry_mapping', {})) + UNMAPPED_INDUSTRIES,
+        'locations': locations,
+        # Postings are heavily concentrated in the capital
+        'location_weights': [0.9 if name == 'Phnom Penh' else 0.1 / max(len(locations) - 1, 1) for name in locations],
+        'experience': list(rules.get('experience_mapping', {})),
+        'education': list(rules.get('education_mapping', {})),
+    }
+
+def _zipf_choice(rng, size, count, exponent=1.1):
+    """Indices in [0, count) with a long-tailed popularity, like real hiring volume."""
+    weights = 1.0 / np.arange(1, count + 1) ** exponent
+    return rng.choice(count, size=size, p=weights / weights.sum())
+
+def _weighted(rng, choices, size):
+    names = list(choices)
+    weights = np.array([choices[name] for name in names], dtype=float)
+    return np.array(names, dtype=object)[rng.choice(len(names), size=size, p=weights / weights.sum())]
+
+def _thousands(values):
+    return pd.Series(values).map('{:,}'.format).to_numpy(dtype=object)
+
+def _salaries(rng, size):
+    formats = _weighted(rng, SALARY_FORMATS, size)
+    low = (np.round(rng.lognormal(np.log(550), 0.55, size) / 50) * 50).clip(100, 6000).astype(int)
+    high = (np.round(low * rng.uniform(1.3, 2.0, size) / 50) * 50).astype(int)
+    low_text, high_text = low.astype(str).astype(object), high.astype(str).astype(object)
+
+    salary = np.full(size, 'Negotiable (ព្រមព្រៀង)', dtype=object)
+    variants = {
+        'usd_range': 'USD ' + _thousands(low) + ' – ' + _thousands(high),
+        'usd_plain': 'USD ' + low_text + ' - ' + high_text,
+        'usd_suffix': low_text + '-' + high_text + ' USD',
+        'not_disclosed': np.full(size, 'Not disclosed  (មិនបានបញ្ជាក់)', dtype=object),
+        'above': 'Above USD ' + _thousands(high),
+        'no_allowance': np.full(size, 'No allowance provided', dtype=object),
+    }
+    for name, values in variants.items():
+        mask = formats == name
+        salary[mask] = values[mask]
+    return salary
+
+def _company_names(count):
+    """``count`` distinct names; numbered once the word combinations run out."""
+    index = np.arange(count)
+    words, suffixes = len(COMPANY_WORDS), len(COMPANY_SUFFIXES)
+    combinations = words * words * suffixes
+    names = (
+        pd.Series(np.array(COMPANY_WORDS, dtype=object)[index % words]) + ' '
+        + pd.Series(np.array(COMPANY_WORDS, dtype=object)[index // words % words]) + ' '
+        + pd.Series(np.array(COMPANY_SUFFIXES, dtype=object)[index // (words * words) % suffixes])
+    )
+    numbered = index >= combinations
+    names[numbered] = names[numbered] + ' ' + pd.Series(index[numbered] // combinations + 1, index=names.index[numbered]).astype(str)
+    return names.to_numpy(dtype=object)
+
+def _us_date(values):
+    """m/d/YYYY without zero padding, as the collection forms export it."""
+    return (values.dt.month.astype(str) + '/' + values.dt.day.astype(str) + '/' + values.dt.year.astype(str)).to_numpy()
+
+def generate_postings(
+    rows,
+    seed=42,
+    duplicate_rate=0.03,
+    near_duplicate_rate=0.02,
+    missing_rate=0.01,
+    end_date=date(2026, 1, 31),
+    days=365,
+    vocabularies=None,
+):
+    """A DataFrame of ``rows`` synthetic postings with job.csv's columns (all text)."""
+    rng = np.random.default_rng(seed)
+    vocab = vocabularies or load_vocabularies()
+
+    titles = np.array([level + role for role in JOB_ROLES for level in dict.fromkeys(JOB_LEVELS)], dtype=object)
+    companies = _company_names(max(50, rows // 25))
+    company_count = len(companies)
+    industries = np.array(vocab['industries'], dtype=object)
+    # A company always posts under the same industry
+    company_industry = industries[rng.choice(len(industries), company_count)]
+
+    company_index = _zipf_choice(rng, rows, company_count)
+    posting_offset = rng.integers(0, days, rows)
+    posting_date = pd.Series(pd.Timestamp(end_date) - pd.to_timedelta(posting_offset, unit='D'))
+    collected = posting_date + pd.to_timedelta(rng.integers(0, 7 * 86400, rows), unit='s')
+
+    frame = pd.DataFrame({
+        'Timestamp': _us_date(collected) + ' ' + (collected.dt.hour.astype(str) + collected.dt.strftime(':%M:%S')).to_numpy(),
+        'Job Title': titles[_zipf_choice(rng, rows, len(titles), exponent=0.8)],
+        'Company Name': companies[company_index],
+        'Industry': company_industry[company_index],
+        'Location': np.array(vocab['locations'], dtype=object)[
+            rng.choice(len(vocab['locations']), rows, p=vocab['location_weights'])
+        ],
+        'Salary': _salaries(rng, rows),
+        'Job Type': _weighted(rng, JOB_TYPES, rows),
+        'Experience Level': np.array(vocab['experience'], dtype=object)[rng.choice(len(vocab['experience']), rows)],
+        'Education Level': np.array(vocab['education'], dtype=object)[rng.choice(len(vocab['education']), rows)],
+        'Posting Date': _us_date(posting_date),
+        'Source Agency': _weighted(rng, SOURCE_AGENCIES, rows),
+    }, columns=COLUMNS)
+
+    # Exact re-posts, and near re-posts a few days later with a slightly different title
+    duplicates = rng.random(rows) < duplicate_rate
+    near = ~duplicates & (rng.random(rows) < near_duplicate_rate)
+    for mask in (duplicates, near):
+        targets = np.flatnonzero(mask)
+        if len(targets):
+            frame.iloc[targets] = frame.iloc[rng.integers(0, rows, len(targets))].to_numpy()
+    if near.any():
+        shifted = pd.to_datetime(frame.loc[near, 'Posting Date'], format='%m/%d/%Y') + \
+            pd.to_timedelta(rng.integers(0, 4, int(near.sum())), unit='D')
+        frame.loc[near, 'Posting Date'] = _us_date(shifted)
+        frame.loc[near, 'Job Title'] = frame.loc[near, 'Job Title'] + 's'
+
+    # Scattered blanks in the optional fields
+    for column in ('Salary', 'Experience Level', 'Education Level', 'Job Type'):
+        frame.loc[rng.random(rows) < missing_rate, column] = None
+    return frame
+
+def write_postings(rows, output, files=1, seed=42, chunk_rows=1_000_000, **options):
+    """Write ``rows`` postings to a CSV, or split by source agency into ``files`` CSVs in a directory."""
+    if files > 1:
+        os.makedirs(output, exist_ok=True)
+        paths = [os.path.join(output, f'postings_{index:02d}.csv') for index in range(files)]
+    else:
+        paths = [output]
+    for path in paths:
+        if os.path.exists(path):
+            os.remove(path)
+
+    for chunk_number, start in enumerate(range(0, rows, chunk_rows)):
+        # Seed per chunk so any scale is generated in bounded memory
+        frame = generate_postings(min(chunk_rows, rows - start), seed=seed + chunk_number, **options)
+        # One agency per file, round-robin when there are more agencies than files
+        agency_file = frame['Source Agency'].map({name: index % files for index, name in enumerate(SOURCE_AGENCIES)})
+        for index, path in enumerate(paths):
+            group = frame if files == 1 else frame[agency_file == index]
+            group.to_csv(path, mode='a', header=not os.path.exists(path), index=False)
+    return paths
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--output', required=True, help='CSV path, or a directory with --files > 1')
+    parser.add_argument('--files', type=int, default=1, help='split the postings into this many CSVs')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--duplicate-rate', type=float, default=0.03)
+    parser.add_argument('--near-duplicate-rate', type=float, default=0.02)
+    args = parser.parse_args()
+
+    for path in write_postings(
+        args.rows, args.output, args.files, args.seed,
+        duplicate_rate=args.duplicate_rate, near_duplicate_rate=args.near_duplicate_rate,
+    ):
+        print(path)
@@ -1,12 +1,39 @@
+import argparse
+import json
 import os
+import signal
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+import numpy as np
 import pandas as pd
-import mysql.connector
-from mysql.connector import Error
+from mysql.connector import Error, pooling
 import yaml
 from datetime import datetime
 import re
 from dotenv import load_dotenv
 import logging
+import schedule
+from tqdm import tqdm
+
+from helpers.aggregates import FACT_COLUMNS, merge_aggregates, read_fact_rows, retract_aggregates
+from helpers.bulk_loader import load_data_infile
+from helpers.cleaning_rules import (
+    NormalizationCache, clean_label, compile_rules, dedup_keys, fill_blank, fingerprint_keys, map_categories,
+    title_text
+)
+from helpers.data_quality import QualityGate, write_quarantine
+from helpers.dedup import NearDuplicateIndex, SeenHashIndex, drop_near_duplicates
+from helpers.dimension_cache import MISSING_KEY, DimensionKeyCache, plan_remap
+from helpers.instrumentation import PipelineInstrumentation
+from helpers.parallel import parallel_apply, resolve_workers
+from helpers.partitions import MonthlyPartitions
+from helpers.source_watcher import SourceWatcher
+from helpers.sources import read_concurrently, resolve_sources
+from helpers.staging_cache import StagingCache, settings_digest
+from helpers.summary import SummaryCache, compute_summary
+from helpers.watermark import WatermarkStore, open_slice
 
 # Load environment variables
 load_dotenv()
@@ -18,33 +45,232 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# A file, a directory of per-agency files or a glob
+DEFAULT_DATA_PATH = '../DATA COLLECTION LAYER/Source Systems'
+
+# Single anchored alternation over the three accepted salary layouts; the lazy
+# ".*?" prefix makes each branch behave like re.search, tried in order:
+#   USD 800 – 1,200  |  USD 300 - 500  |  300-500 USD
+# (?!\d) stops a number group from matching a prefix of a longer number, so
+# "USD 900 - 1200" falls through to the second branch instead of reading 120
+SALARY_RANGE_PATTERN = re.compile(
+    r'^(?:.*?USD\s*(?P<usd_min>\d{1,3}(?:,\d{3})*)(?!\d)\s*[–\-]\s*(?P<usd_max>\d{1,3}(?:,\d{3})*)(?!\d)'
+    r'|.*?USD\s*(?P<plain_min>\d+)(?!\d)\s*-\s*(?P<plain_max>\d+)(?!\d)'
+    r'|.*?(?P<suffix_min>\d+)(?!\d)\s*-\s*(?P<suffix_max>\d+)(?!\d)\s*USD)',
+    re.DOTALL
+)
+
+# Dimension -> (fact foreign key, natural key columns of the cleaned data)
+FACT_DIMENSIONS = {
+    'time': ('time_id', ['Posting Date']),
+    'company': ('company_id', ['Company Name']),
+    'job': ('job_id', ['Job Title', 'Job Type', 'Experience Level', 'Education Level']),
+    'industry': ('industry_id', ['Industry']),
+    'location': ('location_id', ['Location']),
+    'agency': ('source_id', ['Source Agency']),
+}
+
+# Low-cardinality source columns, read and cleaned as categoricals
+CATEGORY_COLUMNS = ['Industry', 'Location', 'Job Type', 'Experience Level', 'Education Level', 'Source Agency']
+
+# Free text cleaned per distinct value as well; their cardinality is far below the row count
+TEXT_COLUMNS = ['Company Name', 'Salary']
+
+# deduplication.fields -> cleaned source columns
+DEDUP_COLUMNS = {
+    'job_title': 'Job Title',
+    'company_name': 'Company Name',
+    'location': 'Location',
+    'posting_date': 'Posting Date',
+}
+
+# data_quality.required_fields -> cleaned source columns
+QUALITY_COLUMNS = {
+    'job_title': 'Job Title',
+    'company_name': 'Company Name',
+    'industry': 'Industry',
+    'location': 'Location',
+    'job_type': 'Job Type',
+    'experience_level': 'Experience Level',
+    'education_level': 'Education Level',
+    'source_agency': 'Source Agency',
+    'posting_date': 'Posting Date',
+}
+
 class JobETL:
     def __init__(self):
         self.config = self.load_config()
+        self.cleaners = self.label_cleaners()
+        self.normalization_cache = self.load_normalization_cache()
+        self.pool = None
         self.connection = None
+        self.seen_index = self.load_seen_index()
+        self.near_duplicate_index = self.load_near_duplicate_index()
+        self.watermarks = self.load_watermarks()
+        self.dimension_cache = DimensionKeyCache()
+        # Posting Date format per source file, fixed on its first chunk
+        self.date_formats = {}
+        self.partitions = self.load_partitions()
+        self.staging_cache = self.load_staging_cache()
+        self.summary_cache = self.load_summary_cache()
+        self.quality_gate = self.new_quality_gate()
+        self.load_method = self.config.get('etl', {}).get('load_method', 'executemany')
+        self.commit_policy = self.config.get('etl', {}).get('commit_policy', 'chunk')
+        self.executor = None
+        self.dimension_executor = None
+        # Set by the daemon so executors outlive a single pipeline run
+        self.keep_warm = False
+        self.metrics = self.new_instrumentation()
         self.setup_database_connection()
         
+    def __getstate__(self):
+        # Only the config travels to transform worker processes; connections,
+        # caches and the process pool stay in the parent
+        return {'config': self.config}
+    
+    def __setstate__(self, state):
+        self.config = state['config']
+        self.cleaners = self.label_cleaners()
+        # Every partition arrives with a fresh copy, so a cache would never be reused
+        self.normalization_cache = None
+    
     def load_config(self):
         """Load configuration from YAML file"""
         config_path = os.path.join(os.path.dirname(__file__), 'etl_config.yaml')
         with open(config_path, 'r') as file:
             return yaml.safe_load(file)
     
+    def label_cleaners(self):
+        """Cleaning function per text column, built once so the normalization cache can key on it"""
+        cleaning_rules = self.config.get('cleaning_rules', {})
+        mappings = {
+            'Industry': cleaning_rules.get('industry_mapping', {}),
+            'Location': cleaning_rules.get('location_mapping', {}),
+            'Experience Level': cleaning_rules.get('experience_mapping', {}),
+            'Education Level': cleaning_rules.get('education_mapping', {}),
+        }
+        cleaners = {'Job Title': title_text}
+        for column in TEXT_COLUMNS + CATEGORY_COLUMNS:
+            cleaners[column] = partial(clean_label, mapping=mappings.get(column))
+        return cleaners
+    
+    def load_normalization_cache(self):
+        """Remember cleaned labels across the chunks and runs of this instance, if configured"""
+        cache_size = self.config.get('etl', {}).get('normalization_cache_size', 100000)
+        return NormalizationCache(cache_size) if cache_size else None
+    
+    def load_seen_index(self):
+        """Open the on-disk index of postings already loaded, if configured"""
+        dedup_config = self.config.get('deduplication', {})
+        index_path = dedup_config.get('seen_index_path')
+        if not dedup_config.get('enabled', False) or not index_path:
+            return None
+        return SeenHashIndex(os.path.join(os.path.dirname(__file__), index_path))
+    
+    def load_near_duplicate_index(self):
+        """Open the index of recently loaded postings that near-duplicates are checked against, if configured"""
+        dedup_config = self.config.get('deduplication', {})
+        index_path = dedup_config.get('near_duplicate_index_path')
+        fields = dedup_config.get('fields', list(DEDUP_COLUMNS))
+        window = dedup_config.get('time_window_days', 7)
+        # Without a window it would only ever grow
+        if not dedup_config.get('enabled', False) or not index_path or 'posting_date' not in fields or not window:
+            return None
+        return NearDuplicateIndex(
+            os.path.join(os.path.dirname(__file__), index_path),
+            {field: DEDUP_COLUMNS[field] for field in fields},
+            window,
+            ('salary_min', 'salary_max') if dedup_config.get('match_salary', True) else None
+        )
+    
+    def load_watermarks(self):
+        """Open the per-source watermark store when incremental extraction is enabled"""
+        etl_config = self.config.get('etl', {})
+        if not etl_config.get('incremental', False):
+            return None
+        return WatermarkStore(os.path.join(os.path.dirname(__file__), etl_config['watermark_path']))
+    
+    def load_partitions(self):
+        """Track FactJobPosting's monthly partitions when partitioning is enabled"""
+        partition_config = self.config.get('etl', {}).get('partitioning', {})
+        if not partition_config.get('enabled', False):
+            return None
+        return MonthlyPartitions('FactJobPosting', partition_config.get('lookahead_months', 1))
+    
+    def load_staging_cache(self):
+        """Open the columnar cache of cleaned chunks when enabled"""
+        cache_config = self.config.get('etl', {}).get('staging_cache', {})
+        if not cache_config.get('enabled', False):
+            return None
+        try:
+            return StagingCache(
+                os.path.join(os.path.dirname(__file__), cache_config.get('path', 'state/staging_cache')),
+                cache_config.get('format', 'parquet')
+            )
+        except ImportError as e:
+            logger.warning(f"Staging cache disabled: {e}")
+            return None
+    
+    def new_instrumentation(self):
+        """Start a fresh set of per-stage metrics for one pipeline run"""
+        instrumentation_config = self.config.get('etl', {}).get('instrumentation', {})
+        profile_dir = instrumentation_config.get('profile_dir')
+        return PipelineInstrumentation(
+            profile=instrumentation_config.get('profile', False),
+            profile_dir=os.path.join(os.path.dirname(__file__), profile_dir) if profile_dir else None
+        )
+    
+    def save_metrics(self, status, error=None):
+        """Persist the run's stage metrics to the JSON-lines file and ETL_Logs"""
+        instrumentation_config = self.config.get('etl', {}).get('instrumentation', {})
+        metrics_path = instrumentation_config.get('metrics_path')
+        try:
+            if metrics_path:
+                self.metrics.write_jsonl(os.path.join(os.path.dirname(__file__), metrics_path))
+            self.metrics.dump_profiles()
+        except OSError as e:
+            logger.warning(f"Could not write stage metrics: {e}")
+        
+        if not instrumentation_config.get('write_etl_logs', True) or not self.connection:
+            return
+        try:
+            cursor = self.connection.cursor()
+            self.metrics.write_etl_logs(cursor, status, error)
+            self.connection.commit()
+            cursor.close()
+        except Error as e:
+            logger.warning(f"Could not write stage metrics to ETL_Logs: {e}")
+    
+    def connection_config(self):
+        """Connection arguments for the pool's connections"""
+        return {
+            'host': os.getenv('DB_HOST', 'localhost'),
+            'port': int(os.getenv('DB_PORT', 3307)),
+            'database': os.getenv('DB_NAME', 'job_warehouse'),
+            'user': os.getenv('DB_USER', 'admin'),
+            'password': os.getenv('DB_PASSWORD', 'admin123'),
+            'allow_local_infile': self.load_method == 'load_data'
+        }
+    
     def setup_database_connection(self):
-        """Establish database connection"""
+        """Create the connection pool and borrow the pipeline's connection from it"""
         try:
-            self.connection = mysql.connector.connect(
-                host=os.getenv('DB_HOST', 'localhost'),
-                port=int(os.getenv('DB_PORT', 3307)),
-                database=os.getenv('DB_NAME', 'job_warehouse'),
-                user=os.getenv('DB_USER', 'admin'),
-                password=os.getenv('DB_PASSWORD', 'admin123')
+            self.pool = pooling.MySQLConnectionPool(
+                pool_name='job_etl',
+                pool_size=self.config.get('etl', {}).get('pool_size', 4),
+                **self.connection_config()
             )
+            self.connection = self.pool.get_connection()
             logger.info("Connected to MySQL database")
         except Error as e:
             logger.error(f"Error connecting to MySQL: {e}")
             raise
     
+    def commit_stage(self):
+        """Commit a finished stage unless the whole chunk commits as one transaction"""
+        if self.commit_policy == 'stage':
+            self.connection.commit()
+    
     def extract_salary(self, salary_text):
         """Extract salary range from text"""
         if pd.isna(salary_text) or not salary_text:
@@ -56,339 +282,958 @@ class JobETL:
         if 'Not disclosed' in salary_str or 'Negotiable' in salary_str:
             return None, None
         
-        # Pattern for USD ranges
-        patterns = [
-            r'USD\s*(\d{1,3}(?:,\d{3})*)\s*[–\-]\s*(\d{1,3}(?:,\d{3})*)',  # USD 800 – 1,200
-            r'USD\s*(\d+)\s*-\s*(\d+)',  # USD 300 - 500
-            r'(\d+)\s*-\s*(\d+)\s*USD',  # 300-500 USD
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, salary_str)
-            if match:
-                min_sal = float(match.group(1).replace(',', ''))
-                max_sal = float(match.group(2).replace(',', ''))
-                return min_sal, max_sal
-        
-        # Handle single values like "USD 130 - 150"
-        single_pattern = r'USD\s*(\d+)\s*-\s*(\d+)'
-        match = re.search(single_pattern, salary_str)
+        match = SALARY_RANGE_PATTERN.match(salary_str)
         if match:
-            return float(match.group(1)), float(match.group(2))
+            min_sal = match.group('usd_min') or match.group('plain_min') or match.group('suffix_min')
+            max_sal = match.group('usd_max') or match.group('plain_max') or match.group('suffix_max')
+            return float(min_sal.replace(',', '')), float(max_sal.replace(',', ''))
         
         return None, None
     
-    def clean_data(self, df):
-        """Clean and transform the data"""
-        # Make a copy to avoid SettingWithCopyWarning
-        df = df.copy()
+    def extract_salary_columns(self, salary):
+        """Vectorized extract_salary over a Salary column, returning salary_min/salary_max"""
+        # Agencies repeat a few hundred salary strings; parse each distinct one once
+        codes, uniques = pd.factorize(salary)
+        text = pd.Series(np.asarray(uniques, dtype=object)).astype('string')
+        parts = text.str.extract(SALARY_RANGE_PATTERN)
         
-        # Convert date columns
-        df['Posting Date'] = pd.to_datetime(df['Posting Date'], errors='coerce').dt.date
-        df['Posting Date'] = df['Posting Date'].fillna(pd.Timestamp.now().date())
+        salary_min = parts['usd_min'].fillna(parts['plain_min']).fillna(parts['suffix_min'])
+        salary_max = parts['usd_max'].fillna(parts['plain_max']).fillna(parts['suffix_max'])
         
-        # Extract salary
-        df[['salary_min', 'salary_max']] = df['Salary'].apply(
-            lambda x: pd.Series(self.extract_salary(x))
+        # Skip non-disclosed salaries
+        undisclosed = text.str.contains('Not disclosed|Negotiable', regex=True).fillna(False)
+        
+        salary_min = pd.to_numeric(salary_min.str.replace(',', '', regex=False)).mask(undisclosed).astype(float)
+        salary_max = pd.to_numeric(salary_max.str.replace(',', '', regex=False)).mask(undisclosed).astype(float)
+        
+        # Code -1 (missing salary) picks the trailing NaN
+        return pd.DataFrame({
+            'salary_min': np.append(salary_min.to_numpy(), np.nan)[codes],
+            'salary_max': np.append(salary_max.to_numpy(), np.nan)[codes],
+        }, index=salary.index)
+    
+    def clean_data(self, df, date_format=None):
+        """Clean and transform the data, parsing posting dates in the source's date_format"""
+        parallel_config = self.config.get('etl', {}).get('parallel', {})
+        if parallel_config.get('enabled', False):
+            # Fixed before the split, so partitions cannot each detect their own
+            if date_format is None:
+                date_format = compile_rules(self.config).detect_date_format(df['Posting Date'])
+            workers = resolve_workers(parallel_config.get('workers'))
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(max_workers=workers)
+            # Without a partition_size every chunk is split evenly over the workers
+            df = parallel_apply(
+                df,
+                partial(self.clean_rows, date_format=date_format),
+                workers=workers,
+                partition_size=parallel_config.get('partition_size'),
+                executor=self.executor
+            )
+        else:
+            df = self.clean_rows(df, date_format)
+        
+        return df
+    
+    def merge_near_duplicates(self, df):
+        """Merge agency re-posts of the same job with slightly different titles
+        
+        Runs on the rows that passed the quality gate, so a rejected row never
+        stands in for a valid re-post of it. This compares rows with each
+        other, so it sees the whole chunk rather than clean_data's partitions,
+        and with the near-duplicate index of postings loaded by earlier
+        chunks and runs.
+        """
+        dedup_config = self.config.get('deduplication', {})
+        if not dedup_config.get('enabled', False):
+            return df
+        fields = {field: DEDUP_COLUMNS[field] for field in dedup_config.get('fields', DEDUP_COLUMNS)}
+        df, merged = drop_near_duplicates(
+            df,
+            fields,
+            dedup_config.get('similarity_threshold', 0.9),
+            dedup_config.get('time_window_days', 7),
+            ('salary_min', 'salary_max') if dedup_config.get('match_salary', True) else None,
+            dedup_config.get('generic_companies', []),
+            self.near_duplicate_index
         )
+        if merged:
+            logger.info(f"Merged {merged} near-duplicate postings")
+        return df
+    
+    def clean_rows(self, df, date_format=None):
+        """Row-local cleaning of a partition: dates, salary, text fields and mappings
         
-        # Replace NaN with None for database compatibility
-        df['salary_min'] = df['salary_min'].where(pd.notna(df['salary_min']), None)
-        df['salary_max'] = df['salary_max'].where(pd.notna(df['salary_max']), None)
+        Text columns come back as categoricals whose labels were cleaned once
+        each, rather than cleaning every cell. Posting dates are parsed in
+        date_format (detected from the partition when not given).
+        """
+        # Columns are only ever replaced, so a shallow copy keeps the
+        # caller's frame intact without duplicating its data
+        df = df.copy(deep=False)
+        # Only extract needs it, for the watermark
+        if 'Timestamp' in df:
+            del df['Timestamp']
         
-        # Clean text fields and replace NaN with empty strings
-        df['Job Title'] = df['Job Title'].fillna('').str.strip().str.title()
-        df['Company Name'] = df['Company Name'].fillna('').str.strip()
-        df['Industry'] = df['Industry'].fillna('').str.strip()
-        df['Location'] = df['Location'].fillna('').str.strip()
-        df['Job Type'] = df['Job Type'].fillna('').str.strip()
-        df['Experience Level'] = df['Experience Level'].fillna('').str.strip()
-        df['Education Level'] = df['Education Level'].fillna('').str.strip()
-        df['Source Agency'] = df['Source Agency'].fillna('').str.strip()
-        df['Salary'] = df['Salary'].fillna('').str.strip()
+        # Convert date columns, parsing each distinct date string once in
+        # the source's format
+        codes, uniques = pd.factorize(df['Posting Date'])
+        rules = compile_rules(self.config)
+        dates = rules.parse_dates(pd.Series(np.asarray(uniques, dtype=object)), date_format).dt.date
+        dates = np.append(dates.to_numpy(dtype=object), None)[codes]
+        df['Posting Date'] = pd.Series(dates, index=df.index)
+        quality_config = self.config.get('data_quality', {})
+        if not (quality_config.get('enabled', False) and quality_config.get('date_validation', False)):
+            # Without date validation a missing date defaults to the load date
+            df['Posting Date'] = df['Posting Date'].fillna(pd.Timestamp.now().date())
         
-        # Apply mappings
-        industry_mapping = self.config.get('cleaning_rules', {}).get('industry_mapping', {})
-        df['Industry'] = df['Industry'].replace(industry_mapping)
+        # Extract salary
+        df[['salary_min', 'salary_max']] = self.extract_salary_columns(df['Salary'])
         
-        location_mapping = self.config.get('cleaning_rules', {}).get('location_mapping', {})
-        df['Location'] = df['Location'].replace(location_mapping)
+        # Clean text fields (empty strings for blanks) and apply mappings,
+        # each distinct label once per process thanks to the normalization cache
+        for column, cleaner in self.cleaners.items():
+            df[column] = map_categories(df[column], cleaner, self.normalization_cache)
         
         return df
     
+    def source_date_format(self, source, chunk):
+        """The Posting Date format of a source file, fixed for every chunk read from it
+        
+        An ambiguous date such as 1/5/2026 would otherwise parse differently
+        depending on the values read with it. The format is pinned by
+        cleaning_rules.date_format, else kept from an earlier run in the
+        source's watermark, else detected on the first chunk of this read.
+        """
+        rules = compile_rules(self.config)
+        date_format = self.date_formats.get(source) or rules.date_format
+        if date_format is None:
+            if self.watermarks is not None:
+                date_format = self.watermarks.date_format(source)
+            if date_format is None:
+                date_format = rules.detect_date_format(chunk['Posting Date'])
+            self.date_formats[source] = date_format
+        return date_format
+    
+    def drop_seen_postings(self, df):
+        """Drop postings already loaded by a previous run or repeated within the batch"""
+        fields = self.config.get('deduplication', {}).get('fields', list(DEDUP_COLUMNS))
+        keys = dedup_keys(df[[DEDUP_COLUMNS[field] for field in fields]], self.normalization_cache)
+        df = df.assign(posting_fingerprint=fingerprint_keys(keys))
+        
+        fresh = ~(self.seen_index.contains(df['posting_fingerprint'].to_numpy())
+                  | df['posting_fingerprint'].duplicated().to_numpy())
+        skipped = len(df) - int(fresh.sum())
+        if skipped:
+            logger.info(f"Skipped {skipped} postings already loaded")
+        return df[fresh]
+    
+    def insert_frame(self, cursor, table, frame, ignore=False):
+        """Insert a DataFrame whose columns match the table, using the configured load method
+        
+        With ignore, rows whose unique key is already in the table are
+        skipped rather than failing the insert; the count returned is then
+        of the rows actually inserted.
+        """
+        if self.load_method == 'load_data':
+            try:
+                return load_data_infile(cursor, table, frame)
+            except Error as e:
+                logger.warning(f"LOAD DATA LOCAL INFILE into {table} failed ({e}); falling back to executemany")
+                self.load_method = 'executemany'
+        
+        insert_query = f"""
+            INSERT {'IGNORE ' if ignore else ''}INTO {table} ({', '.join(frame.columns)})
+            VALUES ({', '.join(['%s'] * len(frame.columns))})
+        """
+        records = frame.astype(object).where(frame.notna(), None).itertuples(index=False, name=None)
+        cursor.executemany(insert_query, list(records))
+        return cursor.rowcount if ignore and len(frame) else len(frame)
+    
+    def clear_staging(self):
+        """Delete unprocessed staging rows left behind by a failed run"""
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute("DELETE FROM StagingJobPostings WHERE is_processed = FALSE")
+            cleared = cursor.rowcount
+            self.connection.commit()
+            cursor.close()
+            if cleared > 0:
+                logger.info(f"Cleared {cleared} unprocessed staging records")
+        except Error as e:
+            logger.error(f"Error clearing staging: {e}")
+            self.connection.rollback()
+            raise
+    
     def load_to_staging(self, df):
         """Load data to staging table"""
         try:
             cursor = self.connection.cursor()
             
-            # Clear old unprocessed data
-            cursor.execute("DELETE FROM StagingJobPostings WHERE is_processed = FALSE")
-            
-            # Insert data
-            insert_query = """
-                INSERT INTO StagingJobPostings (
-                    timestamp_col, job_title, company_name, industry, location,
-                    salary_range, job_type, experience_level, education_level,
-                    posting_date, source_agency, salary_min, salary_max
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """
-            
-            records = []
-            for _, row in df.iterrows():
-                record = (
-                    datetime.now(),
-                    row['Job Title'] if pd.notna(row['Job Title']) else '',
-                    row['Company Name'] if pd.notna(row['Company Name']) else '',
-                    row['Industry'] if pd.notna(row['Industry']) else '',
-                    row['Location'] if pd.notna(row['Location']) else '',
-                    row['Salary'] if pd.notna(row['Salary']) else '',
-                    row['Job Type'] if pd.notna(row['Job Type']) else '',
-                    row['Experience Level'] if pd.notna(row['Experience Level']) else '',
-                    row['Education Level'] if pd.notna(row['Education Level']) else '',
-                    row['Posting Date'] if pd.notna(row['Posting Date']) else None,
-                    row['Source Agency'] if pd.notna(row['Source Agency']) else '',
-                    row['salary_min'] if pd.notna(row['salary_min']) else None,
-                    row['salary_max'] if pd.notna(row['salary_max']) else None
-                )
-                records.append(record)
+            staging = pd.DataFrame({
+                'timestamp_col': pd.Series(datetime.now(), index=df.index, dtype=object),
+                'job_title': fill_blank(df['Job Title']),
+                'company_name': fill_blank(df['Company Name']),
+                'industry': fill_blank(df['Industry']),
+                'location': fill_blank(df['Location']),
+                'salary_range': fill_blank(df['Salary']),
+                'job_type': fill_blank(df['Job Type']),
+                'experience_level': fill_blank(df['Experience Level']),
+                'education_level': fill_blank(df['Education Level']),
+                'posting_date': df['Posting Date'],
+                'source_agency': fill_blank(df['Source Agency']),
+                'salary_min': df['salary_min'],
+                'salary_max': df['salary_max']
+            }, index=df.index)
             
-            cursor.executemany(insert_query, records)
-            self.connection.commit()
+            self.insert_frame(cursor, 'StagingJobPostings', staging)
+            self.commit_stage()
             
-            logger.info(f"Loaded {len(records)} records to staging")
-            return len(records)
+            logger.info(f"Loaded {len(staging)} records to staging")
+            return len(staging)
             
         except Error as e:
             logger.error(f"Error loading to staging: {e}")
             self.connection.rollback()
             raise
     
-    def run_etl_pipeline(self):
-        """Execute the complete ETL pipeline"""
-        logger.info("Starting ETL pipeline...")
+    def extract(self, data_path):
+        """Yield the source CSV as DataFrames of at most etl.batch_size rows
+        
+        In incremental mode only rows past the source's watermark are read,
+        and the watermark is advanced (pending until save) once the last
+        chunk has been yielded. Chunks are indexed by data row in the whole
+        file (0-based, header excluded), however much of it this run reads.
+        """
+        etl_config = self.config.get('etl', {})
+        read_options = {
+            'quotechar': '"',
+            'skipinitialspace': True,
+            'encoding': 'utf-8',
+            'on_bad_lines': 'skip',
+            'dtype': {column: 'category' for column in CATEGORY_COLUMNS},
+        }
+        if etl_config.get('streaming', False):
+            read_options['chunksize'] = etl_config.get('batch_size', 10000)
+        
+        if self.watermarks is None:
+            source = data_path
+            plan = None
+        else:
+            plan = self.watermarks.plan(data_path)
+            if plan.start >= plan.end:
+                logger.info(f"No new records in {data_path} since the last run")
+                return
+            if plan.start > 0:
+                logger.info(f"Resuming {data_path} at byte {plan.start}")
+                read_options.update(header=None, names=plan.columns)
+            source = open_slice(data_path, plan.start, plan.end)
+        
+        reader = pd.read_csv(source, **read_options)
+        chunks = reader if 'chunksize' in read_options else [reader]
+        columns = plan.columns if plan else None
+        max_timestamp = None
+        end_row = plan.start_row if plan else 0
+        has_timestamp = None
         
         try:
-            # Step 1: Extract
-            data_path = os.getenv('DATA_PATH', '../DATA COLLECTION LAYER/Source Systems/job.csv')
-            df = pd.read_csv(data_path, quotechar='"', skipinitialspace=True, encoding='utf-8', on_bad_lines='skip')
-            logger.info(f"Extracted {len(df)} records from CSV")
-            
-            # Step 2: Transform
-            df_clean = self.clean_data(df)
-            logger.info("Data cleaning completed")
-            
-            # Step 3: Load to staging
-            staging_count = self.load_to_staging(df_clean)
-            
-            # Step 4: Run ETL process directly (no stored procedure)
+            for chunk in chunks:
+                if plan is not None:
+                    if plan.start_row:
+                        chunk.index = chunk.index + plan.start_row
+                    end_row += len(chunk)
+                    columns = list(chunk.columns)
+                    if has_timestamp is None:
+                        has_timestamp = 'Timestamp' in chunk.columns
+                        if not has_timestamp:
+                            logger.warning(
+                                f"{data_path} has no Timestamp column; only the byte offset is kept, "
+                                f"so rewrite detection is disabled and a rewritten file is read again in full"
+                            )
+                    if not has_timestamp:
+                        yield chunk
+                        continue
+                    timestamps = pd.to_datetime(
+                        chunk['Timestamp'], format=etl_config.get('timestamp_format'), errors='coerce'
+                    )
+                    if plan.loaded_until is not None:
+                        # File was rewritten: fall back to the Timestamp watermark
+                        fresh = ~(timestamps <= plan.loaded_until)
+                        chunk, timestamps = chunk[fresh], timestamps[fresh]
+                    if timestamps.notna().any():
+                        chunk_max = timestamps.max()
+                        max_timestamp = chunk_max if max_timestamp is None else max(max_timestamp, chunk_max)
+                yield chunk
+        finally:
+            if 'chunksize' in read_options:
+                reader.close()
+            if plan is not None:
+                source.close()
+        
+        if plan is not None:
+            self.watermarks.advance(
+                data_path, plan.end, columns or [], max_timestamp, end_row, self.date_formats.get(data_path)
+            )
+    
+    def preload_dimensions(self):
+        """Load natural key -> surrogate id maps for every dimension"""
+        try:
             cursor = self.connection.cursor()
+            self.dimension_cache.preload(cursor)
+            cursor.close()
+            logger.info(f"Preloaded {len(self.dimension_cache)} dimension members")
+        except Error as e:
+            logger.error(f"Error preloading dimensions: {e}")
+            raise
+    
+    def ensure_partitions(self, df):
+        """Split off fact partitions for new posting months before their rows arrive.
+        
+        Partition DDL commits implicitly, so this runs before the chunk's transaction starts.
+        """
+        try:
+            cursor = self.connection.cursor()
+            with self.metrics.stage('partitions', rows_in=len(df)) as stage:
+                created = self.partitions.ensure(cursor, df['Posting Date'])
+                stage.rows_out = len(created)
+            cursor.close()
+            if created:
+                logger.info(f"Created FactJobPosting partitions {', '.join(created)}")
+        except Error as e:
+            logger.error(f"Error creating fact partitions: {e}")
+            raise
+    
+    def resolve_dimension(self, name, frame):
+        """Resolve one dimension's keys on its own pooled connection, committing its new members"""
+        connection = self.pool.get_connection()
+        try:
+            cursor = connection.cursor()
+            with self.metrics.stage(f'dimension_{name}', rows_in=len(frame)) as stage:
+                ids, stage.rows_out = self.dimension_cache.resolve(cursor, name, frame)
+                connection.commit()
+            cursor.close()
+            return ids, stage.rows_out
+        except Error:
+            connection.rollback()
+            raise
+        finally:
+            connection.close()
+    
+    def load_warehouse(self, df, source=None):
+        """Insert new dimension members, then fact rows keyed by cached surrogate ids,
+        returning the index of the rows loaded
+        
+        Rows left with an unresolved dimension key are quarantined as coming
+        from source.
+        """
+        cursor = self.connection.cursor()
+        fact = pd.DataFrame(index=df.index)
+        
+        # Resolve dimension keys, inserting only members not seen before
+        if self.dimension_executor is not None:
+            # Each dimension upserts on its own connection; every one has
+            # committed before the fact rows reference it
+            futures = {
+                name: self.dimension_executor.submit(self.resolve_dimension, name, df[columns])
+                for name, (_, columns) in FACT_DIMENSIONS.items()
+            }
+            for name, (id_column, _) in FACT_DIMENSIONS.items():
+                try:
+                    fact[id_column], inserted = futures[name].result()
+                    logger.info(f"{name.title()} dimension populated ({inserted} new)")
+                except Error as e:
+                    logger.error(f"Error inserting {name} records: {e}")
+                    raise
+        else:
+            for name, (id_column, columns) in FACT_DIMENSIONS.items():
+                try:
+                    with self.metrics.stage(f'dimension_{name}', rows_in=len(df)) as stage:
+                        fact[id_column], stage.rows_out = self.dimension_cache.resolve(cursor, name, df[columns])
+                        self.commit_stage()
+                    logger.info(f"{name.title()} dimension populated ({stage.rows_out} new)")
+                except Error as e:
+                    logger.error(f"Error inserting {name} records: {e}")
+                    raise
+        
+        fact['salary_min'] = df['salary_min']
+        fact['salary_max'] = df['salary_max']
+        if self.partitions is not None:
+            # Partitioning column; partitioned tables cannot keep the
+            # dimension foreign keys, so the key cache is what enforces them
+            fact['posting_date'] = df['Posting Date']
+        
+        unresolved = {
+            f'unresolved_{name}': (fact[id_column] == MISSING_KEY).to_numpy()
+            for name, (id_column, _) in FACT_DIMENSIONS.items()
+        }
+        resolved = ~np.logical_or.reduce(list(unresolved.values()))
+        if not resolved.all():
+            logger.warning(f"Skipped {int((~resolved).sum())} records with unresolved dimension keys")
+            if self.quality_gate is not None:
+                _, rejected = self.quality_gate.split(df, unresolved)
+                self.quarantine(rejected, source)
+        fact = fact[resolved]
+        
+        # Insert into fact table
+        try:
+            maintain_aggregates = self.config.get('etl', {}).get('maintain_aggregates', False)
+            last_fact_id = None
+            if maintain_aggregates:
+                # Rows whose unique key is already loaded are skipped; the rows
+                # inserted are the ones above this id
+                cursor.execute("SELECT COALESCE(MAX(fact_id), 0) FROM FactJobPosting")
+                last_fact_id = cursor.fetchone()[0]
+            with self.metrics.stage('fact', rows_in=len(fact)) as stage:
+                # Dimension keys are matched collation-folded, while the seen
+                # index compares exact text: "Café Co" and "CAFE CO" pass it as
+                # two postings yet resolve to the same fact key
+                stage.rows_out = self.insert_frame(cursor, 'FactJobPosting', fact, ignore=True)
+            if stage.rows_out != len(fact):
+                logger.warning(f"Skipped {len(fact) - stage.rows_out} fact records already loaded")
             
-            # Insert new time records
-            try:
-                time_sql = """
-                INSERT IGNORE INTO DimTime (posting_date, posting_day, posting_month, posting_quarter, posting_year, posting_weekday, is_weekend)
-                SELECT DISTINCT 
-                    posting_date,
-                    DAY(posting_date),
-                    MONTH(posting_date),
-                    QUARTER(posting_date),
-                    YEAR(posting_date),
-                    DAYNAME(posting_date),
-                    DAYOFWEEK(posting_date) IN (1,7)
-                FROM StagingJobPostings
-                WHERE is_processed = FALSE
-                """
-                cursor.execute(time_sql)
-                self.connection.commit()
-                logger.info("Time dimension populated")
-            except Error as e:
-                logger.error(f"Error inserting time records: {e}")
-                raise
-            
-            # Insert new companies
-            try:
-                company_sql = """
-                INSERT IGNORE INTO DimCompany (company_name)
-                SELECT DISTINCT company_name
-                FROM StagingJobPostings
-                WHERE is_processed = FALSE
-                """
-                cursor.execute(company_sql)
-                self.connection.commit()
-                logger.info("Company dimension populated")
-            except Error as e:
-                logger.error(f"Error inserting companies: {e}")
-                raise
-            
-            # Insert new jobs
-            try:
-                job_sql = """
-                INSERT IGNORE INTO DimJob (job_title, job_type, experience_level, education_level)
-                SELECT DISTINCT 
-                    job_title,
-                    job_type,
-                    experience_level,
-                    education_level
-                FROM StagingJobPostings
-                WHERE is_processed = FALSE
-                """
-                cursor.execute(job_sql)
+            # Aggregates commit with the fact rows so the two never drift apart
+            if maintain_aggregates:
+                inserted = fact
+                if stage.rows_out != len(fact):
+                    inserted = read_fact_rows(cursor, "fact_id > %s", (last_fact_id,))
+                with self.metrics.stage('aggregates', rows_in=len(inserted)) as aggregate_stage:
+                    aggregate_stage.rows_out = merge_aggregates(cursor, inserted)
+            self.commit_stage()
+            logger.info(f"Fact table populated ({stage.rows_out} rows)")
+        except Error as e:
+            logger.error(f"Error inserting fact records: {e}")
+            self.connection.rollback()
+            raise
+        
+        # Mark as processed
+        try:
+            with self.metrics.stage('mark_processed') as stage:
+                cursor.execute("UPDATE StagingJobPostings SET is_processed = TRUE, process_date = NOW() WHERE is_processed = FALSE")
+                stage.rows_out = cursor.rowcount
+                self.commit_stage()
+            logger.info(f"{stage.rows_out} records marked as processed")
+        except Error as e:
+            logger.error(f"Error updating processed status: {e}")
+            raise
+        
+        cursor.close()
+        return fact.index
+    
+    def apply_retention(self):
+        """Archive and/or drop fact partitions older than the configured retention"""
+        partition_config = self.config.get('etl', {}).get('partitioning', {})
+        retention_months = partition_config.get('retention_months')
+        if self.partitions is None or not retention_months:
+            return
+        
+        try:
+            cursor = self.connection.cursor()
+            expired = self.partitions.expired(cursor, retention_months)
+            if partition_config.get('retention_mode', 'archive') == 'archive':
+                archive_dir = os.path.join(os.path.dirname(__file__), partition_config.get('archive_dir', 'archive'))
+                for partition in expired:
+                    path = self.partitions.export(cursor, partition, archive_dir)
+                    logger.info(f"Archived partition {partition.name} to {path}")
+            if expired and self.config.get('etl', {}).get('maintain_aggregates', False):
+                # Read before they are deleted: afterwards only the aggregates remember these rows
+                removed = pd.concat(
+                    [self.partitions.rows(cursor, partition, FACT_COLUMNS) for partition in expired],
+                    ignore_index=True
+                )
+                # Deleted and retracted in one commit; the drop's DDL commits
+                # implicitly, so it runs after and finds the partitions empty
+                for partition in expired:
+                    self.partitions.delete_rows(cursor, partition)
+                retracted = retract_aggregates(cursor, removed)
                 self.connection.commit()
-                logger.info("Job dimension populated")
-            except Error as e:
-                logger.error(f"Error inserting jobs: {e}")
-                raise
+                self.summary_cache.invalidate(self.metrics.run_id)
+                logger.info(f"Retracted {len(removed)} dropped fact rows from {retracted} aggregate rows")
+            self.partitions.drop(cursor, expired)
+            cursor.close()
+            if expired:
+                self.summary_cache.invalidate(self.metrics.run_id)
+                logger.info(f"Dropped {len(expired)} FactJobPosting partitions older than {retention_months} months")
+        except Error as e:
+            logger.error(f"Error applying partition retention: {e}")
+            raise
+    
+    def remap_job_levels(self):
+        """Rewrite existing DimJob members through experience_mapping / education_mapping
+        
+        Rows loaded before the mappings applied keep their raw levels, so the
+        same job would otherwise get a second member. Members whose remapped
+        key collates equal are merged into the lowest id: their facts are
+        repointed, and facts that would then duplicate a posting already under
+        that id are deleted (and retracted from the aggregates). Returns the
+        number of members merged.
+        """
+        if self.connection is None:
+            self.connection = self.pool.get_connection()
+        levels = [self.cleaners['Experience Level'], self.cleaners['Education Level']]
+        
+        def remap(values):
+            job_title, job_type, experience_level, education_level = values
+            remapped = [
+                clean(value) if isinstance(value, str) else value
+                for clean, value in zip(levels, (experience_level, education_level))
+            ]
+            return (job_title, job_type, *remapped)
+        
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute("SELECT job_id, job_title, job_type, experience_level, education_level FROM DimJob")
+            updates, merged = plan_remap(cursor.fetchall(), remap)
             
-            # Insert new industries
+            if updates:
+                cursor.executemany(
+                    "UPDATE DimJob SET job_title = %s, job_type = %s, experience_level = %s, education_level = %s "
+                    "WHERE job_id = %s",
+                    [values + (job_id,) for job_id, values in updates.items()]
+                )
+            duplicates = 0
+            if merged:
+                cursor.executemany(
+                    "UPDATE IGNORE FactJobPosting SET job_id = %s WHERE job_id = %s",
+                    [(survivor, job_id) for job_id, survivor in merged.items()]
+                )
+                # What IGNORE left behind duplicates a posting already under the surviving member
+                condition = f"job_id IN ({', '.join(['%s'] * len(merged))})"
+                removed = read_fact_rows(cursor, condition, list(merged))
+                duplicates = len(removed)
+                if duplicates:
+                    cursor.execute(f"DELETE FROM FactJobPosting WHERE {condition}", list(merged))
+                    if self.config.get('etl', {}).get('maintain_aggregates', False):
+                        retract_aggregates(cursor, removed)
+                cursor.execute(f"DELETE FROM DimJob WHERE {condition}", list(merged))
+            self.connection.commit()
+            cursor.close()
+        except Error as e:
+            logger.error(f"Error remapping DimJob levels: {e}")
+            self.connection.rollback()
+            raise
+        finally:
+            self.dimension_cache.clear()
+        
+        if updates or merged:
+            self.summary_cache.invalidate(uuid.uuid4().hex)
+        logger.info(
+            f"Remapped {len(updates)} DimJob members, merged {len(merged)} into existing ones "
+            f"and deleted {duplicates} duplicate facts"
+        )
+        return len(merged)
+    
+    def load_summary_cache(self):
+        """Open the summary cache, kept on disk when etl.summary_path is set"""
+        summary_path = self.config.get('etl', {}).get('summary_path')
+        return SummaryCache(os.path.join(os.path.dirname(__file__), summary_path) if summary_path else None)
+    
+    def new_quality_gate(self):
+        """The data_quality rules with fresh per-rule counts, or None when the gate is disabled"""
+        quality_config = self.config.get('data_quality', {})
+        if not quality_config.get('enabled', False):
+            return None
+        return QualityGate(quality_config, QUALITY_COLUMNS)
+    
+    def quarantine(self, rejected, source=None):
+        """Record rows kept out of the warehouse, with the reason codes of the rules they failed"""
+        quality_config = self.config.get('data_quality', {})
+        frame = pd.DataFrame({
+            'run_id': self.metrics.run_id,
+            'source_file': os.path.basename(source) if source else None,
+            'source_row': rejected.index,
+            'reasons': rejected['reasons'],
+            'job_title': fill_blank(rejected['Job Title']),
+            'company_name': fill_blank(rejected['Company Name']),
+            'industry': fill_blank(rejected['Industry']),
+            'location': fill_blank(rejected['Location']),
+            'salary_range': fill_blank(rejected['Salary']),
+            'job_type': fill_blank(rejected['Job Type']),
+            'experience_level': fill_blank(rejected['Experience Level']),
+            'education_level': fill_blank(rejected['Education Level']),
+            'posting_date': rejected['Posting Date'],
+            'source_agency': fill_blank(rejected['Source Agency']),
+            'salary_min': rejected['salary_min'],
+            'salary_max': rejected['salary_max']
+        }, index=rejected.index)
+        
+        quarantine_path = quality_config.get('quarantine_path')
+        if quarantine_path:
+            path = os.path.join(os.path.dirname(__file__), quarantine_path, f"{self.metrics.run_id}.csv")
+            write_quarantine(path, frame)
+        if quality_config.get('quarantine_table', False):
             try:
-                industry_sql = """
-                INSERT IGNORE INTO DimIndustry (industry_name)
-                SELECT DISTINCT industry
-                FROM StagingJobPostings
-                WHERE is_processed = FALSE
-                """
-                cursor.execute(industry_sql)
-                self.connection.commit()
-                logger.info("Industry dimension populated")
+                cursor = self.connection.cursor()
+                # Commits with the chunk, so a chunk that is retried is not quarantined twice
+                self.insert_frame(cursor, 'QuarantineJobPostings', frame)
+                cursor.close()
             except Error as e:
-                logger.error(f"Error inserting industries: {e}")
+                logger.error(f"Error quarantining records: {e}")
                 raise
+    
+    def open_cache_entry(self, source):
+        """The staging cache entry for this run's read of source, or None when there is nothing new to read"""
+        start, end = 0, None
+        if self.watermarks is not None:
+            plan = self.watermarks.plan(source)
+            if plan.start >= plan.end:
+                return None
+            start, end = plan.start, plan.end
+        return self.staging_cache.open(source, settings_digest(self.config), start, end)
+    
+    def replay_cache_entry(self, source, entry):
+        """Yield a fully cleaned source's unloaded chunks from the staging cache, advancing its watermark as extract would"""
+        logger.info(f"Reusing cleaned chunks of {os.path.basename(source)} from the staging cache")
+        for number, chunk in sorted(entry.chunks.items()):
+            if entry.is_loaded(number):
+                continue
+            with self.metrics.stage('cache_read', rows_in=chunk['rows']) as stage:
+                df_clean = entry.read_chunk(number)
+                stage.rows_out = len(df_clean)
+            yield chunk['rows_in'], df_clean, (entry, number)
+        
+        watermark = entry.manifest.get('watermark')
+        if self.watermarks is not None and watermark:
+            max_timestamp = watermark.get('max_timestamp')
+            self.watermarks.advance(
+                source, watermark['offset'], watermark['columns'], pd.Timestamp(max_timestamp) if max_timestamp else None,
+                watermark.get('rows'), watermark.get('date_format')
+            )
+    
+    def mark_loaded(self, receipt, rows=()):
+        """Record a committed chunk and the rows of it loaded in its staging cache entry, so
+        replays skip it and reads of the cache match the warehouse"""
+        if receipt is not None:
+            entry, number = receipt
+            entry.mark_loaded(number, rows)
+    
+    def read_staging_cache(self):
+        """Yield (source, cached row count, cleaned chunk, receipt) for every chunk of a complete
+        staging cache entry that has not been loaded yet"""
+        if self.staging_cache is None:
+            raise ValueError("Replaying needs etl.staging_cache enabled (and pyarrow installed)")
+        for entry, number in self.staging_cache.iter_chunks():
+            chunk = entry.chunks[number]
+            with self.metrics.stage('cache_read', rows_in=chunk['rows']) as stage:
+                df_clean = entry.read_chunk(number)
+                stage.rows_out = len(df_clean)
+            yield entry.manifest['source'], chunk['rows_in'], df_clean, (entry, number)
+    
+    def read_sources(self, data_path, sources=None):
+        """Yield (source, extracted row count, cleaned chunk, receipt) for every file matched by data_path
+        
+        Files are extracted and cleaned in up to etl.source_workers threads;
+        loading stays on the caller's thread. An explicit list of sources
+        overrides the data_path lookup. The receipt is the chunk's
+        (cache entry, number), or None when it is not cached.
+        """
+        etl_config = self.config.get('etl', {})
+        if sources is None:
+            sources = resolve_sources(data_path)
+        if not sources:
+            logger.warning(f"No source files found at {data_path}")
+            return
+        logger.info(f"Reading {len(sources)} source file(s) from {data_path}")
+        
+        parallel_config = etl_config.get('parallel', {})
+        if parallel_config.get('enabled', False) and self.executor is None:
+            # Created up front so source threads share one process pool
+            self.executor = ProcessPoolExecutor(max_workers=resolve_workers(parallel_config.get('workers')))
+        
+        def clean_chunks(source):
+            entry = self.open_cache_entry(source) if self.staging_cache is not None else None
+            if entry is not None and entry.complete:
+                yield from self.replay_cache_entry(source, entry)
+                return
             
-            # Insert new locations
-            try:
-                location_sql = """
-                INSERT IGNORE INTO DimLocation (city)
-                SELECT DISTINCT location
-                FROM StagingJobPostings
-                WHERE is_processed = FALSE
-                """
-                cursor.execute(location_sql)
-                self.connection.commit()
-                logger.info("Location dimension populated")
-            except Error as e:
-                logger.error(f"Error inserting locations: {e}")
-                raise
+            chunks = self.metrics.timed('extract', self.extract(source))
+            for chunk_number, df in enumerate(chunks, start=1):
+                date_format = self.source_date_format(source, df)
+                # Chunks cached by an earlier, interrupted run skip cleaning,
+                # and those it also loaded are not loaded again
+                if entry is not None and entry.has_chunk(chunk_number):
+                    if entry.is_loaded(chunk_number):
+                        continue
+                    with self.metrics.stage('cache_read', rows_in=len(df)) as stage:
+                        df_clean = entry.read_chunk(chunk_number)
+                        stage.rows_out = len(df_clean)
+                    yield len(df), df_clean, (entry, chunk_number)
+                    continue
+                
+                with self.metrics.stage('clean', rows_in=len(df)) as stage:
+                    df_clean = self.clean_data(df, date_format)
+                    stage.rows_out = len(df_clean)
+                if entry is not None:
+                    try:
+                        with self.metrics.stage('cache_write', rows_in=len(df_clean)) as stage:
+                            entry.write_chunk(chunk_number, df_clean, len(df))
+                            stage.rows_out = len(df_clean)
+                    except (OSError, ValueError) as e:
+                        logger.warning(f"Stopped caching {os.path.basename(source)}: {e}")
+                        entry = None
+                yield len(df), df_clean, (entry, chunk_number) if entry is not None else None
             
-            # Insert new source agencies
-            try:
-                agency_sql = """
-                INSERT IGNORE INTO DimSourceAgency (agency_name)
-                SELECT DISTINCT source_agency
-                FROM StagingJobPostings
-                WHERE is_processed = FALSE
-                """
-                cursor.execute(agency_sql)
-                self.connection.commit()
-                logger.info("Agency dimension populated")
-            except Error as e:
-                logger.error(f"Error inserting agencies: {e}")
-                raise
+            if entry is not None:
+                entry.finish(self.watermarks.pending(source) if self.watermarks is not None else None)
+                self.staging_cache.prune(entry)
+        
+        for source, (extracted, df_clean, receipt) in read_concurrently(
+            sources, clean_chunks, etl_config.get('source_workers', 1)
+        ):
+            yield source, extracted, df_clean, receipt
+    
+    def run_etl_pipeline(self, replay=False, sources=None, summary=True):
+        """Execute the complete ETL pipeline, returning the number of records loaded
+        
+        With replay, the cleaned chunks in the staging cache are loaded
+        instead of reading DATA_PATH; sources limits the run to those files.
+        """
+        logger.info("Starting ETL pipeline...")
+        self.metrics = self.new_instrumentation()
+        if self.connection is None:
+            self.connection = self.pool.get_connection()
+        
+        try:
+            data_path = os.getenv('DATA_PATH', DEFAULT_DATA_PATH)
+            extracted_count = 0
+            staging_count = 0
+            summary_invalidated = False
+            self.quality_gate = self.new_quality_gate()
+            self.date_formats = {}
+            # Once per run: every chunk's staging rows are marked processed by its own load
+            self.clear_staging()
+            # Kept across runs of a long-lived instance; emptied after a failed one
+            if not len(self.dimension_cache):
+                self.preload_dimensions()
             
-            # Insert into fact table
-            try:
-                fact_sql = """
-                INSERT INTO FactJobPosting (time_id, company_id, job_id, industry_id, location_id, source_id, salary_min, salary_max)
-                SELECT 
-                    t.time_id,
-                    c.company_id,
-                    j.job_id,
-                    i.industry_id,
-                    l.location_id,
-                    s.source_id,
-                    st.salary_min,
-                    st.salary_max
-                FROM StagingJobPostings st
-                JOIN DimTime t ON st.posting_date = t.posting_date
-                JOIN DimCompany c ON st.company_name = c.company_name
-                JOIN DimJob j ON st.job_title = j.job_title 
-                    AND st.job_type = j.job_type
-                    AND st.experience_level = j.experience_level
-                JOIN DimIndustry i ON st.industry = i.industry_name
-                JOIN DimLocation l ON st.location = l.city
-                JOIN DimSourceAgency s ON st.source_agency = s.agency_name
-                WHERE st.is_processed = FALSE
-                """
-                cursor.execute(fact_sql)
-                self.connection.commit()
-                logger.info("Fact table populated")
-            except Error as e:
-                logger.error(f"Error inserting fact records: {e}")
-                raise
+            parallel_dimensions = self.config.get('etl', {}).get('parallel_dimensions', False)
+            if parallel_dimensions and self.dimension_executor is None:
+                # One pooled connection stays with the pipeline itself
+                workers = min(len(FACT_DIMENSIONS), self.pool.pool_size - 1)
+                if workers > 1:
+                    self.dimension_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='dimension')
             
-            # Mark as processed
-            try:
-                cursor.execute("UPDATE StagingJobPostings SET is_processed = TRUE, process_date = NOW() WHERE is_processed = FALSE")
-                self.connection.commit()
-                logger.info("Records marked as processed")
-            except Error as e:
-                logger.error(f"Error updating processed status: {e}")
-                raise
+            # Stream the sources through clean -> stage -> load so memory stays
+            # bounded by the chunk size rather than the file size
+            chunks = self.read_staging_cache() if replay else self.read_sources(data_path, sources)
+            for chunk_number, (source, extracted, df_clean, receipt) in enumerate(chunks, start=1):
+                # Steps 1-2: Extract and transform (on the source threads)
+                extracted_count += extracted
+                logger.info(f"Extracted and cleaned {extracted} records from {os.path.basename(source)} (chunk {chunk_number})")
+                
+                # Only rows passing every data quality rule go on to the database
+                if self.quality_gate is not None:
+                    with self.metrics.stage('validate', rows_in=len(df_clean)) as stage:
+                        df_clean, rejected = self.quality_gate.check(df_clean)
+                        stage.rows_out = len(df_clean)
+                    if not rejected.empty:
+                        self.quarantine(rejected, source)
+                    if df_clean.empty:
+                        self.connection.commit()
+                        self.mark_loaded(receipt)
+                        continue
+                
+                with self.metrics.stage('merge_near_duplicates', rows_in=len(df_clean)) as stage:
+                    df_clean = self.merge_near_duplicates(df_clean)
+                    stage.rows_out = len(df_clean)
+                
+                if self.seen_index is not None:
+                    with self.metrics.stage('drop_seen', rows_in=len(df_clean)) as stage:
+                        df_clean = self.drop_seen_postings(df_clean)
+                        stage.rows_out = len(df_clean)
+                    if df_clean.empty:
+                        self.connection.commit()
+                        self.mark_loaded(receipt)
+                        continue
+                
+                if self.partitions is not None:
+                    self.ensure_partitions(df_clean)
+                
+                # Step 3: Load to staging
+                with self.metrics.stage('stage', rows_in=len(df_clean)) as stage:
+                    stage.rows_out = self.load_to_staging(df_clean)
+                staging_count += stage.rows_out
+                
+                # Step 4: Load dimensions and facts with in-memory key resolution
+                loaded = self.load_warehouse(df_clean, source)
+                with self.metrics.stage('commit'):
+                    self.connection.commit()
+                self.mark_loaded(receipt, loaded)
+                if not summary_invalidated:
+                    # The warehouse changed; the next summary is computed for this run
+                    self.summary_cache.invalidate(self.metrics.run_id)
+                    summary_invalidated = True
+                
+                if self.seen_index is not None:
+                    self.seen_index.add(df_clean['posting_fingerprint'].to_numpy())
+                if self.near_duplicate_index is not None:
+                    self.near_duplicate_index.add(df_clean)
             
-            cursor.close()
+            logger.info(f"Processed {staging_count} of {extracted_count} extracted records")
+            if self.normalization_cache is not None:
+                logger.debug(f"Normalization cache: {self.normalization_cache.stats()}")
+            if self.quality_gate is not None and self.quality_gate.rejected:
+                logger.warning(f"Quarantined {self.quality_gate.rejected} records failing data quality rules: {self.quality_gate.report()}")
             
+            # Only advance the watermark once every chunk has been loaded
+            if self.watermarks is not None:
+                self.watermarks.save()
+            self.apply_retention()
             logger.info("ETL pipeline completed successfully!")
+            self.save_metrics('COMPLETED')
             
             # Generate summary
-            self.generate_summary()
+            if summary:
+                self.print_summary(self.generate_summary())
+            return staging_count
             
         except Exception as e:
             logger.error(f"ETL pipeline failed: {e}")
+            if self.connection:
+                self.connection.rollback()
+                # Ids read back inside the rolled-back transaction no longer exist
+                self.dimension_cache.clear()
+            self.save_metrics('FAILED', str(e))
             raise
         finally:
+            # Only fingerprints of committed chunks are pending, so this is
+            # safe to persist even when a later chunk failed
+            if self.seen_index is not None:
+                self.seen_index.save()
+            if self.near_duplicate_index is not None:
+                self.near_duplicate_index.save()
+            if not self.keep_warm:
+                self.shutdown_executors()
             if self.connection:
+                # Returns the connection to the pool
                 self.connection.close()
-                logger.info("Database connection closed")
+                self.connection = None
+                logger.info("Database connection released")
+    
+    def shutdown_executors(self):
+        """Stop the transform process pool and the dimension threads"""
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+        if self.dimension_executor is not None:
+            self.dimension_executor.shutdown()
+            self.dimension_executor = None
     
-    def generate_summary(self):
-        """Generate summary report"""
+    def run_daemon(self, poll_interval=None):
+        """Poll DATA_PATH and load new rows in micro-batches until SIGINT/SIGTERM
+        
+        Config, the connection pool, dimension keys, the seen-postings index
+        and the worker pools stay warm between batches; incremental
+        extraction means each batch only reads the rows appended since the
+        last one.
+        """
+        daemon_config = self.config.get('etl', {}).get('daemon', {})
+        poll_interval = poll_interval or daemon_config.get('poll_interval', 5)
+        data_path = os.getenv('DATA_PATH', DEFAULT_DATA_PATH)
+        if self.watermarks is None:
+            logger.warning("etl.incremental is off; every micro-batch re-reads the changed files in full")
+        
+        watcher = SourceWatcher(data_path)
+        scheduler = schedule.Scheduler()
+        stop = threading.Event()
+        # Counter on a terminal, silent when logging to a file
+        progress = tqdm(desc='Postings loaded', unit=' postings', disable=None)
+        
+        def micro_batch():
+            changed, snapshot = watcher.changed()
+            if not changed:
+                return
+            try:
+                loaded = self.run_etl_pipeline(sources=changed, summary=daemon_config.get('summary', False))
+            except Exception:
+                # Already logged and rolled back; the files stay unacknowledged
+                # so the next poll retries them
+                return
+            watcher.acknowledge(snapshot, changed)
+            progress.update(loaded)
+        
+        for signal_number in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signal_number, lambda *_: stop.set())
+        scheduler.every(poll_interval).seconds.do(micro_batch)
+        self.keep_warm = True
+        logger.info(f"Watching {data_path} every {poll_interval}s")
         try:
-            # Reconnect if needed
-            if not self.connection or not self.connection.is_connected():
-                self.setup_database_connection()
-                
-            cursor = self.connection.cursor(dictionary=True)
-            
-            queries = {
-                'Total Jobs': "SELECT COUNT(*) as count FROM FactJobPosting",
-                'Jobs with Salary': "SELECT COUNT(*) as count FROM FactJobPosting WHERE salary_min IS NOT NULL",
-                'Unique Companies': "SELECT COUNT(DISTINCT company_id) as count FROM FactJobPosting",
-                'Top Industry': """
-                    SELECT i.industry_name, COUNT(*) as count 
-                    FROM FactJobPosting f
-                    JOIN DimIndustry i ON f.industry_id = i.industry_id
-                    GROUP BY i.industry_name 
-                    ORDER BY count DESC 
-                    LIMIT 1
-                """,
-                'Top Location': """
-                    SELECT l.city, COUNT(*) as count 
-                    FROM FactJobPosting f
-                    JOIN DimLocation l ON f.location_id = l.location_id
-                    GROUP BY l.city 
-                    ORDER BY count DESC 
-                    LIMIT 1
-                """
-            }
-            
-            print("\n" + "="*50)
-            print("ETL SUMMARY REPORT")
-            print("="*50)
-            for title, query in queries.items():
-                cursor.execute(query)
-                result = cursor.fetchone()
-                if result and 'count' in result:
-                    print(f"{title:20}: {result['count']}")
-                elif result:
-                    print(f"{title:20}: {result}")
-                else:
-                    print(f"{title:20}: 0")
-            print("="*50)
-            
+            micro_batch()
+            while not stop.is_set():
+                scheduler.run_pending()
+                stop.wait(min(1, poll_interval))
+        finally:
+            self.keep_warm = False
+            self.shutdown_executors()
+            progress.close()
+            logger.info("ETL daemon stopped")
+    
+    def generate_summary(self, refresh=False):
+        """Summary figures of the warehouse as a dict, or None on a database error
+        
+        Computed once after each run that loaded rows (tagged with its
+        run_id) and served from the summary cache until the next one;
+        refresh recomputes regardless.
+        """
+        summary = None if refresh else self.summary_cache.get()
+        if summary is not None:
+            return summary
+        run_id = self.summary_cache.run_id
+        try:
+            # Borrow a pooled connection when called outside a pipeline run
+            connection = self.connection or self.pool.get_connection()
+            cursor = connection.cursor()
+            figures = compute_summary(cursor, self.config.get('etl', {}).get('maintain_aggregates', False))
             cursor.close()
-            
+            if connection is not self.connection:
+                connection.close()
         except Error as e:
             logger.error(f"Error generating summary: {e}")
+            return None
+        return self.summary_cache.put(figures, run_id)
+    
+    def print_summary(self, summary):
+        """Print generate_summary's figures as the end-of-run report"""
+        if summary is None:
+            return
+        lines = {
+            'Total Jobs': summary['total_jobs'],
+            'Jobs with Salary': summary['jobs_with_salary'],
+            'Unique Companies': summary['unique_companies'],
+        }
+        for title, key, name in (('Top Industry', 'top_industry', 'industry_name'), ('Top Location', 'top_location', 'city')):
+            top = summary[key]
+            lines[title] = f"{top[name]} ({top['count']})" if top else '-'
+        
+        print("\n" + "="*50)
+        print("ETL SUMMARY REPORT")
+        print("="*50)
+        for title, value in lines.items():
+            print(f"{title:20}: {value}")
+        print("="*50)
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Load the job posting sources into the warehouse')
+    parser.add_argument('--replay', action='store_true',
+                        help='load the cleaned chunks in the staging cache instead of reading DATA_PATH')
+    parser.add_argument('--daemon', action='store_true',
+                        help='keep running and load new source rows in micro-batches as they arrive')
+    parser.add_argument('--interval', type=float,
+                        help='seconds between polls in daemon mode (default etl.daemon.poll_interval)')
+    parser.add_argument('--summary', action='store_true',
+                        help='print the warehouse summary as JSON instead of running the pipeline')
+    parser.add_argument('--remap-job-levels', action='store_true',
+                        help='rewrite existing DimJob members through experience_mapping / education_mapping and exit')
+    args = parser.parse_args()
+    
     etl = JobETL()
-    etl.run_etl_pipeline()
\ No newline at end of file
+    if args.summary:
+        print(json.dumps(etl.generate_summary(), indent=2))
+    elif args.remap_job_levels:
+        try:
+            etl.remap_job_levels()
+        finally:
+            etl.connection.close()
+    elif args.daemon:
+        etl.run_daemon(args.interval)
+    else:
+        etl.run_etl_pipeline(replay=args.replay)
\ No newline at end of file
@@ -0,0 +1,145 @@
+# aggregates.py
+from typing import Dict, List, NamedTuple
+
+import pandas as pd
+
+class Aggregate(NamedTuple):
+    table: str
+    keys: List[str]
+    # measure column -> how a batch delta merges into the stored value
+    measures: Dict[str, str]
+
+# See "DATABASE DESIGN/aggregate_tables.sql"
+AGGREGATES = [
+    Aggregate(
+        "AggJobPostingDaily",
+        ["time_id", "industry_id", "location_id", "source_id"],
+        {
+            "posting_count": "sum",
+            "salary_count": "sum",
+            "salary_min_sum": "sum",
+            "salary_max_sum": "sum",
+            "salary_min_min": "min",
+            "salary_max_max": "max",
+        },
+    ),
+    Aggregate(
+        "AggCompanyPostings",
+        ["company_id", "industry_id"],
+        {
+            "posting_count": "sum",
+            "salary_count": "sum",
+        },
+    ),
+]
+
+# Grouping keys per statement when aggregate rows are addressed by key
+KEY_BATCH_SIZE = 500
+
+# FactJobPosting columns the aggregates are grouped and measured from
+FACT_COLUMNS = list(dict.fromkeys(key for aggregate in AGGREGATES for key in aggregate.keys)) + ["salary_min", "salary_max"]
+
+MERGE_EXPRESSIONS = {
+    "sum": "{column} = {column} + VALUES({column})",
+    "min": "{column} = LEAST(COALESCE({column}, VALUES({column})), COALESCE(VALUES({column}), {column}))",
+    "max": "{column} = GREATEST(COALESCE({column}, VALUES({column})), COALESCE(VALUES({column}), {column}))",
+}
+
+def _measure_frame(fact: pd.DataFrame) -> pd.DataFrame:
+    """Per-posting measure values; salaries only count when both ends are known."""
+    salaried = fact["salary_min"].notna() & fact["salary_max"].notna()
+    salary_min = pd.to_numeric(fact["salary_min"]).where(salaried)
+    salary_max = pd.to_numeric(fact["salary_max"]).where(salaried)
+    return fact.assign(
+        posting_count=1,
+        salary_count=salaried.astype(int),
+        salary_min_sum=salary_min.fillna(0),
+        salary_max_sum=salary_max.fillna(0),
+        salary_min_min=salary_min,
+        salary_max_max=salary_max,
+    )
+
+def aggregate_deltas(fact: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """Group a batch of fact rows to each aggregate's grain."""
+    if fact.empty:
+        return {aggregate.table: pd.DataFrame() for aggregate in AGGREGATES}
+    measures = _measure_frame(fact)
+    deltas = {}
+    for aggregate in AGGREGATES:
+        delta = measures.groupby(aggregate.keys, sort=False).agg(aggregate.measures).reset_index()
+        for column in ("salary_min_sum", "salary_max_sum", "salary_min_min", "salary_max_max"):
+            if column in delta:
+                delta[column] = delta[column].round(2)
+        deltas[aggregate.table] = delta
+    return deltas
+
+def _merge(cursor, aggregate: Aggregate, delta: pd.DataFrame) -> None:
+    columns = aggregate.keys + list(aggregate.measures)
+    updates = ", ".join(
+        MERGE_EXPRESSIONS[how].format(column=column) for column, how in aggregate.measures.items()
+    )
+    records = delta[columns].astype(object).where(delta[columns].notna(), None)
+    cursor.executemany(
+        f"INSERT INTO {aggregate.table} ({', '.join(columns)}) "
+        f"VALUES ({', '.join(['%s'] * len(columns))}) "
+        f"ON DUPLICATE KEY UPDATE {updates}",
+        list(records.itertuples(index=False, name=None)),
+    )
+
+def merge_aggregates(cursor, fact: pd.DataFrame) -> int:
+    """Add a batch's deltas into the aggregate tables; the caller commits with the fact insert."""
+    merged = 0
+    deltas = aggregate_deltas(fact)
+    for aggregate in AGGREGATES:
+        delta = deltas[aggregate.table]
+        if delta.empty:
+            continue
+        _merge(cursor, aggregate, delta)
+        merged += len(delta)
+    return merged
+
+def _key_condition(keys: List[str], count: int) -> str:
+    row = "(" + ", ".join(["%s"] * len(keys)) + ")"
+    return f"({', '.join(keys)}) IN ({', '.join([row] * count)})"
+
+def retract_aggregates(cursor, removed: pd.DataFrame) -> int:
+    """Take fact rows that have been deleted from FactJobPosting back out of the aggregate tables.
+
+    Sums are subtracted and groups left without postings are deleted. A
+    minimum or maximum cannot be subtracted, so aggregates carrying one
+    have their touched groups rebuilt from the fact rows that remain; for
+    AggJobPostingDaily that is one day's postings per group. The caller
+    commits.
+    """
+    retracted = 0
+    deltas = aggregate_deltas(removed)
+    for aggregate in AGGREGATES:
+        delta = deltas[aggregate.table]
+        if delta.empty:
+            continue
+        key_rows = list(delta[aggregate.keys].astype(object).itertuples(index=False, name=None))
+        if all(how == "sum" for how in aggregate.measures.values()):
+            updates = ", ".join(f"{column} = {column} - %s" for column in aggregate.measures)
+            matches = " AND ".join(f"{key} = %s" for key in aggregate.keys)
+            records = delta[list(aggregate.measures) + aggregate.keys].astype(object)
+            cursor.executemany(
+                f"UPDATE {aggregate.table} SET {updates} WHERE {matches}",
+                list(records.itertuples(index=False, name=None)),
+            )
+            cursor.execute(f"DELETE FROM {aggregate.table} WHERE posting_count <= 0")
+        else:
+            for start in range(0, len(key_rows), KEY_BATCH_SIZE):
+                batch = key_rows[start:start + KEY_BATCH_SIZE]
+                condition = _key_condition(aggregate.keys, len(batch))
+                params = [value for row in batch for value in row]
+                cursor.execute(f"DELETE FROM {aggregate.table} WHERE {condition}", params)
+                remaining = aggregate_deltas(read_fact_rows(cursor, condition, params))[aggregate.table]
+                if not remaining.empty:
+                    _merge(cursor, aggregate, remaining)
+        retracted += len(delta)
+    return retracted
+
+def read_fact_rows(cursor, condition: str, params=()) -> pd.DataFrame:
+    """FACT_COLUMNS of the FactJobPosting rows matching ``condition``, e.g. to aggregate rows already inserted."""
+    cursor.execute(f"SELECT {', '.join(FACT_COLUMNS)} FROM FactJobPosting WHERE {condition}", params)
+    return pd.DataFrame(cursor.fetchall(), columns=FACT_COLUMNS)
@@ -0,0 +1,58 @@
+# bulk_loader.py
+import os
+import tempfile
+from typing import Optional
+
+import pandas as pd
+
+NULL_MARKER = r"\N"
+# Backslash first so the escapes added afterwards are not escaped again
+TSV_ESCAPES = (("\\", "\\\\"), ("\t", "\\t"), ("\n", "\\n"), ("\r", "\\r"), ("\0", "\\0"))
+
+def _tsv_column(values: pd.Series) -> pd.Series:
+    missing = values.isna()
+    if pd.api.types.is_bool_dtype(values):
+        text = values.astype(int).astype(str)
+    elif pd.api.types.is_numeric_dtype(values):
+        text = values.astype(str)
+    elif pd.api.types.is_datetime64_any_dtype(values):
+        text = values.dt.strftime("%Y-%m-%d %H:%M:%S")
+    else:
+        text = values.astype(str)
+        for raw, escaped in TSV_ESCAPES:
+            text = text.str.replace(raw, escaped, regex=False)
+    return text.mask(missing, NULL_MARKER)
+
+def write_tsv(frame: pd.DataFrame, handle) -> int:
+    """Write ``frame`` in LOAD DATA's default text format (tab/newline, \\-escaped, \\N nulls)."""
+    if frame.empty:
+        return 0
+    columns = [_tsv_column(frame[name]) for name in frame.columns]
+    lines = columns[0].str.cat(columns[1:], sep="\t") if len(columns) > 1 else columns[0]
+    handle.write("\n".join(lines))
+    handle.write("\n")
+    return len(frame)
+
+def load_data_infile(cursor, table: str, frame: pd.DataFrame, tmp_dir: Optional[str] = None) -> int:
+    """Bulk load ``frame`` into ``table`` (same column names) through a temporary TSV file.
+
+    The connection must be opened with allow_local_infile=True and the server
+    must run with local_infile=ON.
+    """
+    if frame.empty:
+        return 0
+    fd, path = tempfile.mkstemp(prefix=f"{table}_", suffix=".tsv", dir=tmp_dir)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as handle:
+            write_tsv(frame, handle)
+        cursor.execute(
+            f"LOAD DATA LOCAL INFILE %s INTO TABLE {table} "
+            "CHARACTER SET utf8mb4 "
+            "FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' "
+            "LINES TERMINATED BY '\\n' "
+            f"({', '.join(frame.columns)})",
+            (path,),
+        )
+        return cursor.rowcount
+    finally:
+        os.remove(path)
@@ -1,10 +1,19 @@
 # cleaning_rules.py
+import hashlib
+import json
 import re
+import threading
 import unicodedata
+from collections import OrderedDict
 from datetime import datetime
-from typing import Dict, Optional, Tuple
+from functools import lru_cache
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
+from pandas.api.types import union_categoricals
+
+from .dedup import drop_near_duplicates
 
 CURRENCY_RATES = {
     "USD": 1.0,
@@ -18,47 +27,193 @@ SALARY_SINGLE_PATTERN = re.compile(
     r"(?P<currency>[A-Za-z$]{0,3})\s*(?P<value>[\d,\.]+)",
     re.UNICODE,
 )
+# Range-then-single fallback of parse_salary as one anchored alternation: the
+# lazy ".*?" makes each branch scan like re.search, and the single branch is
+# only tried once the range branch has failed at every position.
+SALARY_COMBINED_PATTERN = re.compile(
+    r"^(?:.*?(?P<range_currency>[A-Za-z$]{0,3})\s*(?P<min>[\d,\.]+)\s*[-–]\s*(?P<max>[\d,\.]+)"
+    r"|.*?(?P<single_currency>[A-Za-z$]{0,3})\s*(?P<value>[\d,\.]+))",
+    re.UNICODE | re.DOTALL,
+)
+
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+# Default rule tables; the cleaning_rules section of etl_config.yaml overrides them
+COMPANY_SUFFIXES = ["co., ltd", "co.,ltd", "co. ltd", "ltd.", "plc.", "plc", "inc.", "(cambodia)", "(kh)"]
+JOB_TITLE_KEYWORDS = {
+    "ui/ux": "UI/UX Designer",
+    "ux": "UX Designer",
+    "developer": "Software Developer",
+    "engineer": "Engineer",
+    "officer": "Officer",
+    "manager": "Manager",
+}
+EXPERIENCE_KEYWORDS = {
+    "no experience": "Entry Level (0–1 year)",
+    "entry": "Entry Level (0–1 year)",
+    "junior": "Junior Level (1–2 years)",
+    "mid": "Mid Level (2–5 years)",
+    "senior": "Senior Level (5+ years)",
+}
+DATE_FORMATS = ["%m/%d/%Y", "%m/%d/%Y %H:%M:%S", "%d/%m/%Y"]
+# Distinct values tried against each format when detecting a column's date format
+DATE_SAMPLE_SIZE = 1000
+
+class NormalizationCache:
+    """Bounded LRU of cleaned values keyed by (rule, raw value).
+
+    Keep one instance alive across chunks/runs so repeated industries,
+    agencies and experience bands are only cleaned once. Safe to share
+    between the source threads.
+    """
+
+    def __init__(self, maxsize: int = 100_000):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[Callable, Hashable], object]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, func: Callable, value: Hashable):
+        # Rule methods of one compiled CleaningRules compare equal, so they share entries
+        key = (func, value)
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            self.misses += 1
+        result = func(value)
+        with self._lock:
+            self._entries[key] = result
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return result
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+def _clean_uniques(values: pd.Series, func: Callable, cache: Optional[NormalizationCache]):
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    if cache is None:
+        results = [func(value) for value in uniques]
+    else:
+        results = [cache.lookup(func, value) for value in uniques]
+    return codes, results
+
+def map_unique(
+    values: pd.Series, func: Callable, cache: Optional[NormalizationCache] = None
+) -> pd.Series:
+    """Apply func once per distinct value and broadcast the results back."""
+    codes, results = _clean_uniques(values, func, cache)
+    cleaned = np.empty(len(results), dtype=object)
+    for i, result in enumerate(results):
+        cleaned[i] = result
+    return pd.Series(cleaned[codes], index=values.index).infer_objects()
+
+def map_unique_pair(
+    values: pd.Series, func: Callable, cache: Optional[NormalizationCache] = None
+) -> Tuple[pd.Series, pd.Series]:
+    """map_unique for rules returning a 2-tuple, split into two columns."""
+    codes, results = _clean_uniques(values, func, cache)
+    first = np.empty(len(results), dtype=object)
+    second = np.empty(len(results), dtype=object)
+    for i, (a, b) in enumerate(results):
+        first[i] = a
+        second[i] = b
+    return (
+        pd.Series(first[codes], index=values.index),
+        pd.Series(second[codes], index=values.index),
+    )
+
+def _broadcast_categorical(codes: np.ndarray, results: list, index: pd.Index) -> pd.Series:
+    # Distinct raw values that clean to the same result share one category
+    result_codes, categories = pd.factorize(pd.Series(results, dtype=object))
+    return pd.Series(pd.Categorical.from_codes(result_codes[codes], categories=categories), index=index)
+
+def map_categories(
+    values: pd.Series, func: Callable, cache: Optional[NormalizationCache] = None
+) -> pd.Series:
+    """map_unique returning a categorical, without materializing a Python object per row."""
+    codes, results = _clean_uniques(values, func, cache)
+    return _broadcast_categorical(codes, results, values.index)
+
+def map_category_pair(
+    values: pd.Series, func: Callable, cache: Optional[NormalizationCache] = None
+) -> Tuple[pd.Series, pd.Series]:
+    """map_unique_pair returning two categoricals."""
+    codes, results = _clean_uniques(values, func, cache)
+    return (
+        _broadcast_categorical(codes, [first for first, _ in results], values.index),
+        _broadcast_categorical(codes, [second for _, second in results], values.index),
+    )
+
+def fill_blank(values: pd.Series) -> pd.Series:
+    """fillna("") that also works on categoricals without an "" category."""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        if not values.isna().any():
+            return values
+        if "" not in values.cat.categories:
+            values = values.cat.add_categories("")
+    return values.fillna("")
+
+def concat_frames(frames: Iterable[pd.DataFrame], **kwargs) -> pd.DataFrame:
+    """pd.concat that keeps categorical columns categorical when the frames' categories differ."""
+    frames = list(frames)
+    if len(frames) > 1:
+        for column in frames[0].columns:
+            parts = [frame[column] for frame in frames if column in frame]
+            dtypes = {part.dtype for part in parts}
+            if len(dtypes) > 1 and all(isinstance(dtype, pd.CategoricalDtype) for dtype in dtypes):
+                categories = union_categoricals(parts).categories
+                aligned = []
+                for frame in frames:
+                    # Shallow copy: only the categorical column is replaced
+                    frame = frame.copy(deep=False)
+                    if column in frame:
+                        frame[column] = frame[column].cat.set_categories(categories)
+                    aligned.append(frame)
+                frames = aligned
+    return pd.concat(frames, **kwargs)
+
+def strip_text(value) -> str:
+    """str.strip of a raw cell; blank (NaN) cells become ""."""
+    return value.strip() if isinstance(value, str) else ""
+
+def title_text(value) -> str:
+    return strip_text(value).title()
+
+def clean_label(value, mapping: Optional[Dict[str, str]] = None) -> str:
+    """Stripped label, replaced by its mapping entry when there is one."""
+    text = strip_text(value)
+    return mapping.get(text, text) if mapping else text
+
+def title_case(value) -> Optional[str]:
+    return value.title() if isinstance(value, str) else None
 
 def normalize_text(value: Optional[str]) -> str:
-    if not value:
+    # Blank CSV cells arrive as NaN
+    if not isinstance(value, str) or not value:
         return ""
     value = unicodedata.normalize("NFKC", value)
     value = value.replace(" ", " ").strip()
-    return re.sub(r"\s+", " ", value)
+    return WHITESPACE_PATTERN.sub(" ", value)
+
+def normalize_text_series(values: pd.Series) -> pd.Series:
+    text = fill_blank(values).astype(str).str.normalize("NFKC")
+    text = text.str.replace("\u00a0", " ", regex=False).str.strip()
+    return text.str.replace(r"\s+", " ", regex=True)
 
 def standardize_company(name: str) -> str:
-    value = normalize_text(name).lower()
-    replacements = {
-        "co., ltd": "",
-        "co.,ltd": "",
-        "co. ltd": "",
-        "ltd.": "",
-        "plc.": "",
-        "plc": "",
-        "inc.": "",
-        "(cambodia)": "",
-        "(kh)": "",
-    }
-    for k, v in replacements.items():
-        value = value.replace(k, v)
-    return normalize_text(value).title()
+    return DEFAULT_RULES.standardize_company(name)
 
 def standardize_job_title(title: str) -> Tuple[str, str]:
-    title_norm = normalize_text(title)
-    mapping: Dict[str, str] = {
-        "ui/ux": "UI/UX Designer",
-        "ux": "UX Designer",
-        "developer": "Software Developer",
-        "engineer": "Engineer",
-        "officer": "Officer",
-        "manager": "Manager",
-    }
-    title_std = title_norm
-    for keyword, replacement in mapping.items():
-        if keyword.lower() in title_norm.lower():
-            title_std = replacement
-            break
-    return title_norm, title_std
+    return DEFAULT_RULES.standardize_job_title(title)
 
 def parse_salary(
     salary_raw: str,
@@ -72,8 +227,9 @@ def parse_salary(
     currency = default_currency
 
     if keywords:
+        lowered = text.lower()
         for label, patterns in keywords.items():
-            if any(p.lower() in text.lower() for p in patterns):
+            if any(p.lower() in lowered for p in patterns):
                 return None, None, default_currency, label
 
     match = SALARY_RANGE_PATTERN.search(text)
@@ -96,6 +252,53 @@ def parse_salary(
     salary_max_usd = salary_max * rate
     return salary_min_usd, salary_max_usd, currency, salary_type
 
+def parse_salary_series(
+    salary_raw: pd.Series,
+    default_currency: str = "USD",
+    keywords: Optional[Dict[str, list]] = None,
+) -> pd.DataFrame:
+    """Columnar parse_salary: same min/max/currency/type, one regex pass per column."""
+    missing = salary_raw.isna() | (salary_raw.astype(str) == "")
+    text = normalize_text_series(salary_raw)
+
+    keyword_type = pd.Series(None, index=salary_raw.index, dtype=object)
+    if keywords:
+        lowered = text.str.lower()
+        for label, patterns in keywords.items():
+            if not patterns:
+                continue
+            alternation = "|".join(re.escape(p.lower()) for p in patterns)
+            hit = lowered.str.contains(alternation, regex=True) & ~missing
+            keyword_type = keyword_type.mask(hit & keyword_type.isna(), label)
+    has_keyword = keyword_type.notna()
+
+    parts = text.str.extract(SALARY_COMBINED_PATTERN)
+    is_range = parts["min"].notna() & ~missing & ~has_keyword
+    is_fixed = parts["value"].notna() & ~is_range & ~missing & ~has_keyword
+
+    currency = parts["range_currency"].where(is_range, parts["single_currency"])
+    currency = currency.mask(currency.fillna("") == "", default_currency)
+    currency = currency.str.upper().str.replace("$", "USD", regex=False)
+    rate = currency.map(CURRENCY_RATES).fillna(1.0)
+
+    salary_min = parts["min"].where(is_range, parts["value"]).str.replace(",", "", regex=False)
+    salary_max = parts["max"].where(is_range, parts["value"]).str.replace(",", "", regex=False)
+    parsed = is_range | is_fixed
+
+    return pd.DataFrame(
+        {
+            "salary_min_usd": (pd.to_numeric(salary_min, errors="coerce") * rate).where(parsed),
+            "salary_max_usd": (pd.to_numeric(salary_max, errors="coerce") * rate).where(parsed),
+            "salary_currency": currency.where(parsed, default_currency),
+            "salary_type": np.select(
+                [has_keyword, is_range, is_fixed],
+                [keyword_type, "range", "fixed"],
+                default="undisclosed",
+            ),
+        },
+        index=salary_raw.index,
+    )
+
 def standardize_location(value: str) -> Tuple[str, Optional[str]]:
     text = normalize_text(value)
     if "," in text:
@@ -104,73 +307,259 @@ def standardize_location(value: str) -> Tuple[str, Optional[str]]:
     return text.title(), None
 
 def parse_date(value: str) -> Optional[datetime]:
-    for fmt in ("%m/%d/%Y", "%m/%d/%Y %H:%M:%S", "%d/%m/%Y"):
+    for fmt in DATE_FORMATS:
         try:
             return datetime.strptime(value, fmt)
         except ValueError:
             continue
     return None
 
+def detect_date_format(values: pd.Series, formats: Iterable[str] = DATE_FORMATS) -> Optional[str]:
+    """The first format parsing every sampled distinct value, else the one parsing most (None if none does)."""
+    sample = pd.Series(pd.unique(values.dropna().to_numpy(dtype=object))[:DATE_SAMPLE_SIZE], dtype=object)
+    best, best_parsed = None, 0
+    for fmt in formats:
+        parsed = int(pd.to_datetime(sample, format=fmt, errors="coerce").notna().sum())
+        if parsed == len(sample):
+            return fmt
+        if parsed > best_parsed:
+            best, best_parsed = fmt, parsed
+    return best
+
+def parse_dates(
+    values: pd.Series, formats: Iterable[str] = DATE_FORMATS, date_format: Optional[str] = None
+) -> pd.Series:
+    """Columnar parse_date: convert the column in bulk in its format.
+
+    ``date_format`` is the column's format; pass the one detected for the
+    whole source, as an ambiguous date like 1/5/2026 otherwise parses
+    differently depending on the values read with it. Without it the
+    format is detected from ``values``. Values the format rejects are
+    retried with the other formats, each again in bulk, so mixed columns
+    still parse. What none of them parses is left to pandas' per-value
+    inference, as the pipeline did before formats were configurable, and
+    is NaT only if that fails too.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    text = values.astype(object)
+    formats = list(formats)
+    detected = date_format or detect_date_format(text, formats)
+    if detected is None:
+        return pd.to_datetime(text, format="mixed", errors="coerce")
+    parsed = pd.to_datetime(text, format=detected, errors="coerce")
+    for fmt in formats:
+        unparsed = parsed.isna() & text.notna()
+        if not unparsed.any():
+            return parsed
+        if fmt != detected:
+            parsed = parsed.fillna(pd.to_datetime(text[unparsed], format=fmt, errors="coerce"))
+    unparsed = parsed.isna() & text.notna()
+    if unparsed.any():
+        parsed = parsed.fillna(pd.to_datetime(text[unparsed], format="mixed", errors="coerce"))
+    return parsed
+
 def hash_record(fields: Tuple[str, ...]) -> str:
-    import hashlib
     concatenated = "||".join(normalize_text(f) for f in fields)
     return hashlib.sha256(concatenated.encode("utf-8")).hexdigest()
 
+def _key_text(value) -> str:
+    if value is None or pd.isna(value):
+        return ""
+    return normalize_text(str(value))
+
+def dedup_keys(columns: pd.DataFrame, cache: Optional[NormalizationCache] = None) -> pd.Series:
+    """Normalized "||"-joined key per row, as hashed by hash_record."""
+    parts = []
+    for name in columns:
+        values = columns[name]
+        if pd.api.types.is_datetime64_any_dtype(values):
+            values = values.dt.strftime("%Y-%m-%d")
+        parts.append(map_unique(values, _key_text, cache).astype(object))
+    return parts[0].str.cat(parts[1:], sep="||")
+
+def hash_keys(keys: pd.Series) -> pd.Series:
+    """sha256 hex digest of each key, computed once per distinct key."""
+    codes, uniques = pd.factorize(keys)
+    digests = np.array(
+        [hashlib.sha256(key.encode("utf-8")).hexdigest() for key in uniques], dtype=object
+    )
+    return pd.Series(digests[codes], index=keys.index)
+
+def fingerprint_keys(keys: pd.Series) -> np.ndarray:
+    """Stable 64-bit fingerprint of each key, fully vectorized (siphash)."""
+    return pd.util.hash_array(keys.to_numpy(dtype=object))
+
 def normalize_experience(value: str) -> str:
-    text = normalize_text(value).lower()
-    mapping = {
-        "no experience": "Entry Level (0–1 year)",
-        "entry": "Entry Level (0–1 year)",
-        "junior": "Junior Level (1–2 years)",
-        "mid": "Mid Level (2–5 years)",
-        "senior": "Senior Level (5+ years)",
-    }
-    for keyword, canonical in mapping.items():
-        if keyword in text:
-            return canonical
-    return normalize_text(value)
+    return DEFAULT_RULES.normalize_experience(value)
 
 def normalize_education(value: str) -> str:
-    text = normalize_text(value)
-    return text if text else "Not Specified"
+    return DEFAULT_RULES.normalize_education(value)
+
+class KeywordTable:
+    """Keyword -> replacement rules matched in one regex scan instead of one ``in`` test per keyword.
+
+    Matching is case-insensitive and the first-listed keyword found
+    anywhere in the text wins, as with the sequential checks; the
+    lookahead lets matches overlap so a keyword inside another one
+    (e.g. "ux" in "ui/ux") is still seen.
+    """
+
+    def __init__(self, mapping: Dict[str, str]):
+        self._rules: Dict[str, Tuple[int, str]] = {}
+        for priority, (keyword, replacement) in enumerate(mapping.items()):
+            self._rules.setdefault(keyword.lower(), (priority, replacement))
+        alternation = "|".join(re.escape(keyword) for keyword in self._rules)
+        self._pattern = re.compile(f"(?=({alternation}))") if self._rules else None
+
+    def lookup(self, text: str) -> Optional[str]:
+        if self._pattern is None:
+            return None
+        found = self._pattern.findall(text.lower())
+        if not found:
+            return None
+        return self._rules[min(found, key=self._rules.__getitem__)][1]
+
+class CleaningRules:
+    """The standardization rules of one cleaning_rules config section, compiled once."""
+
+    def __init__(self, cleaning_rules: Optional[Dict] = None):
+        rules = cleaning_rules or {}
+        suffixes = rules.get("company_suffixes", COMPANY_SUFFIXES)
+        # One pass over the alternation, in the listed order, replaces one str.replace per suffix
+        self.company_suffixes = re.compile("|".join(re.escape(suffix.lower()) for suffix in suffixes)) if suffixes else None
+        self.job_titles = KeywordTable(rules.get("job_title_keywords", JOB_TITLE_KEYWORDS))
+        self.experience_levels = KeywordTable(rules.get("experience_keywords", EXPERIENCE_KEYWORDS))
+        self.experience_mapping: Dict[str, str] = rules.get("experience_mapping", {})
+        self.education_mapping: Dict[str, str] = rules.get("education_mapping", {})
+        self.date_formats: List[str] = list(rules.get("date_formats", DATE_FORMATS))
+        # Pins every source's date format instead of detecting it
+        self.date_format: Optional[str] = rules.get("date_format")
+
+    def standardize_company(self, name: str) -> str:
+        value = normalize_text(name).lower()
+        if self.company_suffixes is not None:
+            value = self.company_suffixes.sub("", value)
+        return normalize_text(value).title()
+
+    def standardize_job_title(self, title: str) -> Tuple[str, str]:
+        title_norm = normalize_text(title)
+        return title_norm, self.job_titles.lookup(title_norm) or title_norm
 
-def transform_dataframe(df: pd.DataFrame, config: Dict) -> pd.DataFrame:
-    df = df.copy()
-    df["job_title_raw"], df["job_title_std"] = zip(
-        *df["Job Title"].apply(standardize_job_title)
+    def normalize_experience(self, value: str) -> str:
+        text = normalize_text(value)
+        level = self.experience_levels.lookup(text) or text
+        return self.experience_mapping.get(level, level)
+
+    def normalize_education(self, value: str) -> str:
+        text = normalize_text(value)
+        if not text:
+            return "Not Specified"
+        return self.education_mapping.get(text, text)
+
+    def detect_date_format(self, values: pd.Series) -> str:
+        """The format to parse a whole source's dates in: detected from ``values``, else the first configured."""
+        return self.date_format or detect_date_format(values, self.date_formats) or self.date_formats[0]
+
+    def parse_dates(self, values: pd.Series, date_format: Optional[str] = None) -> pd.Series:
+        return parse_dates(values, self.date_formats, date_format or self.date_format)
+
+DEFAULT_RULES = CleaningRules()
+
+@lru_cache(maxsize=8)
+def _compile_rules(section: str) -> CleaningRules:
+    return CleaningRules(json.loads(section))
+
+def compile_rules(config: Dict) -> CleaningRules:
+    """CleaningRules for config's cleaning_rules section, compiled once per distinct section."""
+    # Not sort_keys: the keyword tables' order is their priority
+    return _compile_rules(json.dumps(config.get("cleaning_rules", {}), default=str))
+
+# Raw columns transform_dataframe derives from; they are not carried into its output
+TRANSFORMED_RAW_COLUMNS = [
+    "Job Title", "Company Name", "Industry", "Location", "Salary", "Job Type",
+    "Experience Level", "Education Level", "Posting Date", "Source Agency",
+]
+
+# deduplication.fields -> transform_dataframe output columns
+TRANSFORMED_DEDUP_COLUMNS = {
+    "job_title": "job_title_raw",
+    "company_name": "company_name_std",
+    "location": "province",
+    "posting_date": "posting_date",
+}
+
+def deduplicate_dataframe(df: pd.DataFrame, config: Dict) -> pd.DataFrame:
+    """Merge near-duplicate postings of a transformed frame per the deduplication config."""
+    dedup_config = config.get("deduplication", {})
+    if not dedup_config.get("enabled", False):
+        return df
+    fields = {
+        field: TRANSFORMED_DEDUP_COLUMNS[field]
+        for field in dedup_config.get("fields", TRANSFORMED_DEDUP_COLUMNS)
+    }
+    df, merged = drop_near_duplicates(
+        df,
+        fields,
+        dedup_config.get("similarity_threshold", 0.9),
+        dedup_config.get("time_window_days", 7),
+        ("salary_min_usd", "salary_max_usd") if dedup_config.get("match_salary", True) else None,
+        dedup_config.get("generic_companies", []),
+    )
+    df.attrs["near_duplicates_merged"] = merged
+    return df
+
+def transform_dataframe(
+    df: pd.DataFrame,
+    config: Dict,
+    cache: Optional[NormalizationCache] = None,
+    deduplicate: bool = True,
+    date_format: Optional[str] = None,
+) -> pd.DataFrame:
+    """Standardized columns of a raw postings frame.
+
+    Text results are categoricals computed once per distinct raw value, and
+    each raw column is left out of the result once it has been derived from.
+    ``df`` itself is not modified. Posting dates are parsed in
+    ``date_format``, detected from ``df`` when not given.
+    """
+    rules = compile_rules(config)
+    out = df.copy(deep=False)
+    for column in TRANSFORMED_RAW_COLUMNS:
+        if column in out:
+            del out[column]
+
+    out["job_title_raw"], out["job_title_std"] = map_category_pair(
+        df["Job Title"], rules.standardize_job_title, cache
     )
-    df["company_name_raw"] = df["Company Name"].apply(normalize_text)
-    df["company_name_std"] = df["Company Name"].apply(standardize_company)
-    df["industry_raw"] = df["Industry"].apply(normalize_text)
-    df["industry_std"] = df["Industry"].apply(str.title)
-
-    df["province"], df["city"] = zip(*df["Location"].apply(standardize_location))
-    salary_results = df["Salary"].apply(
-        lambda s: parse_salary(
-            s,
-            config["cleaning"]["currency_default"],
-            config["cleaning"]["salary_keywords"],
-        )
+    out["company_name_raw"] = map_categories(df["Company Name"], normalize_text, cache)
+    out["company_name_std"] = map_categories(df["Company Name"], rules.standardize_company, cache)
+    out["industry_raw"] = map_categories(df["Industry"], normalize_text, cache)
+    out["industry_std"] = map_categories(df["Industry"], title_case, cache)
+
+    out["province"], out["city"] = map_category_pair(df["Location"], standardize_location, cache)
+    salary = parse_salary_series(
+        df["Salary"],
+        config["cleaning"]["currency_default"],
+        config["cleaning"]["salary_keywords"],
     )
-    df["salary_min_usd"], df["salary_max_usd"], df["salary_currency"], df["salary_type"] = zip(*salary_results)
-
-    df["employment_type"] = df["Job Type"].apply(normalize_text)
-    df["experience_level_std"] = df["Experience Level"].apply(normalize_experience)
-    df["education_level_std"] = df["Education Level"].apply(normalize_education)
-    df["posting_date"] = df["Posting Date"].apply(parse_date)
-
-    df["source_agency_raw"] = df["Source Agency"].apply(normalize_text)
-    df["source_agency_std"] = df["Source Agency"].str.title()
-
-    df["hash_dedup"] = df.apply(
-        lambda row: hash_record(
-            (
-                row["job_title_std"],
-                row["company_name_std"],
-                row["province"],
-                row["posting_date"].strftime("%Y-%m-%d") if row["posting_date"] else "",
-            )
-        ),
-        axis=1,
+    out["salary_min_usd"] = salary["salary_min_usd"]
+    out["salary_max_usd"] = salary["salary_max_usd"]
+    out["salary_currency"] = salary["salary_currency"].astype("category")
+    out["salary_type"] = salary["salary_type"].astype("category")
+
+    out["employment_type"] = map_categories(df["Job Type"], normalize_text, cache)
+    out["experience_level_std"] = map_categories(df["Experience Level"], rules.normalize_experience, cache)
+    out["education_level_std"] = map_categories(df["Education Level"], rules.normalize_education, cache)
+    out["posting_date"] = rules.parse_dates(df["Posting Date"], date_format)
+
+    out["source_agency_raw"] = map_categories(df["Source Agency"], normalize_text, cache)
+    out["source_agency_std"] = map_categories(df["Source Agency"], title_case, cache)
+
+    out["hash_dedup"] = hash_keys(
+        dedup_keys(out[["job_title_std", "company_name_std", "province", "posting_date"]], cache)
     )
-    return df
\ No newline at end of file
+
+    if deduplicate:
+        out = deduplicate_dataframe(out, config)
+    return out
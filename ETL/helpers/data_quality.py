@@ -0,0 +1,85 @@
+# data_quality.py
+import os
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+REASON_COLUMN = "reasons"
+REASON_SEPARATOR = ";"
+
+def blank_mask(values: pd.Series) -> np.ndarray:
+    """True where a cleaned text column is missing or empty; categoricals are checked per category."""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        categories = values.cat.categories
+        blank = pd.isna(categories) | (categories.astype(str).str.strip() == "")
+        codes = values.cat.codes.to_numpy()
+        return (codes < 0) | np.isin(codes, np.flatnonzero(blank))
+    return (values.isna() | (values.astype(str).str.strip() == "")).to_numpy()
+
+class QualityGate:
+    """The data_quality rules, evaluated as one boolean mask per rule over a cleaned chunk.
+
+    check() splits a chunk into the rows passing every rule and the rows
+    failing at least one, the latter tagged with the reason codes of the
+    rules they fail (e.g. "missing_company_name;salary_above_max").
+    ``counts`` accumulates rejections per rule (a row failing two rules
+    counts towards both) and ``rejected`` the rows rejected.
+    """
+
+    def __init__(self, config: Dict, columns: Dict[str, str]):
+        self.required: List[Tuple[str, str]] = [(field, columns[field]) for field in config.get("required_fields", [])]
+        self.date_column: Optional[str] = columns["posting_date"] if config.get("date_validation", False) else None
+        self.salary_range: Optional[Tuple[float, float]] = None
+        if config.get("salary_validation", False):
+            self.salary_range = (config.get("min_salary", -np.inf), config.get("max_salary", np.inf))
+        self.counts: Dict[str, int] = {}
+        self.rejected = 0
+
+    def rule_masks(self, df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        masks = {}
+        for field, column in self.required:
+            masks[f"missing_{field}"] = blank_mask(df[column])
+        if self.date_column is not None:
+            dates = pd.to_datetime(df[self.date_column], errors="coerce")
+            masks["missing_posting_date"] = dates.isna().to_numpy()
+            # NaT compares False, so a missing date only counts once
+            masks["future_posting_date"] = (dates > pd.Timestamp.now().normalize()).to_numpy()
+        if self.salary_range is not None:
+            low, high = self.salary_range
+            salary_min = pd.to_numeric(df["salary_min"]).to_numpy(dtype=float)
+            salary_max = pd.to_numeric(df["salary_max"]).to_numpy(dtype=float)
+            # Undisclosed salaries (NaN) pass: every comparison with NaN is False
+            masks["salary_below_min"] = salary_min < low
+            masks["salary_above_max"] = salary_max > high
+            masks["salary_min_above_max"] = salary_min > salary_max
+        return masks
+
+    def split(self, df: pd.DataFrame, masks: Dict[str, np.ndarray]) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Rows failing none of ``masks``, and the rows failing some with their reason codes."""
+        if not masks or df.empty:
+            return df, df.iloc[:0].assign(**{REASON_COLUMN: pd.Series(dtype=object)})
+        codes = np.array(list(masks))
+        failed = np.column_stack([masks[code] for code in codes])
+        for code, count in zip(codes, failed.sum(axis=0)):
+            self.counts[code] = self.counts.get(code, 0) + int(count)
+        rejected = failed.any(axis=1)
+        self.rejected += int(rejected.sum())
+        if not rejected.any():
+            # Skip the boolean-index copy of a clean chunk
+            return df, df.iloc[:0].assign(**{REASON_COLUMN: pd.Series(dtype=object)})
+        # Only the (few) rejected rows get a reason string
+        reasons = [REASON_SEPARATOR.join(codes[row]) for row in failed[rejected]]
+        return df[~rejected], df[rejected].assign(**{REASON_COLUMN: reasons})
+
+    def check(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        return self.split(df, self.rule_masks(df))
+
+    def report(self) -> str:
+        rejected = {code: count for code, count in self.counts.items() if count}
+        return ", ".join(f"{code}={count}" for code, count in sorted(rejected.items(), key=lambda item: -item[1]))
+
+def write_quarantine(path: str, rejected: pd.DataFrame) -> None:
+    """Append rejected rows to a CSV, writing the header with the first batch."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    rejected.to_csv(path, mode="a", header=not os.path.exists(path), index=False)
@@ -0,0 +1,283 @@
+# dedup.py
+import json
+import os
+import re
+import unicodedata
+from collections import deque
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+SHINGLE_SIZE = 3
+
+class SeenHashIndex:
+    """Sorted on-disk set of 64-bit posting fingerprints already loaded.
+
+    The file is a plain .npy array opened memory-mapped, so membership checks
+    are a binary search and never read the whole index into RAM. New
+    fingerprints are buffered until save() so a failed run does not mark its
+    rows as seen.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._hashes = self._load(path)
+        self._pending = np.empty(0, dtype=np.uint64)
+
+    @staticmethod
+    def _load(path: str) -> np.ndarray:
+        if os.path.exists(path):
+            return np.load(path, mmap_mode="r")
+        return np.empty(0, dtype=np.uint64)
+
+    def __len__(self) -> int:
+        return len(self._hashes) + len(self._pending)
+
+    @staticmethod
+    def _member(sorted_hashes: np.ndarray, fingerprints: np.ndarray) -> np.ndarray:
+        if len(sorted_hashes) == 0:
+            return np.zeros(len(fingerprints), dtype=bool)
+        positions = np.searchsorted(sorted_hashes, fingerprints)
+        positions[positions == len(sorted_hashes)] = 0
+        return sorted_hashes[positions] == fingerprints
+
+    def contains(self, fingerprints: np.ndarray) -> np.ndarray:
+        fingerprints = np.asarray(fingerprints, dtype=np.uint64)
+        return self._member(self._hashes, fingerprints) | self._member(self._pending, fingerprints)
+
+    def add(self, fingerprints: np.ndarray) -> None:
+        fingerprints = np.asarray(fingerprints, dtype=np.uint64)
+        self._pending = np.union1d(self._pending, fingerprints)
+
+    def save(self, path: Optional[str] = None) -> None:
+        path = path or self.path
+        if len(self._pending) == 0 and os.path.exists(path):
+            return
+        merged = np.union1d(np.asarray(self._hashes), self._pending)
+        # Drop the memory map before replacing the file underneath it
+        self._hashes = merged
+        self._pending = np.empty(0, dtype=np.uint64)
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as handle:
+            np.save(handle, merged)
+        os.replace(tmp_path, path)
+        self.path = path
+
+def title_shingles(value, size: int = SHINGLE_SIZE) -> FrozenSet[str]:
+    if value is None or pd.isna(value):
+        return frozenset()
+    text = " ".join(TOKEN_PATTERN.findall(unicodedata.normalize("NFKC", str(value)).lower()))
+    if len(text) <= size:
+        return frozenset([text]) if text else frozenset()
+    return frozenset(text[i:i + size] for i in range(len(text) - size + 1))
+
+def shingle_similarity(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+def block_columns(fields: Dict[str, str], salary_columns: Optional[Tuple[str, str]] = None) -> List[str]:
+    """Columns a re-post must match exactly: every field but job_title and posting_date, and the salary range."""
+    columns = [col for field, col in fields.items() if field not in ("job_title", "posting_date")]
+    if salary_columns:
+        columns += list(salary_columns)
+    return columns
+
+def block_keys(df: pd.DataFrame, columns: List[str]) -> np.ndarray:
+    """Block key per row: its (stripped, lower-cased) block column values, normalized once per distinct value."""
+    keys = np.full(len(df), "", dtype=object)
+    for position, col in enumerate(columns):
+        codes, uniques = pd.factorize(df[col], use_na_sentinel=False)
+        labels = pd.Series(np.asarray(uniques, dtype=object)).fillna("").astype(str).str.strip().str.lower()
+        labels = labels.to_numpy(dtype=object)[codes]
+        keys = labels if position == 0 else keys + "\x1f" + labels
+    return keys
+
+def _posting_days(dates) -> Tuple[np.ndarray, np.ndarray]:
+    """Days since the epoch of each posting date, and whether it has one."""
+    dates = pd.to_datetime(dates, errors="coerce")
+    days = dates.to_numpy(dtype="datetime64[D]", na_value=np.datetime64("NaT")).astype(np.int64)
+    return days, dates.notna().to_numpy()
+
+class NearDuplicateIndex:
+    """Recently kept postings per block, persisted so re-posts are found across chunks, files and runs.
+
+    find_near_duplicates compares the rows of one frame with each other and
+    with this index: for every block (company, location and, when matched,
+    salary) it holds the day and title of the postings kept in the last
+    ``time_window_days`` before the newest posting day seen. Entries are
+    added for loaded postings only, and the file, a small JSON document,
+    is rewritten by save().
+    """
+
+    def __init__(
+        self,
+        path: str,
+        fields: Dict[str, str],
+        time_window_days: int,
+        salary_columns: Optional[Tuple[str, str]] = None,
+    ):
+        self.path = path
+        self.fields = dict(fields)
+        self.time_window_days = time_window_days
+        self.block_columns = block_columns(self.fields, salary_columns)
+        self._blocks: Dict[str, List[Tuple[int, str, FrozenSet[str]]]] = {}
+        self._newest: Optional[int] = None
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as handle:
+                state = json.load(handle)
+            # Blocks keyed on other columns can never match this configuration's
+            if state.get("block_columns") == self.block_columns:
+                self._newest = state.get("newest")
+                for key, entries in state.get("blocks", {}).items():
+                    self._blocks[key] = [(day, title, title_shingles(title)) for day, title in entries]
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._blocks.values())
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._blocks
+
+    def recent(self, key: str) -> List[Tuple[int, FrozenSet[str]]]:
+        """(day, title shingles) of the postings kept in a block."""
+        return [(day, shingles) for day, _, shingles in self._blocks.get(key, ())]
+
+    def add(self, df: pd.DataFrame) -> None:
+        """Remember the postings of ``df`` (once they are loaded), then prune the blocks by the window."""
+        days, has_date = _posting_days(df[self.fields["posting_date"]])
+        if not has_date.any():
+            return
+        keys = block_keys(df, self.block_columns)[has_date]
+        titles = df[self.fields["job_title"]].astype(object).to_numpy()[has_date]
+        for key, day, title in zip(keys, days[has_date].tolist(), titles):
+            title = "" if title is None or pd.isna(title) else str(title)
+            self._blocks.setdefault(key, []).append((day, title, title_shingles(title)))
+        newest = int(days[has_date].max())
+        self._newest = newest if self._newest is None else max(self._newest, newest)
+
+        oldest = self._newest - self.time_window_days
+        for key in list(self._blocks):
+            entries = [entry for entry in self._blocks[key] if entry[0] >= oldest]
+            if entries:
+                self._blocks[key] = entries
+            else:
+                del self._blocks[key]
+
+    def save(self, path: Optional[str] = None) -> None:
+        path = path or self.path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        state = {
+            "block_columns": self.block_columns,
+            "newest": self._newest,
+            "blocks": {key: [[day, title] for day, title, _ in entries] for key, entries in self._blocks.items()},
+        }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(state, handle, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        self.path = path
+
+def _generic_mask(values: pd.Series, generic_names: Iterable[str]) -> np.ndarray:
+    """True where the (stripped, lower-cased) value is one of ``generic_names``."""
+    generic = {name.strip().lower() for name in generic_names}
+    codes, uniques = pd.factorize(values)
+    # Code -1 (missing) picks the trailing False
+    flags = np.array([str(value).strip().lower() in generic for value in uniques] + [False])
+    return flags[codes]
+
+def find_near_duplicates(
+    df: pd.DataFrame,
+    fields: Dict[str, str],
+    similarity_threshold: float = 0.9,
+    time_window_days: Optional[int] = 7,
+    salary_columns: Optional[Tuple[str, str]] = None,
+    generic_companies: Iterable[str] = (),
+    index: Optional[NearDuplicateIndex] = None,
+) -> np.ndarray:
+    """Flag postings that re-post an earlier one with a slightly different title.
+
+    ``fields`` maps the deduplication.fields names to columns of ``df``.
+    job_title is compared by character-shingle Jaccard similarity,
+    posting_date bounds the comparison to ``time_window_days``, and every
+    other field (company, location) must match exactly and is used as the
+    blocking key, so only postings sharing a block are ever compared. With
+    ``salary_columns`` the salary range must match exactly as well, and
+    postings of a ``generic_companies`` placeholder (e.g. "Private
+    Company") are never merged, as they stand for many employers. The
+    earliest posting of a duplicate group is kept.
+
+    The ETL passes one cleaned chunk at a time, so re-posts loaded from an
+    earlier chunk, file or run are found through ``index``: a posting
+    within the window of one kept there, with a similar title, is a
+    duplicate too, whichever of the two is older.
+    """
+    duplicate = np.zeros(len(df), dtype=bool)
+    if len(df) < 2 and (index is None or len(df) == 0):
+        return duplicate
+
+    block_codes, block_names = pd.factorize(block_keys(df, block_columns(fields, salary_columns)))
+
+    if "posting_date" in fields:
+        days, has_date = _posting_days(df[fields["posting_date"]])
+        window = time_window_days
+    else:
+        has_date = np.ones(len(df), dtype=bool)
+        days = np.zeros(len(df), dtype=np.int64)
+        window = None
+
+    # Postings alone in their block can never be duplicates
+    candidates = np.bincount(block_codes)[block_codes] > 1
+    if index is not None:
+        indexed = np.array([name in index for name in block_names], dtype=bool)
+        candidates |= indexed[block_codes]
+    candidates &= has_date
+    if generic_companies and "company_name" in fields:
+        candidates &= ~_generic_mask(df[fields["company_name"]], generic_companies)
+    positions = np.flatnonzero(candidates)
+    if len(positions) == 0:
+        return duplicate
+    positions = positions[np.lexsort((days[positions], block_codes[positions]))]
+
+    title_codes, titles = pd.factorize(df[fields["job_title"]].iloc[positions], use_na_sentinel=False)
+    shingles = [title_shingles(title) for title in titles]
+
+    boundaries = np.flatnonzero(np.diff(block_codes[positions])) + 1
+    for block in np.split(np.arange(len(positions)), boundaries):
+        loaded = index.recent(block_names[block_codes[positions[block[0]]]]) if index is not None else []
+        kept: deque = deque()
+        for i in block:
+            day = days[positions[i]]
+            while window is not None and kept and kept[0][0] < day - window:
+                kept.popleft()
+            current = shingles[title_codes[i]]
+            if any(shingle_similarity(current, other) >= similarity_threshold for _, other in kept) or any(
+                (window is None or abs(day - other_day) <= window)
+                and shingle_similarity(current, other) >= similarity_threshold
+                for other_day, other in loaded
+            ):
+                duplicate[positions[i]] = True
+            else:
+                kept.append((day, current))
+    return duplicate
+
+def drop_near_duplicates(
+    df: pd.DataFrame,
+    fields: Dict[str, str],
+    similarity_threshold: float = 0.9,
+    time_window_days: Optional[int] = 7,
+    salary_columns: Optional[Tuple[str, str]] = None,
+    generic_companies: Iterable[str] = (),
+    index: Optional[NearDuplicateIndex] = None,
+) -> Tuple[pd.DataFrame, int]:
+    duplicate = find_near_duplicates(
+        df, fields, similarity_threshold, time_window_days, salary_columns, generic_companies, index
+    )
+    return df[~duplicate], int(duplicate.sum())
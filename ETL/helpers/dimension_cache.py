@@ -0,0 +1,184 @@
+# dimension_cache.py
+import unicodedata
+from datetime import datetime
+from typing import Callable, Dict, List, NamedTuple, Tuple
+
+import numpy as np
+import pandas as pd
+
+MISSING_KEY = -1
+LOOKUP_BATCH_SIZE = 500
+WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+class Dimension(NamedTuple):
+    table: str
+    id_column: str
+    key_columns: Tuple[str, ...]
+    insert_columns: Tuple[str, ...]
+
+DIMENSIONS: Dict[str, Dimension] = {
+    "time": Dimension(
+        "DimTime", "time_id", ("posting_date",),
+        ("posting_date", "posting_day", "posting_month", "posting_quarter",
+         "posting_year", "posting_weekday", "is_weekend"),
+    ),
+    "company": Dimension("DimCompany", "company_id", ("company_name",), ("company_name",)),
+    "job": Dimension(
+        "DimJob", "job_id",
+        ("job_title", "job_type", "experience_level", "education_level"),
+        ("job_title", "job_type", "experience_level", "education_level"),
+    ),
+    "industry": Dimension("DimIndustry", "industry_id", ("industry_name",), ("industry_name",)),
+    # The sources only name a city, so locations are matched on city alone (as
+    # the original stored procedure joined them) and inserted with a NULL
+    # province. NULLs never collide in the (city, province) unique key, so it is
+    # the cache, preloaded with every existing row, that keeps cities unique.
+    "location": Dimension("DimLocation", "location_id", ("city",), ("city", "province")),
+    "agency": Dimension("DimSourceAgency", "source_id", ("agency_name",), ("agency_name",)),
+}
+
+def _fold(text: str) -> str:
+    # Drop accents, then case: "Café" and "CAFE" are one member under utf8mb4_0900_ai_ci
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+def _natural_key(values: Tuple) -> Tuple:
+    # Mirror the accent- and case-insensitive collation of the Dim tables
+    key = []
+    for value in values:
+        if isinstance(value, datetime):
+            value = value.date()
+        elif isinstance(value, str):
+            value = _fold(value)
+        key.append(value)
+    return tuple(key)
+
+def _is_complete(values: Tuple) -> bool:
+    return not any(pd.isna(value) for value in values)
+
+def _member_row(name: str, values: Tuple) -> Tuple:
+    if name == "location":
+        return values + (None,)
+    if name != "time":
+        return values
+    posting_date = values[0]
+    if isinstance(posting_date, datetime):
+        posting_date = posting_date.date()
+    return (
+        posting_date,
+        posting_date.day,
+        posting_date.month,
+        (posting_date.month - 1) // 3 + 1,
+        posting_date.year,
+        WEEKDAYS[posting_date.weekday()],
+        posting_date.weekday() >= 5,
+    )
+
+def plan_remap(rows: List[Tuple], remap: Callable[[Tuple], Tuple]) -> Tuple[Dict[int, Tuple], Dict[int, int]]:
+    """How rewriting existing members' natural keys through ``remap`` changes a dimension.
+
+    ``rows`` are (id, *key values). Returns the new key values of each
+    member whose values change, and for members whose new key collates
+    equal to another member's, their id -> the lowest such id, which they
+    merge into.
+    """
+    updates, merged, survivors = {}, {}, {}
+    for row in sorted(rows, key=lambda row: row[0]):
+        member_id, values = row[0], tuple(row[1:])
+        remapped = tuple(remap(values))
+        key = _natural_key(remapped)
+        if key in survivors:
+            merged[member_id] = survivors[key]
+            continue
+        survivors[key] = member_id
+        if remapped != values:
+            updates[member_id] = remapped
+    return updates, merged
+
+class DimensionKeyCache:
+    """In-process natural key -> surrogate id maps for the star schema dimensions.
+
+    Dimensions are preloaded once per run; afterwards only members that are
+    not yet known are inserted, and their ids are read back so fact rows can
+    be built with integer keys without joining on VARCHAR columns server-side.
+    """
+
+    def __init__(self):
+        self._ids: Dict[str, Dict[Tuple, int]] = {name: {} for name in DIMENSIONS}
+
+    def __len__(self) -> int:
+        return sum(len(ids) for ids in self._ids.values())
+
+    def clear(self) -> None:
+        """Forget every member, e.g. after a rollback discarded freshly inserted ids."""
+        for ids in self._ids.values():
+            ids.clear()
+
+    def _remember(self, name: str, rows: List[Tuple]) -> None:
+        ids = self._ids[name]
+        for row in rows:
+            key = _natural_key(row[1:])
+            # Keep the lowest id when legacy loads left duplicate members
+            if key not in ids or row[0] < ids[key]:
+                ids[key] = row[0]
+
+    def preload(self, cursor) -> None:
+        for name, dim in DIMENSIONS.items():
+            cursor.execute(
+                f"SELECT {dim.id_column}, {', '.join(dim.key_columns)} FROM {dim.table}"
+            )
+            self._remember(name, cursor.fetchall())
+
+    def _insert_members(self, cursor, name: str, members: List[Tuple]) -> int:
+        dim = DIMENSIONS[name]
+        placeholders = ", ".join(["%s"] * len(dim.insert_columns))
+        cursor.executemany(
+            f"INSERT IGNORE INTO {dim.table} ({', '.join(dim.insert_columns)}) VALUES ({placeholders})",
+            [_member_row(name, member) for member in members],
+        )
+        inserted = max(cursor.rowcount, 0)
+
+        # Read the ids back, including members another loader inserted first
+        row_placeholder = "(" + ", ".join(["%s"] * len(dim.key_columns)) + ")"
+        key_list = ", ".join(dim.key_columns)
+        for start in range(0, len(members), LOOKUP_BATCH_SIZE):
+            batch = members[start:start + LOOKUP_BATCH_SIZE]
+            if len(dim.key_columns) == 1:
+                condition = f"{key_list} IN ({', '.join(['%s'] * len(batch))})"
+                params = [member[0] for member in batch]
+            else:
+                condition = f"({key_list}) IN ({', '.join([row_placeholder] * len(batch))})"
+                params = [value for member in batch for value in member]
+            cursor.execute(
+                f"SELECT {dim.id_column}, {key_list} FROM {dim.table} WHERE {condition}", params
+            )
+            self._remember(name, cursor.fetchall())
+        return inserted
+
+    def resolve(self, cursor, name: str, frame: pd.DataFrame) -> Tuple[np.ndarray, int]:
+        """Surrogate id per row of ``frame`` (its natural key columns, in order).
+
+        Unknown members are inserted first. Rows with an incomplete key get
+        MISSING_KEY. Returns the ids and the number of new members inserted.
+        """
+        codes, uniques = pd.factorize(pd.MultiIndex.from_frame(frame))
+        ids = self._ids[name]
+        members = [tuple(values) for values in uniques]
+
+        new_members, new_keys = [], set()
+        for member in members:
+            if not _is_complete(member):
+                continue
+            key = _natural_key(member)
+            # Spellings that collate equal are inserted once
+            if key not in ids and key not in new_keys:
+                new_keys.add(key)
+                new_members.append(member)
+        inserted = self._insert_members(cursor, name, new_members) if new_members else 0
+
+        unique_ids = np.array(
+            [ids.get(_natural_key(member), MISSING_KEY) if _is_complete(member) else MISSING_KEY
+             for member in members],
+            dtype=np.int64,
+        )
+        return unique_ids[codes], inserted
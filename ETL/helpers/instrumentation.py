@@ -0,0 +1,222 @@
+# instrumentation.py
+import cProfile
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+STATM_PATH = "/proc/self/statm"
+
+def peak_rss_mb() -> Optional[float]:
+    """Process peak resident set size so far, in MiB.
+
+    A high-water mark for the whole process: once the largest stage has
+    run, every later reading is the same.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def current_rss_mb() -> Optional[float]:
+    """Resident set size right now, in MiB (Linux only, None elsewhere)."""
+    try:
+        with open(STATM_PATH, "r") as handle:
+            resident_pages = int(handle.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return round(value, 1) if value else None
+
+class StageRecord:
+    def __init__(self, run_id: str, name: str, rows_in: Optional[int] = None):
+        self.run_id = run_id
+        self.name = name
+        self.rows_in = rows_in
+        self.rows_out: Optional[int] = None
+        self.status = "COMPLETED"
+        self.error: Optional[str] = None
+        self.start_time = datetime.now()
+        self.end_time: Optional[datetime] = None
+        self.seconds = 0.0
+        # RSS sampled as the stage starts and ends, and the process-wide peak at its end
+        self.rss_start_mb: Optional[float] = None
+        self.rss_end_mb: Optional[float] = None
+        self.process_peak_rss_mb: Optional[float] = None
+        self.discard = False
+
+    @property
+    def rows_per_sec(self) -> Optional[float]:
+        rows = self.rows_out if self.rows_out is not None else self.rows_in
+        if rows is None or self.seconds <= 0:
+            return None
+        return rows / self.seconds
+
+    def as_dict(self) -> Dict:
+        return {
+            "run_id": self.run_id,
+            "stage": self.name,
+            "status": self.status,
+            "start_time": self.start_time.isoformat(),
+            "end_time": self.end_time.isoformat() if self.end_time else None,
+            "seconds": round(self.seconds, 6),
+            "rows_in": self.rows_in,
+            "rows_out": self.rows_out,
+            "rows_per_sec": round(self.rows_per_sec, 1) if self.rows_per_sec else None,
+            "rss_start_mb": _round(self.rss_start_mb),
+            "rss_end_mb": _round(self.rss_end_mb),
+            "process_peak_rss_mb": _round(self.process_peak_rss_mb),
+            "error": self.error,
+        }
+
+class PipelineInstrumentation:
+    """Wall time, row counts and resident memory per pipeline stage.
+
+    Stages are recorded once per call (so once per chunk when streaming);
+    summary() folds them into one line per stage for ETL_Logs. With
+    ``profile`` enabled each stage also runs under cProfile and the merged
+    stats are dumped to ``profile_dir`` as <run_id>_<stage>.prof.
+    """
+
+    def __init__(self, profile: bool = False, profile_dir: Optional[str] = None):
+        self.run_id = uuid.uuid4().hex
+        self.started = datetime.now()
+        self.records: List[StageRecord] = []
+        self.profile = profile
+        self.profile_dir = profile_dir
+        self._profiles: Dict[str, pstats.Stats] = {}
+        # Only one cProfile profiler can be active at a time, so nested or
+        # concurrent stages run unprofiled while another stage holds it
+        self._profile_lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str, rows_in: Optional[int] = None) -> Iterator[StageRecord]:
+        record = StageRecord(self.run_id, name, rows_in)
+        record.rss_start_mb = current_rss_mb()
+        profiler = None
+        if self.profile and self._profile_lock.acquire(blocking=False):
+            profiler = cProfile.Profile()
+            profiler.enable()
+        start = time.perf_counter()
+        try:
+            yield record
+        except BaseException as e:
+            record.status = "FAILED"
+            record.error = str(e)
+            raise
+        finally:
+            record.seconds = time.perf_counter() - start
+            record.end_time = datetime.now()
+            record.rss_end_mb = current_rss_mb()
+            record.process_peak_rss_mb = peak_rss_mb()
+            if profiler is not None:
+                profiler.disable()
+                self._profile_lock.release()
+                if name in self._profiles:
+                    self._profiles[name].add(profiler)
+                else:
+                    self._profiles[name] = pstats.Stats(profiler)
+            if not record.discard:
+                self.records.append(record)
+
+    def timed(self, name: str, iterable: Iterable) -> Iterator:
+        """Yield from ``iterable``, recording the time spent producing each item as a stage."""
+        iterator = iter(iterable)
+        while True:
+            with self.stage(name) as record:
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    record.discard = True
+                    return
+                record.rows_out = len(item)
+            yield item
+
+    def summary(self) -> List[Dict]:
+        stages: Dict[str, Dict] = {}
+        for record in self.records:
+            stage = stages.setdefault(record.name, {
+                "stage": record.name,
+                "calls": 0,
+                "seconds": 0.0,
+                "rows_in": 0,
+                "rows_out": 0,
+                "status": "COMPLETED",
+                "error": None,
+                "start_time": record.start_time,
+                "end_time": record.end_time,
+                "rss_mb": None,
+                "process_peak_rss_mb": None,
+            })
+            stage["calls"] += 1
+            stage["seconds"] += record.seconds
+            stage["rows_in"] += record.rows_in or 0
+            stage["rows_out"] += record.rows_out or 0
+            stage["end_time"] = record.end_time
+            # Largest RSS seen at the entry or exit of any call of this stage
+            samples = [value for value in (stage["rss_mb"], record.rss_start_mb, record.rss_end_mb) if value]
+            stage["rss_mb"] = max(samples) if samples else None
+            stage["process_peak_rss_mb"] = record.process_peak_rss_mb
+            if record.status != "COMPLETED":
+                stage["status"] = record.status
+                stage["error"] = record.error
+        for stage in stages.values():
+            rows = stage["rows_out"] or stage["rows_in"]
+            stage["rows_per_sec"] = rows / stage["seconds"] if stage["seconds"] > 0 else None
+        return list(stages.values())
+
+    def write_jsonl(self, path: str) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as handle:
+            for record in self.records:
+                handle.write(json.dumps(record.as_dict()) + "\n")
+
+    def write_etl_logs(self, cursor, status: str, error: Optional[str] = None) -> None:
+        rows = []
+        for stage in self.summary():
+            rows.append((
+                "STAGE",
+                f"{stage['stage']} [{self.run_id}]",
+                stage["rows_out"] or stage["rows_in"],
+                stage["status"],
+                stage["error"],
+                stage["start_time"],
+                stage["end_time"],
+                round(stage["seconds"]),
+            ))
+        ended = datetime.now()
+        rows.append((
+            "INFO", f"ETL Pipeline [{self.run_id}]", None, status, error,
+            self.started, ended, round((ended - self.started).total_seconds()),
+        ))
+        cursor.executemany(
+            """
+            INSERT INTO ETL_Logs (log_type, process_name, record_count, status, error_message,
+                                  start_time, end_time, duration_seconds)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+            """,
+            rows,
+        )
+
+    def dump_profiles(self) -> None:
+        if not self._profiles or not self.profile_dir:
+            return
+        os.makedirs(self.profile_dir, exist_ok=True)
+        for name, stats in self._profiles.items():
+            stats.dump_stats(os.path.join(self.profile_dir, f"{self.run_id}_{name}.prof"))
@@ -0,0 +1,324 @@
+# olap_engine.py
+import os
+from datetime import date, datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .dimension_cache import DIMENSIONS
+
+FACT_KEYS = ["time_id", "company_id", "job_id", "industry_id", "location_id", "source_id"]
+FACT_FETCH_SIZE = 50_000
+# Group-code spaces up to this size are counted with bincount; larger ones are factorized first
+DENSE_GROUP_LIMIT = 10_000_000
+WEEKDAYS = np.array(["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"])
+
+class Level(NamedTuple):
+    """A groupable attribute: the fact key it hangs off, a code per surrogate id, and a label per code."""
+    key: str
+    codes: np.ndarray
+    labels: np.ndarray
+
+# level -> (dimension, dimension column); the time levels are derived from posting_date
+DIMENSION_LEVELS = {
+    "company": ("company", "company_name"),
+    "job_title": ("job", "job_title"),
+    "job_type": ("job", "job_type"),
+    "experience_level": ("job", "experience_level"),
+    "education_level": ("job", "education_level"),
+    "industry": ("industry", "industry_name"),
+    "city": ("location", "city"),
+    "agency": ("agency", "agency_name"),
+}
+TIME_LEVELS = ["date", "year", "quarter", "month", "week", "weekday"]
+
+MEASURES = ["count", "salary_count", "avg_salary_min", "avg_salary_max", "min_salary", "max_salary"]
+
+def _level(key: str, ids: np.ndarray, values: Sequence) -> Level:
+    # NULL attributes form their own group, as in SQL
+    codes, labels = pd.factorize(pd.Series(values), sort=True, use_na_sentinel=False)
+    by_id = np.full(int(ids.max()) + 1 if len(ids) else 1, -1, dtype=np.int32)
+    by_id[ids] = codes
+    return Level(key, by_id, np.asarray(labels))
+
+def mysql_week(dates: np.ndarray) -> np.ndarray:
+    """WEEK(date, 1): weeks start on Monday, week 1 is the first with 4+ days in the year, range 0-53."""
+    days = dates.astype("datetime64[D]")
+    years = days.astype("datetime64[Y]")
+    day_of_year = (days - years).astype(np.int64)
+    # 1970-01-01 was a Thursday; Monday = 0
+    jan1_weekday = (years.astype("datetime64[D]").astype(np.int64) + 3) % 7
+    return (day_of_year + jan1_weekday) // 7 + (jan1_weekday <= 3)
+
+def _time_levels(ids: np.ndarray, dates: np.ndarray) -> Dict[str, Level]:
+    days = dates.astype("datetime64[D]")
+    months = days.astype("datetime64[M]").astype(np.int64) % 12 + 1
+    weekday = (days.astype(np.int64) + 3) % 7
+    return {
+        "date": _level("time_id", ids, list(days)),
+        "year": _level("time_id", ids, days.astype("datetime64[Y]").astype(np.int64) + 1970),
+        "quarter": _level("time_id", ids, (months - 1) // 3 + 1),
+        "month": _level("time_id", ids, months),
+        "week": _level("time_id", ids, mysql_week(days)),
+        "weekday": _level("time_id", ids, WEEKDAYS[weekday]),
+    }
+
+def _to_day(value: Union[str, date, datetime, np.datetime64]) -> np.datetime64:
+    return np.datetime64(pd.Timestamp(value).date(), "D")
+
+class OlapEngine:
+    """The star schema held in memory as NumPy arrays, for the canned reports and ad-hoc slicing.
+
+    Facts are kept as their integer keys and salary measures; every
+    dimension attribute is a Level mapping surrogate ids to small integer
+    codes, so a group-by over any combination of levels is a gather plus a
+    bincount, with no joins. Load it from MySQL once (or from the staging
+    cache offline), save it as a snapshot, and query the snapshot.
+    """
+
+    def __init__(self, facts: Dict[str, np.ndarray], levels: Dict[str, Level], loaded_at: Optional[datetime] = None):
+        self.facts = facts
+        self.levels = levels
+        self.loaded_at = loaded_at or datetime.now()
+        self._row_codes: Dict[str, np.ndarray] = {}
+        salary_min, salary_max = facts["salary_min"], facts["salary_max"]
+        # Salaries only count when both ends are known, as in the aggregate tables
+        self._salaried = ~(np.isnan(salary_min) | np.isnan(salary_max))
+
+    def __len__(self) -> int:
+        return len(self.facts["salary_min"])
+
+    @classmethod
+    def from_connection(cls, connection, fetch_size: int = FACT_FETCH_SIZE) -> "OlapEngine":
+        """Read the fact keys and the dimension attributes from the warehouse."""
+        cursor = connection.cursor()
+        cursor.execute(f"SELECT {', '.join(FACT_KEYS)}, salary_min, salary_max FROM FactJobPosting")
+        batches = []
+        while True:
+            rows = cursor.fetchmany(fetch_size)
+            if not rows:
+                break
+            # None -> NaN for the salaries
+            batches.append(np.array(rows, dtype=np.float64))
+        matrix = np.concatenate(batches) if batches else np.empty((0, len(FACT_KEYS) + 2))
+        facts = {key: matrix[:, i].astype(np.int64) for i, key in enumerate(FACT_KEYS)}
+        facts["salary_min"] = np.ascontiguousarray(matrix[:, -2])
+        facts["salary_max"] = np.ascontiguousarray(matrix[:, -1])
+
+        levels = {}
+        cursor.execute("SELECT time_id, posting_date FROM DimTime")
+        rows = cursor.fetchall()
+        ids = np.array([row[0] for row in rows], dtype=np.int64)
+        levels.update(_time_levels(ids, np.array([row[1] for row in rows], dtype="datetime64[D]")))
+
+        for dimension in dict.fromkeys(dim for dim, _ in DIMENSION_LEVELS.values()):
+            dim = DIMENSIONS[dimension]
+            columns = [column for level, (name, column) in DIMENSION_LEVELS.items() if name == dimension]
+            cursor.execute(f"SELECT {dim.id_column}, {', '.join(columns)} FROM {dim.table}")
+            rows = cursor.fetchall()
+            ids = np.array([row[0] for row in rows], dtype=np.int64)
+            for position, column in enumerate(columns, start=1):
+                level = next(name for name, target in DIMENSION_LEVELS.items() if target == (dimension, column))
+                levels[level] = _level(dim.id_column, ids, [row[position] for row in rows])
+        cursor.close()
+        return cls(facts, levels)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, dimensions: Dict[str, Tuple[str, List[str]]]) -> "OlapEngine":
+        """Build the star from cleaned postings (e.g. the staging cache), with surrogate ids assigned here.
+
+        ``dimensions`` maps each dimension to its fact key and natural key
+        columns, in the order of the Dim table's columns (FACT_DIMENSIONS).
+        """
+        facts, levels = {}, {}
+        for dimension, (key, columns) in dimensions.items():
+            keys = pd.MultiIndex.from_frame(df[columns].astype(object)) if len(columns) > 1 else df[columns[0]]
+            codes, uniques = pd.factorize(keys)
+            facts[key] = codes.astype(np.int64)
+            ids = np.arange(len(uniques), dtype=np.int64)
+            if dimension == "time":
+                levels.update(_time_levels(ids, np.asarray(pd.to_datetime(pd.Series(np.asarray(uniques, dtype=object))), dtype="datetime64[D]")))
+                continue
+            members = list(uniques) if len(columns) > 1 else [(value,) for value in uniques]
+            dim_columns = [column for name, column in DIMENSION_LEVELS.values() if name == dimension]
+            for position, column in enumerate(dim_columns):
+                level = next(name for name, target in DIMENSION_LEVELS.items() if target == (dimension, column))
+                levels[level] = _level(key, ids, [member[position] for member in members])
+        facts["salary_min"] = pd.to_numeric(df["salary_min"]).to_numpy(dtype=np.float64)
+        facts["salary_max"] = pd.to_numeric(df["salary_max"]).to_numpy(dtype=np.float64)
+        return cls(facts, levels)
+
+    def save(self, path: str) -> None:
+        arrays = {f"fact__{key}": values for key, values in self.facts.items()}
+        for name, level in self.levels.items():
+            arrays[f"level__{name}__key"] = np.array(level.key)
+            arrays[f"level__{name}__codes"] = level.codes
+            # Unicode arrays, so loading needs no pickle
+            arrays[f"level__{name}__labels"] = level.labels.astype(str) if level.labels.dtype == object else level.labels
+        arrays["loaded_at"] = np.array(self.loaded_at.isoformat())
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(tmp_path, **arrays)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "OlapEngine":
+        with np.load(path) as data:
+            facts = {name[len("fact__"):]: data[name] for name in data.files if name.startswith("fact__")}
+            levels = {}
+            for name in data.files:
+                if name.startswith("level__") and name.endswith("__key"):
+                    level = name[len("level__"):-len("__key")]
+                    levels[level] = Level(
+                        str(data[name]), data[f"level__{level}__codes"], data[f"level__{level}__labels"]
+                    )
+            loaded_at = datetime.fromisoformat(str(data["loaded_at"]))
+        return cls(facts, levels, loaded_at)
+
+    def row_codes(self, level: str) -> np.ndarray:
+        """The level's code for every fact row (-1 when the member is unknown)."""
+        if level not in self._row_codes:
+            if level not in self.levels:
+                raise ValueError(f"Unknown level {level!r}; expected one of {', '.join(self.levels)}")
+            spec = self.levels[level]
+            keys = self.facts[spec.key]
+            known = (keys >= 0) & (keys < len(spec.codes))
+            self._row_codes[level] = np.where(known, spec.codes[np.where(known, keys, 0)], -1)
+        return self._row_codes[level]
+
+    def _mask(self, where: Optional[Dict[str, Union[object, Iterable]]], date_from, date_to) -> np.ndarray:
+        mask = np.ones(len(self), dtype=bool)
+        for level, wanted in (where or {}).items():
+            codes = self.row_codes(level)
+            values = list(wanted) if isinstance(wanted, (list, tuple, set)) else [wanted]
+            # Compare as text so CLI strings match numeric levels too
+            text = self.levels[level].labels.astype(str)
+            matching = np.flatnonzero(np.isin(text, [str(value) for value in values]))
+            mask &= np.isin(codes, matching)
+        if date_from is not None or date_to is not None:
+            days = self.levels["date"].labels.astype("datetime64[D]")
+            in_range = np.ones(len(days), dtype=bool)
+            if date_from is not None:
+                in_range &= days >= _to_day(date_from)
+            if date_to is not None:
+                in_range &= days < _to_day(date_to)
+            mask &= np.isin(self.row_codes("date"), np.flatnonzero(in_range))
+        return mask
+
+    def query(
+        self,
+        by: Sequence[str] = (),
+        measures: Sequence[str] = ("count",),
+        where: Optional[Dict[str, Union[object, Iterable]]] = None,
+        date_from=None,
+        date_to=None,
+        order_by: Optional[Sequence[str]] = None,
+        ascending: bool = False,
+        top: Optional[int] = None,
+        salaried_only: bool = False,
+    ) -> pd.DataFrame:
+        """Group the facts by ``by`` levels and compute ``measures``.
+
+        ``where`` keeps rows whose level label is (one of) the given
+        value(s); date_from/date_to bound posting_date as [from, to).
+        Results are ordered by ``order_by`` (default: the first measure,
+        descending) and cut to ``top`` rows.
+        """
+        unknown = [measure for measure in measures if measure not in MEASURES]
+        if unknown:
+            raise ValueError(f"Unknown measure(s) {', '.join(unknown)}; expected some of {', '.join(MEASURES)}")
+        mask = self._mask(where, date_from, date_to)
+        if salaried_only:
+            mask &= self._salaried
+
+        # Mixed-radix group code over the levels; rows with an unknown member drop out like an inner join
+        group = np.zeros(len(self), dtype=np.int64)
+        for level in by:
+            codes = self.row_codes(level)
+            mask &= codes >= 0
+            group = group * len(self.levels[level].labels) + codes
+            if len(self.levels[level].labels) and group.max(initial=0) > DENSE_GROUP_LIMIT:
+                group = pd.factorize(group)[0].astype(np.int64)
+        rows = np.flatnonzero(mask)
+        group = group[rows]
+
+        if by and group.max(initial=-1) >= DENSE_GROUP_LIMIT:
+            present, inverse = np.unique(group, return_inverse=True)
+        else:
+            size = int(group.max(initial=-1)) + 1
+            counts = np.bincount(group, minlength=size)
+            present = np.flatnonzero(counts)
+            remap = np.full(size, -1, dtype=np.int64)
+            remap[present] = np.arange(len(present))
+            inverse = remap[group]
+        groups = len(present)
+
+        result = {}
+        # Labels of each group, taken from any one of its rows
+        member_row = np.empty(groups, dtype=np.int64)
+        member_row[inverse] = rows
+        for level in by:
+            result[level] = self.levels[level].labels[self.row_codes(level)[member_row]]
+
+        salaried = self._salaried[rows]
+        salary_min = np.where(salaried, self.facts["salary_min"][rows], 0.0)
+        salary_max = np.where(salaried, self.facts["salary_max"][rows], 0.0)
+        salary_count = np.bincount(inverse, weights=salaried, minlength=groups)
+        for measure in measures:
+            if measure == "count":
+                result[measure] = np.bincount(inverse, minlength=groups).astype(np.int64)
+            elif measure == "salary_count":
+                result[measure] = salary_count.astype(np.int64)
+            elif measure in ("avg_salary_min", "avg_salary_max"):
+                sums = np.bincount(inverse, weights=salary_min if measure == "avg_salary_min" else salary_max, minlength=groups)
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    result[measure] = np.where(salary_count > 0, sums / salary_count, np.nan)
+            elif measure == "min_salary":
+                values = np.full(groups, np.inf)
+                np.minimum.at(values, inverse[salaried], salary_min[salaried])
+                result[measure] = np.where(np.isinf(values), np.nan, values)
+            elif measure == "max_salary":
+                values = np.full(groups, -np.inf)
+                np.maximum.at(values, inverse[salaried], salary_max[salaried])
+                result[measure] = np.where(np.isinf(values), np.nan, values)
+
+        frame = pd.DataFrame(result, columns=list(by) + list(measures))
+        order = list(order_by) if order_by else list(measures[:1])
+        if order:
+            frame = frame.sort_values(order, ascending=ascending, kind="stable")
+        if top is not None:
+            frame = frame.head(top)
+        return frame.reset_index(drop=True)
+
+    def summary(self) -> Dict[str, object]:
+        """The figures of JobETL.generate_summary."""
+        industry = self.query(["industry"], top=1)
+        city = self.query(["city"], top=1)
+        return {
+            "total_jobs": len(self),
+            "jobs_with_salary": int(np.count_nonzero(self._salaried)),
+            "unique_companies": int(len(np.unique(self.facts["company_id"]))),
+            "top_industry": None if industry.empty else {
+                "industry_name": industry.at[0, "industry"], "count": int(industry.at[0, "count"])
+            },
+            "top_location": None if city.empty else {"city": city.at[0, "city"], "count": int(city.at[0, "count"])},
+        }
+
+# The report queries of ANALYSIS/olap_queries.sql (1-6) as query() arguments
+REPORTS = {
+    "industry_demand": {"by": ["industry"]},
+    "location_demand": {"by": ["city"]},
+    "top_companies": {"by": ["company"], "top": 20},
+    "salary_trend": {
+        "by": ["year", "month", "industry"],
+        "measures": ["avg_salary_min", "avg_salary_max"],
+        "order_by": ["year", "month"],
+        "ascending": True,
+        "salaried_only": True,
+    },
+    "weekly_trend": {"by": ["year", "week"], "order_by": ["year", "week"], "ascending": True},
+    "agency_comparison": {"by": ["agency"]},
+}
@@ -0,0 +1,77 @@
+# parallel.py
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+from .cleaning_rules import (
+    NormalizationCache, compile_rules, concat_frames, deduplicate_dataframe, transform_dataframe
+)
+
+def partition_frame(df: pd.DataFrame, partition_size: int) -> List[pd.DataFrame]:
+    return [df.iloc[start:start + partition_size] for start in range(0, len(df), partition_size)]
+
+# Smaller partitions cost more to pickle to a worker than they save
+MIN_PARTITION_SIZE = 1_000
+
+def resolve_workers(workers: Optional[int]) -> int:
+    return workers or os.cpu_count() or 1
+
+def resolve_partition_size(partition_size: Optional[int], rows: int, workers: int) -> int:
+    """The configured partition size, or an even split of ``rows`` over the workers."""
+    if partition_size:
+        return partition_size
+    return max(-(-rows // workers), MIN_PARTITION_SIZE)
+
+def parallel_apply(
+    df: pd.DataFrame,
+    func: Callable[[pd.DataFrame], pd.DataFrame],
+    workers: Optional[int] = None,
+    partition_size: Optional[int] = None,
+    executor: Optional[Executor] = None,
+) -> pd.DataFrame:
+    """Run a row-local frame transform over partitions in worker processes.
+
+    ``func`` must be picklable and must not depend on rows outside its
+    partition; partitions are pickled to the workers and the results are
+    concatenated back in input order, so the output matches func(df).
+    Without a ``partition_size`` each worker gets an equal share of ``df``,
+    so a streaming chunk is split across the pool too.
+    """
+    workers = resolve_workers(workers)
+    partition_size = resolve_partition_size(partition_size, len(df), workers)
+    if len(df) <= partition_size or (workers <= 1 and executor is None):
+        return func(df)
+
+    partitions = partition_frame(df, partition_size)
+    if executor is not None:
+        results = list(executor.map(func, partitions))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(func, partitions))
+    # Partitions clean to categoricals with their own categories
+    return concat_frames(results)
+
+def transform_dataframe_parallel(
+    df: pd.DataFrame,
+    config: Dict,
+    workers: Optional[int] = None,
+    partition_size: Optional[int] = None,
+    executor: Optional[Executor] = None,
+    cache: Optional[NormalizationCache] = None,
+) -> pd.DataFrame:
+    """transform_dataframe across processes; near-duplicates are merged on the combined result.
+
+    The posting date format is detected on the whole of ``df`` before it is
+    split, so every partition parses its dates as the serial path would.
+    """
+    partition_size = resolve_partition_size(partition_size, len(df), resolve_workers(workers))
+    if len(df) <= partition_size or (resolve_workers(workers) <= 1 and executor is None):
+        return transform_dataframe(df, config, cache)
+    date_format = compile_rules(config).detect_date_format(df["Posting Date"])
+    transform = partial(transform_dataframe, config=config, deduplicate=False, date_format=date_format)
+    return deduplicate_dataframe(
+        parallel_apply(df, transform, workers, partition_size, executor), config
+    )
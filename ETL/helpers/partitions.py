@@ -0,0 +1,138 @@
+# partitions.py
+import gzip
+import os
+from datetime import date
+from typing import List, NamedTuple, Optional
+
+import pandas as pd
+
+MAXVALUE_PARTITION = "pmax"
+EXPORT_BATCH_ROWS = 50_000
+
+class Partition(NamedTuple):
+    name: str
+    # Exclusive upper bound; None for the MAXVALUE catch-all
+    upper: Optional[date]
+
+def month_start(value) -> date:
+    value = pd.Timestamp(value)
+    return date(value.year, value.month, 1)
+
+def add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+def partition_name(month: date) -> str:
+    return f"p{month:%Y%m}"
+
+def _parse_bound(description: str) -> Optional[date]:
+    if description == "MAXVALUE":
+        return None
+    return date.fromisoformat(description.strip("'"))
+
+class MonthlyPartitions:
+    """RANGE COLUMNS(posting_date) partitions of one table, one per posting month.
+
+    The table always ends in a MAXVALUE partition (pmax); new months are
+    split off it with REORGANIZE PARTITION before rows for them arrive, so
+    pmax stays empty and the reorganize only rewrites metadata. Partition DDL
+    commits implicitly in MySQL, so call ensure() outside a transaction.
+    """
+
+    def __init__(self, table: str, lookahead_months: int = 1):
+        self.table = table
+        self.lookahead_months = lookahead_months
+        self._partitions: Optional[List[Partition]] = None
+
+    def partitions(self, cursor) -> List[Partition]:
+        if self._partitions is None:
+            cursor.execute(
+                """
+                SELECT PARTITION_NAME, PARTITION_DESCRIPTION
+                FROM information_schema.PARTITIONS
+                WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND PARTITION_NAME IS NOT NULL
+                ORDER BY PARTITION_ORDINAL_POSITION
+                """,
+                (self.table,),
+            )
+            self._partitions = [Partition(name, _parse_bound(bound)) for name, bound in cursor.fetchall()]
+            if not self._partitions or self._partitions[-1].upper is not None:
+                raise ValueError(
+                    f"{self.table} is not partitioned by month with a {MAXVALUE_PARTITION} partition; "
+                    "run DATABASE DESIGN/partition_fact_table.sql first"
+                )
+        return self._partitions
+
+    def ensure(self, cursor, posting_dates: pd.Series, today: Optional[date] = None) -> List[str]:
+        """Create partitions up to the later of the batch's last month and today's, plus the lookahead."""
+        partitions = self.partitions(cursor)
+        last_month = month_start(today or date.today())
+        if posting_dates.notna().any():
+            last_month = max(last_month, month_start(posting_dates.max()))
+        target = add_months(last_month, self.lookahead_months + 1)
+
+        bounded = [partition.upper for partition in partitions if partition.upper is not None]
+        if bounded:
+            month = bounded[-1]
+        elif posting_dates.notna().any():
+            month = month_start(posting_dates.min())
+        else:
+            month = last_month
+        new_partitions = []
+        while month < target:
+            new_partitions.append(Partition(partition_name(month), add_months(month, 1)))
+            month = add_months(month, 1)
+        if not new_partitions:
+            return []
+
+        definitions = [
+            f"PARTITION {partition.name} VALUES LESS THAN ('{partition.upper.isoformat()}')"
+            for partition in new_partitions
+        ]
+        definitions.append(f"PARTITION {MAXVALUE_PARTITION} VALUES LESS THAN (MAXVALUE)")
+        cursor.execute(
+            f"ALTER TABLE {self.table} REORGANIZE PARTITION {MAXVALUE_PARTITION} INTO ({', '.join(definitions)})"
+        )
+        self._partitions = partitions[:-1] + new_partitions + [partitions[-1]]
+        return [partition.name for partition in new_partitions]
+
+    def expired(self, cursor, retention_months: int, today: Optional[date] = None) -> List[Partition]:
+        """Partitions whose every row is older than ``retention_months`` full months."""
+        cutoff = add_months(month_start(today or date.today()), -retention_months)
+        return [
+            partition for partition in self.partitions(cursor)
+            if partition.upper is not None and partition.upper <= cutoff
+        ]
+
+    def export(self, cursor, partition: Partition, archive_dir: str) -> str:
+        """Write one partition's rows to <archive_dir>/<table>_<partition>.csv.gz."""
+        os.makedirs(archive_dir, exist_ok=True)
+        path = os.path.join(archive_dir, f"{self.table}_{partition.name}.csv.gz")
+        cursor.execute(f"SELECT * FROM {self.table} PARTITION ({partition.name})")
+        columns = [column[0] for column in cursor.description]
+        with gzip.open(path, "wt", encoding="utf-8", newline="") as handle:
+            header = True
+            while True:
+                rows = cursor.fetchmany(EXPORT_BATCH_ROWS)
+                if not rows and not header:
+                    break
+                pd.DataFrame.from_records(rows, columns=columns).to_csv(handle, index=False, header=header)
+                header = False
+        return path
+
+    def rows(self, cursor, partition: Partition, columns: List[str]) -> pd.DataFrame:
+        """``columns`` of every row in one partition, e.g. to retract them from aggregates before a drop."""
+        cursor.execute(f"SELECT {', '.join(columns)} FROM {self.table} PARTITION ({partition.name})")
+        return pd.DataFrame(cursor.fetchall(), columns=columns)
+
+    def delete_rows(self, cursor, partition: Partition) -> int:
+        """Delete one partition's rows inside the caller's transaction, unlike drop's DDL."""
+        cursor.execute(f"DELETE FROM {self.table} PARTITION ({partition.name})")
+        return cursor.rowcount
+
+    def drop(self, cursor, partitions: List[Partition]) -> None:
+        if not partitions:
+            return
+        names = [partition.name for partition in partitions]
+        cursor.execute(f"ALTER TABLE {self.table} DROP PARTITION {', '.join(names)}")
+        self._partitions = [partition for partition in self._partitions if partition.name not in names]
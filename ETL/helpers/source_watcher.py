@@ -0,0 +1,50 @@
+# source_watcher.py
+import os
+from typing import Dict, List, Tuple
+
+from .sources import resolve_sources
+
+Signature = Tuple[int, int]
+
+class SourceWatcher:
+    """Polls the files matched by a DATA_PATH (file, directory or glob) for changes.
+
+    A file counts as changed when it is new or its size or mtime differs
+    from the last acknowledged state. changed() only reports; acknowledge()
+    records the state once the files were loaded, so a failed micro-batch
+    is picked up again on the next poll.
+    """
+
+    def __init__(self, data_path: str):
+        self.data_path = data_path
+        self._seen: Dict[str, Signature] = {}
+
+    @staticmethod
+    def _signature(path: str) -> Signature:
+        stat = os.stat(path)
+        return stat.st_size, stat.st_mtime_ns
+
+    def snapshot(self) -> Dict[str, Signature]:
+        signatures = {}
+        for source in resolve_sources(self.data_path):
+            try:
+                signatures[source] = self._signature(source)
+            except FileNotFoundError:
+                # Removed between the listing and the stat
+                continue
+        return signatures
+
+    def changed(self) -> Tuple[List[str], Dict[str, Signature]]:
+        """Files that are new or modified since they were last acknowledged, plus the snapshot taken."""
+        snapshot = self.snapshot()
+        changed = [source for source, signature in snapshot.items() if self._seen.get(source) != signature]
+        return changed, snapshot
+
+    def acknowledge(self, snapshot: Dict[str, Signature], sources: List[str]) -> None:
+        for source in sources:
+            if source in snapshot:
+                self._seen[source] = snapshot[source]
+        # Forget files that disappeared so they are reloaded if they come back
+        for source in list(self._seen):
+            if source not in snapshot:
+                del self._seen[source]
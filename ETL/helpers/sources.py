@@ -0,0 +1,82 @@
+# sources.py
+import glob
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, List, Tuple, TypeVar
+
+Item = TypeVar("Item")
+
+SOURCE_PATTERN = "*.csv"
+_DONE = object()
+
+def resolve_sources(path: str) -> List[str]:
+    """Expand a file, a directory (its *.csv files) or a glob into a sorted list of files."""
+    if os.path.isdir(path):
+        sources = glob.glob(os.path.join(path, SOURCE_PATTERN))
+    elif glob.has_magic(path):
+        sources = glob.glob(path)
+    else:
+        return [path]
+    return sorted(source for source in sources if os.path.isfile(source))
+
+def read_concurrently(
+    sources: List[str],
+    produce: Callable[[str], Iterable[Item]],
+    workers: int,
+    buffer_size: int = 0,
+) -> Iterator[Tuple[str, Item]]:
+    """Yield (source, item) for every item of produce(source), with up to ``workers`` sources in flight.
+
+    Producers run in threads and hand items over through a queue holding at
+    most ``buffer_size`` items (default 2 per worker), so readers stall
+    instead of buffering whole files when the consumer is slower. Items from
+    one source keep their order; sources interleave. The first producer
+    error is re-raised here, and closing the generator stops the producers.
+    """
+    workers = max(1, min(workers, len(sources)))
+    if workers == 1:
+        for source in sources:
+            for item in produce(source):
+                yield source, item
+        return
+
+    results: queue.Queue = queue.Queue(maxsize=buffer_size or 2 * workers)
+    stop = threading.Event()
+
+    def put(entry) -> bool:
+        while not stop.is_set():
+            try:
+                results.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def run(source: str) -> None:
+        try:
+            for item in produce(source):
+                if not put((source, item, None)):
+                    return
+        except BaseException as e:
+            put((source, None, e))
+        finally:
+            put((source, _DONE, None))
+
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="source")
+    try:
+        for source in sources:
+            pool.submit(run, source)
+        remaining = len(sources)
+        while remaining:
+            source, item, error = results.get()
+            if error is not None:
+                raise error
+            if item is _DONE:
+                remaining -= 1
+                continue
+            yield source, item
+    finally:
+        stop.set()
+        pool.shutdown(wait=True)
@@ -0,0 +1,275 @@
+# staging_cache.py
+import glob
+import hashlib
+import json
+import os
+import shutil
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from .cleaning_rules import concat_frames
+
+try:
+    import pyarrow  # noqa: F401  (pandas' Parquet/Feather engine)
+except ImportError:
+    pyarrow = None
+
+# Bump when clean_data's output changes shape so older entries are not reused
+CACHE_VERSION = 1
+FORMATS = {"parquet": ".parquet", "feather": ".feather"}
+MANIFEST = "manifest.json"
+ROW_COLUMN = "source_row"
+MONTH_PARTITION = "posting_month="
+SALARY_COLUMNS = ["salary_min", "salary_max"]
+# pyarrow's pandas conversion is not safe to enter from several source threads at once
+_CONVERT_LOCK = threading.Lock()
+
+def settings_digest(config: dict) -> str:
+    """Digest of the config sections that change what clean_data produces."""
+    etl_config = config.get("etl", {})
+    quality_config = config.get("data_quality", {})
+    settings = {
+        "version": CACHE_VERSION,
+        "cleaning_rules": config.get("cleaning_rules", {}),
+        "cleaning": config.get("cleaning", {}),
+        # Cached chunks are matched to the source's chunks by number
+        "batch_size": etl_config.get("batch_size") if etl_config.get("streaming", False) else None,
+        # Whether clean_data defaults missing posting dates to the load date
+        "date_validation": quality_config.get("enabled", False) and quality_config.get("date_validation", False),
+    }
+    # Key order is kept: reordering a keyword table changes which rule wins
+    return hashlib.sha256(json.dumps(settings, default=str).encode("utf-8")).hexdigest()
+
+def encode(df: pd.DataFrame) -> pd.DataFrame:
+    """Cleaned chunk -> columnar frame; clean_data's categoricals are stored dictionary-encoded."""
+    frame = df.reset_index(drop=False).rename(columns={"index": ROW_COLUMN})
+    for column in SALARY_COLUMNS:
+        if column in frame:
+            frame[column] = pd.to_numeric(frame[column], errors="coerce").astype(float)
+    return frame
+
+def decode(frame: pd.DataFrame) -> pd.DataFrame:
+    """Inverse of encode."""
+    return frame.set_index(ROW_COLUMN).rename_axis(None)
+
+class CacheEntry:
+    """Cleaned chunks of one source read, partitioned by posting month.
+
+    <entry>/posting_month=YYYY-MM/chunk-00001.parquet, plus a manifest
+    listing the chunks written so far. Only chunks in the manifest are
+    trusted, so a run that died mid-write leaves a usable prefix; ``complete``
+    is set once the whole source has been cleaned. Each chunk is also
+    marked ``loaded`` once the warehouse commit holding it succeeds, so a
+    replay only loads the chunks that never made it, alongside
+    loaded-00001.parquet listing the rows that commit took: a chunk is cached
+    before the quality gate, near-duplicate merge and seen-index filter, so
+    only those rows are what the warehouse holds.
+    """
+
+    def __init__(self, path: str, file_format: str, manifest: dict):
+        self.path = path
+        self.file_format = file_format
+        self.extension = FORMATS[file_format]
+        self.manifest = manifest
+        # A source thread writes chunks while the loading thread marks them loaded
+        self._lock = threading.Lock()
+
+    @property
+    def complete(self) -> bool:
+        return self.manifest.get("complete", False)
+
+    @property
+    def chunks(self) -> Dict[int, dict]:
+        return {chunk["number"]: chunk for chunk in self.manifest.get("chunks", [])}
+
+    def has_chunk(self, number: int) -> bool:
+        return number in self.chunks
+
+    def is_loaded(self, number: int) -> bool:
+        return self.chunks[number].get("loaded", False)
+
+    def mark_loaded(self, number: int, rows: Iterable[int] = ()) -> None:
+        """Mark a chunk committed, keeping the source rows of it that were loaded."""
+        loaded = pd.DataFrame({ROW_COLUMN: pd.Index(rows, dtype="int64")})
+        self._write_file(loaded, self._loaded_path(number))
+        with self._lock:
+            chunk = self.chunks[number]
+            chunk["loaded"] = True
+            chunk["rows_loaded"] = len(loaded)
+            self._save_manifest()
+
+    def loaded_rows(self, number: int) -> pd.Index:
+        """Source rows of a loaded chunk that reached the warehouse."""
+        return pd.Index(self._read_file(self._loaded_path(number))[ROW_COLUMN])
+
+    def _chunk_path(self, month: str, number: int) -> str:
+        return os.path.join(self.path, f"{MONTH_PARTITION}{month}", f"chunk-{number:05d}{self.extension}")
+
+    def _loaded_path(self, number: int) -> str:
+        return os.path.join(self.path, f"loaded-{number:05d}{self.extension}")
+
+    def _save_manifest(self) -> None:
+        tmp_path = os.path.join(self.path, f"{MANIFEST}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(self.manifest, handle, indent=2)
+        os.replace(tmp_path, os.path.join(self.path, MANIFEST))
+
+    def _write_file(self, frame: pd.DataFrame, path: str) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with _CONVERT_LOCK:
+            if self.file_format == "parquet":
+                frame.to_parquet(tmp_path, index=False)
+            else:
+                frame.reset_index(drop=True).to_feather(tmp_path)
+        os.replace(tmp_path, path)
+
+    def _read_file(self, path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        with _CONVERT_LOCK:
+            if self.file_format == "parquet":
+                return pd.read_parquet(path, columns=columns)
+            return pd.read_feather(path, columns=columns)
+
+    def write_chunk(self, number: int, df: pd.DataFrame, rows_in: int) -> None:
+        frame = encode(df)
+        # Rows without a date (left for the data quality gate) get a partition of their own
+        months = pd.to_datetime(frame["Posting Date"]).dt.strftime("%Y-%m").fillna("unknown")
+        for month, group in frame.groupby(months, sort=True):
+            self._write_file(group, self._chunk_path(month, number))
+        with self._lock:
+            self.manifest.setdefault("chunks", []).append({
+                "number": number,
+                "rows_in": rows_in,
+                "rows": len(frame),
+                "months": sorted(months.unique().tolist()),
+                "loaded": False,
+            })
+            self._save_manifest()
+
+    def read_chunk(self, number: int) -> pd.DataFrame:
+        chunk = self.chunks[number]
+        frames = [self._read_file(self._chunk_path(month, number)) for month in chunk["months"]]
+        if not frames:
+            return pd.DataFrame()
+        # Months were split apart on write; restore the source order
+        return decode(concat_frames(frames, ignore_index=True).sort_values(ROW_COLUMN, kind="stable"))
+
+    def finish(self, watermark: Optional[dict] = None) -> None:
+        with self._lock:
+            self.manifest["complete"] = True
+            self.manifest["watermark"] = watermark
+            self.manifest["completed_at"] = datetime.now().isoformat()
+            self._save_manifest()
+
+    def read_loaded(self, columns: Optional[List[str]] = None, months: Optional[Iterable[str]] = None) -> List[pd.DataFrame]:
+        """The loaded rows of every loaded chunk, one frame per chunk and month, keeping ``source_row``."""
+        wanted = set(months) if months is not None else None
+        frames = []
+        for number, chunk in sorted(self.chunks.items()):
+            if not chunk.get("loaded", False):
+                continue
+            chunk_months = [month for month in chunk["months"] if wanted is None or month in wanted]
+            if not chunk_months:
+                continue
+            loaded = self.loaded_rows(number)
+            for month in chunk_months:
+                frame = self._read_file(self._chunk_path(month, number), columns)
+                frames.append(frame[frame[ROW_COLUMN].isin(loaded)])
+        return frames
+
+class StagingCache:
+    """Columnar copies of clean_data's output, one entry per source read.
+
+    An entry is keyed by the source file's identity (path, size, mtime), the
+    byte range read, and the cleaning settings, so a re-run over the same
+    input reuses it instead of re-cleaning, while a changed file or config
+    starts a new one.
+    """
+
+    def __init__(self, root: str, file_format: str = "parquet"):
+        if file_format not in FORMATS:
+            raise ValueError(f"Unknown staging cache format {file_format!r}; expected one of {', '.join(FORMATS)}")
+        if pyarrow is None:
+            raise ImportError("The staging cache needs pyarrow (pip install pyarrow)")
+        self.root = root
+        self.file_format = file_format
+
+    def _entry_name(self, source: str, key: str) -> str:
+        stem = os.path.splitext(os.path.basename(source))[0]
+        return f"{stem}-{key[:16]}"
+
+    def open(self, source: str, digest: str, start: int = 0, end: Optional[int] = None) -> CacheEntry:
+        """The entry for reading ``source`` bytes [start, end) with the given settings digest."""
+        stat = os.stat(source)
+        identity = {
+            "source": os.path.abspath(source),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "start": start,
+            "end": end,
+            "format": self.file_format,
+            "settings": digest,
+        }
+        key = hashlib.sha256(json.dumps(identity, sort_keys=True).encode("utf-8")).hexdigest()
+        path = os.path.join(self.root, self._entry_name(source, key))
+
+        manifest_path = os.path.join(path, MANIFEST)
+        if os.path.exists(manifest_path):
+            with open(manifest_path, "r", encoding="utf-8") as handle:
+                manifest = json.load(handle)
+            if manifest.get("key") == key:
+                return CacheEntry(path, self.file_format, manifest)
+        # Nothing usable: start over, dropping files of a write that never reached the manifest
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path, exist_ok=True)
+        return CacheEntry(path, self.file_format, dict(identity, key=key, created_at=datetime.now().isoformat(), chunks=[]))
+
+    def entries(self, complete_only: bool = True) -> List[CacheEntry]:
+        entries = []
+        for manifest_path in sorted(glob.glob(os.path.join(self.root, "*", MANIFEST))):
+            with open(manifest_path, "r", encoding="utf-8") as handle:
+                manifest = json.load(handle)
+            entry = CacheEntry(os.path.dirname(manifest_path), manifest.get("format", self.file_format), manifest)
+            if entry.complete or not complete_only:
+                entries.append(entry)
+        return entries
+
+    def prune(self, current: CacheEntry) -> List[str]:
+        """Remove older entries covering the same source range, which ``current`` supersedes."""
+        removed = []
+        for entry in self.entries(complete_only=False):
+            if entry.path == current.path:
+                continue
+            if (entry.manifest.get("source"), entry.manifest.get("start")) == (
+                current.manifest.get("source"), current.manifest.get("start")
+            ):
+                shutil.rmtree(entry.path, ignore_errors=True)
+                removed.append(entry.path)
+        return removed
+
+    def iter_chunks(self) -> Iterator[Tuple[CacheEntry, int]]:
+        """(entry, chunk number) for every chunk of a complete entry not yet loaded, oldest first."""
+        for entry in sorted(self.entries(), key=lambda entry: entry.manifest.get("created_at", "")):
+            for number in sorted(entry.chunks):
+                if not entry.is_loaded(number):
+                    yield entry, number
+
+    def read(self, columns: Optional[List[str]] = None, months: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """Every cached posting loaded into the warehouse (optionally only some columns /
+        posting months) as one frame, for offline analysis.
+
+        Quarantined, merged and already-loaded rows stay in the cached chunks
+        for replays but are left out here, as are chunks not yet loaded.
+        """
+        months = list(months) if months is not None else None
+        read_columns = None if columns is None else list(dict.fromkeys(list(columns) + [ROW_COLUMN]))
+        frames = []
+        for entry in self.entries():
+            frames.extend(entry.read_loaded(read_columns, months))
+        if not frames:
+            return pd.DataFrame(columns=columns)
+        frame = concat_frames(frames, ignore_index=True)
+        return frame.drop(columns=ROW_COLUMN) if columns is None or ROW_COLUMN not in columns else frame
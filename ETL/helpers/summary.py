@@ -0,0 +1,121 @@
+# summary.py
+import json
+import os
+from datetime import datetime
+from typing import Dict, Optional
+
+import pandas as pd
+
+# One scan of the fact table, grouped finely enough to derive every figure
+FACT_SUMMARY_QUERY = """
+    SELECT industry_id, location_id, company_id,
+           COUNT(*) AS posting_count,
+           SUM(CASE WHEN salary_min IS NOT NULL AND salary_max IS NOT NULL THEN 1 ELSE 0 END) AS salary_count
+    FROM FactJobPosting
+    GROUP BY industry_id, location_id, company_id
+"""
+
+# The maintained counters (DATABASE DESIGN/aggregate_tables.sql), a fraction of the fact table's size
+AGGREGATE_SUMMARY_QUERY = """
+    SELECT industry_id, location_id,
+           SUM(posting_count) AS posting_count,
+           SUM(salary_count) AS salary_count
+    FROM AggJobPostingDaily
+    GROUP BY industry_id, location_id
+"""
+AGGREGATE_COMPANIES_QUERY = "SELECT COUNT(DISTINCT company_id) FROM AggCompanyPostings"
+
+def _fetch_frame(cursor, query: str) -> pd.DataFrame:
+    cursor.execute(query)
+    rows = cursor.fetchall()
+    return pd.DataFrame(rows, columns=[column[0] for column in cursor.description])
+
+def _top(counts: pd.DataFrame, id_column: str, names: Dict[int, str], name_column: str) -> Optional[dict]:
+    if counts.empty:
+        return None
+    # Several ids can share a display name (e.g. a city in two provinces); rank the names
+    totals = counts.groupby(counts[id_column].map(names), sort=False)["posting_count"].sum()
+    if totals.empty:
+        return None
+    name = totals.idxmax()
+    return {name_column: name, "count": int(totals[name])}
+
+def compute_summary(cursor, use_aggregates: bool = False) -> dict:
+    """Total jobs, jobs with a salary, unique companies and the top industry/location.
+
+    Read from the aggregate tables when the ETL maintains them, otherwise
+    from a single grouped scan of FactJobPosting. Jobs count as salaried
+    when both salary ends are known, as in the aggregates.
+    """
+    if use_aggregates:
+        counts = _fetch_frame(cursor, AGGREGATE_SUMMARY_QUERY)
+        cursor.execute(AGGREGATE_COMPANIES_QUERY)
+        unique_companies = cursor.fetchone()[0]
+    else:
+        counts = _fetch_frame(cursor, FACT_SUMMARY_QUERY)
+        unique_companies = counts["company_id"].nunique()
+    counts[["posting_count", "salary_count"]] = counts[["posting_count", "salary_count"]].astype("int64")
+
+    cursor.execute("SELECT industry_id, industry_name FROM DimIndustry")
+    industries = dict(cursor.fetchall())
+    cursor.execute("SELECT location_id, city FROM DimLocation")
+    locations = dict(cursor.fetchall())
+    return {
+        "total_jobs": int(counts["posting_count"].sum()),
+        "jobs_with_salary": int(counts["salary_count"].sum()),
+        "unique_companies": int(unique_companies or 0),
+        "top_industry": _top(counts, "industry_id", industries, "industry_name"),
+        "top_location": _top(counts, "location_id", locations, "city"),
+    }
+
+class SummaryCache:
+    """The last summary, tagged with the ETL run whose load it reflects.
+
+    Runs that load rows call invalidate(run_id); the summary is then
+    computed once for that run and served from here until the next load,
+    across processes when a path is given.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._state: dict = {}
+        self._refresh()
+
+    def _refresh(self) -> None:
+        # Another process (cron run, daemon) may have loaded since
+        if self.path and os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as handle:
+                self._state = json.load(handle)
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(self._state, handle, indent=2)
+        os.replace(tmp_path, self.path)
+
+    @property
+    def run_id(self) -> Optional[str]:
+        self._refresh()
+        return self._state.get("run_id")
+
+    def get(self) -> Optional[dict]:
+        """The cached summary, or None when a load happened since it was computed."""
+        self._refresh()
+        return self._state.get("summary")
+
+    def put(self, figures: dict, run_id: Optional[str]) -> dict:
+        """Cache figures computed as of ``run_id``; returns them tagged with it."""
+        summary = dict(run_id=run_id, generated_at=datetime.now().isoformat(), **figures)
+        self._refresh()
+        # A load that finished while these were computed has made them stale already
+        if self._state.get("run_id") == run_id:
+            self._state = {"run_id": run_id, "summary": summary}
+            self._save()
+        return summary
+
+    def invalidate(self, run_id: str) -> None:
+        self._state = {"run_id": run_id, "summary": None}
+        self._save()
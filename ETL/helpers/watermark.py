@@ -0,0 +1,173 @@
+# watermark.py
+import hashlib
+import io
+import json
+import os
+from typing import Dict, List, NamedTuple, Optional
+
+import pandas as pd
+
+DIGEST_BYTES = 4096
+TAIL_SCAN_BYTES = 65536
+
+class ReadPlan(NamedTuple):
+    start: int
+    end: int
+    columns: Optional[List[str]]
+    # Set when the file was rewritten rather than appended to; rows at or
+    # before this timestamp were already loaded
+    loaded_until: Optional[pd.Timestamp]
+    # Data rows (header excluded) before ``start``, to number rows as in the whole file
+    start_row: int = 0
+
+def _digest(handle, start: int, end: int) -> str:
+    start = max(start, 0)
+    handle.seek(start)
+    return hashlib.sha256(handle.read(max(end - start, 0))).hexdigest()
+
+def _last_line_end(handle, size: int) -> int:
+    """Offset just past the last newline, so a row still being written is left for later."""
+    position = size
+    while position > 0:
+        block_start = max(position - TAIL_SCAN_BYTES, 0)
+        handle.seek(block_start)
+        block = handle.read(position - block_start)
+        newline = block.rfind(b"\n")
+        if newline >= 0:
+            return block_start + newline + 1
+        position = block_start
+    return 0
+
+def _count_rows(handle, end: int) -> int:
+    """Data rows before byte ``end``: its newlines, less the header's."""
+    handle.seek(0)
+    newlines, remaining = 0, end
+    while remaining > 0:
+        block = handle.read(min(TAIL_SCAN_BYTES, remaining))
+        if not block:
+            break
+        newlines += block.count(b"\n")
+        remaining -= len(block)
+    return max(newlines - 1, 0)
+
+class _SliceReader(io.RawIOBase):
+    def __init__(self, path: str, start: int, end: int):
+        self._handle = open(path, "rb")
+        self._handle.seek(start)
+        self._remaining = end - start
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        size = min(len(buffer), self._remaining)
+        if size <= 0:
+            return 0
+        data = self._handle.read(size)
+        buffer[:len(data)] = data
+        self._remaining -= len(data)
+        return len(data)
+
+    def close(self) -> None:
+        self._handle.close()
+        super().close()
+
+def open_slice(path: str, start: int, end: int) -> io.BufferedReader:
+    return io.BufferedReader(_SliceReader(path, start, end))
+
+class WatermarkStore:
+    """Per-source high-water marks persisted as JSON.
+
+    A mark records how far into the file the last successful run read (byte
+    offset of the last complete line, and the data rows up to it), a
+    fingerprint of the file at that point, the largest Timestamp value
+    loaded and the Posting Date format its rows were parsed in. Marks
+    advanced during a run stay pending until save() so a failed run
+    re-reads its rows.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._marks: Dict[str, dict] = {}
+        self._pending: Dict[str, dict] = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as handle:
+                self._marks = json.load(handle)
+
+    def plan(self, source: str) -> ReadPlan:
+        key = os.path.abspath(source)
+        mark = self._marks.get(key)
+        stat = os.stat(source)
+        with open(source, "rb") as handle:
+            end = _last_line_end(handle, stat.st_size)
+            if mark is None:
+                return ReadPlan(0, end, None, None)
+            offset = mark["offset"]
+            unchanged = stat.st_size == mark["size"] and stat.st_mtime == mark["mtime"]
+            appended = unchanged or (
+                stat.st_size >= offset
+                and _digest(handle, 0, min(offset, DIGEST_BYTES)) == mark["head_digest"]
+                and _digest(handle, offset - DIGEST_BYTES, offset) == mark["tail_digest"]
+            )
+            if appended:
+                # Marks saved before rows were recorded: count the lines (a
+                # quoted field spanning lines makes this an overestimate)
+                start_row = mark["rows"] if mark.get("rows") is not None else _count_rows(handle, offset)
+                return ReadPlan(offset, end, mark["columns"], None, start_row)
+        loaded_until = pd.Timestamp(mark["max_timestamp"]) if mark.get("max_timestamp") else None
+        return ReadPlan(0, end, None, loaded_until)
+
+    def advance(
+        self,
+        source: str,
+        end: int,
+        columns: List[str],
+        max_timestamp: Optional[pd.Timestamp],
+        rows: Optional[int] = None,
+        date_format: Optional[str] = None,
+    ) -> None:
+        key = os.path.abspath(source)
+        stat = os.stat(source)
+        previous = self._pending.get(key) or self._marks.get(key) or {}
+        date_format = date_format or previous.get("date_format")
+        if max_timestamp is None or pd.isna(max_timestamp):
+            max_timestamp = previous.get("max_timestamp")
+        elif previous.get("max_timestamp"):
+            max_timestamp = max(max_timestamp, pd.Timestamp(previous["max_timestamp"])).isoformat()
+        else:
+            max_timestamp = max_timestamp.isoformat()
+
+        with open(source, "rb") as handle:
+            self._pending[key] = {
+                "offset": end,
+                "size": stat.st_size,
+                "mtime": stat.st_mtime,
+                "head_digest": _digest(handle, 0, min(end, DIGEST_BYTES)),
+                "tail_digest": _digest(handle, end - DIGEST_BYTES, end),
+                "columns": list(columns),
+                "max_timestamp": max_timestamp,
+                "rows": rows,
+                "date_format": date_format,
+            }
+
+    def date_format(self, source: str) -> Optional[str]:
+        """The Posting Date format recorded for ``source``, so later reads parse its dates alike."""
+        mark = self._marks.get(os.path.abspath(source)) or {}
+        return mark.get("date_format")
+
+    def pending(self, source: str) -> Optional[dict]:
+        """The mark advance() recorded for ``source`` in this run, not yet saved."""
+        return self._pending.get(os.path.abspath(source))
+
+    def save(self) -> None:
+        if not self._pending:
+            return
+        self._marks.update(self._pending)
+        self._pending = {}
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(self._marks, handle, indent=2)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,113 @@
+"""Answer the warehouse's analysis queries from an in-memory NumPy copy of the star schema.
+
+refresh reads FactJobPosting's integer keys and the dimension attributes
+once (or the staging cache's loaded postings with --source cache) and
+saves them as a snapshot; report, query and summary then answer from the
+snapshot in milliseconds without touching MySQL.
+
+    cd ETL
+    python olap.py refresh
+    python olap.py report industry_demand
+    python olap.py query --by industry city --measure count avg_salary_min --top 10
+    python olap.py query --by year month --where industry=Technology --from 2024-01-01 --to 2024-07-01
+    python olap.py summary
+"""
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+import yaml
+
+from etl_job_postings import FACT_DIMENSIONS, JobETL, logger
+from helpers.olap_engine import MEASURES, REPORTS, OlapEngine
+from helpers.staging_cache import StagingCache
+
+def snapshot_path(config):
+    olap_config = config.get('etl', {}).get('olap', {})
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), olap_config.get('snapshot_path', 'state/olap_snapshot.npz'))
+
+def refresh(config, source):
+    """Rebuild the snapshot from the warehouse or from the staging cache"""
+    if source == 'cache':
+        cache_config = config.get('etl', {}).get('staging_cache', {})
+        cache = StagingCache(
+            os.path.join(os.path.dirname(os.path.abspath(__file__)), cache_config.get('path', 'state/staging_cache')),
+            cache_config.get('format', 'parquet')
+        )
+        columns = [column for _, names in FACT_DIMENSIONS.values() for column in names] + ['salary_min', 'salary_max']
+        return OlapEngine.from_frame(cache.read(columns=columns), FACT_DIMENSIONS)
+    etl = JobETL()
+    try:
+        return OlapEngine.from_connection(etl.connection)
+    finally:
+        etl.connection.close()
+
+def parse_where(pairs):
+    where = {}
+    for pair in pairs or []:
+        level, separator, value = pair.partition('=')
+        if not separator:
+            raise SystemExit(f'--where expects level=value, got {pair!r}')
+        # Repeating a level matches any of its values
+        where.setdefault(level, []).append(value)
+    return where
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+    refresh_parser = commands.add_parser('refresh', help='rebuild the snapshot')
+    refresh_parser.add_argument('--source', choices=('db', 'cache'), default='db')
+    report_parser = commands.add_parser('report', help='run one of the canned reports (ANALYSIS/olap_queries.sql)')
+    report_parser.add_argument('name', choices=sorted(REPORTS))
+    query_parser = commands.add_parser('query', help='group-by over any combination of levels')
+    query_parser.add_argument('--by', nargs='*', default=[], help='levels to group by')
+    query_parser.add_argument('--measure', nargs='+', default=['count'], choices=MEASURES)
+    query_parser.add_argument('--where', nargs='*', metavar='LEVEL=VALUE')
+    query_parser.add_argument('--from', dest='date_from', help='first posting date included')
+    query_parser.add_argument('--to', dest='date_to', help='first posting date excluded')
+    query_parser.add_argument('--order-by', nargs='+')
+    query_parser.add_argument('--ascending', action='store_true')
+    query_parser.add_argument('--top', type=int)
+    commands.add_parser('summary', help='the ETL summary figures')
+    commands.add_parser('levels', help='list the levels available to --by and --where')
+    args = parser.parse_args()
+
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'etl_config.yaml'), 'r') as file:
+        config = yaml.safe_load(file)
+    path = snapshot_path(config)
+    if args.command == 'refresh':
+        started = time.perf_counter()
+        # Only refresh reads the warehouse; the other commands answer from the snapshot
+        engine = refresh(config, args.source)
+        engine.save(path)
+        logger.info(f"OLAP snapshot of {len(engine)} facts saved to {path} in {time.perf_counter() - started:.2f}s")
+        sys.exit(0)
+
+    if not os.path.exists(path):
+        raise SystemExit(f'No OLAP snapshot at {path}; run "python olap.py refresh" first')
+    engine = OlapEngine.load(path)
+    started = time.perf_counter()
+    if args.command == 'report':
+        result = engine.query(**REPORTS[args.name])
+    elif args.command == 'query':
+        try:
+            result = engine.query(
+                args.by, args.measure, parse_where(args.where), args.date_from, args.date_to,
+                args.order_by, args.ascending, args.top
+            )
+        except ValueError as e:
+            raise SystemExit(str(e))
+    elif args.command == 'levels':
+        result = pd.DataFrame({
+            'level': list(engine.levels),
+            'members': [len(level.labels) for level in engine.levels.values()],
+        })
+    else:
+        result = pd.Series(engine.summary(), dtype=object)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    with pd.option_context('display.max_rows', None, 'display.width', 200):
+        print(result.to_string() if len(result) else '(no rows)')
+    print(f"\n{len(engine)} facts, snapshot of {engine.loaded_at:%Y-%m-%d %H:%M}, answered in {elapsed_ms:.1f} ms")
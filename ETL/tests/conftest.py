@@ -0,0 +1,31 @@
+# conftest.py
+import os
+import sys
+
+import pytest
+import yaml
+
+ETL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+# The ETL modules import helpers.* and each other with ETL/ as the working
+# directory; the benchmarks directory holds the synthetic data and SQLite stand-in
+sys.path.insert(0, ETL_DIR)
+sys.path.insert(0, os.path.join(ETL_DIR, "benchmarks"))
+
+from etl_job_postings import JobETL  # noqa: E402
+
+@pytest.fixture
+def config():
+    with open(os.path.join(ETL_DIR, "etl_config.yaml"), "r", encoding="utf-8") as handle:
+        return yaml.safe_load(handle)
+
+@pytest.fixture
+def etl(config):
+    """A JobETL with the repository config and no database: enough for the cleaning stages."""
+    etl = JobETL.__new__(JobETL)
+    # As a transform worker process receives it
+    etl.__setstate__({"config": config})
+    etl.executor = None
+    etl.near_duplicate_index = None
+    yield etl
+    if etl.executor is not None:
+        etl.executor.shutdown()
@@ -0,0 +1,108 @@
+# test_aggregates.py
+import pandas as pd
+import pytest
+
+from bench_pipeline import make_etl
+from helpers.aggregates import AGGREGATES, aggregate_deltas, read_fact_rows, retract_aggregates
+from helpers.partitions import MonthlyPartitions, Partition
+from mysql.connector import Error
+from synthetic_data import generate_postings
+
+@pytest.fixture
+def warehouse():
+    """A JobETL on an empty in-memory SQLite copy of the schema, maintaining the aggregates."""
+    etl = make_etl("sqlite", ":memory:")
+    etl.metrics = etl.new_instrumentation()
+    etl.config["etl"]["maintain_aggregates"] = True
+    yield etl
+    etl.connection.close()
+
+def load_batch(etl, rows, seed):
+    df = etl.drop_seen_postings(etl.clean_data(generate_postings(rows, seed=seed)))
+    etl.load_warehouse(df)
+    etl.connection.commit()
+    etl.seen_index.add(df["posting_fingerprint"].to_numpy())
+
+def assert_aggregates_match_the_facts(cursor):
+    expected = aggregate_deltas(read_fact_rows(cursor, "1 = 1"))
+    for aggregate in AGGREGATES:
+        columns = aggregate.keys + list(aggregate.measures)
+        cursor.execute(f"SELECT {', '.join(columns)} FROM {aggregate.table}")
+        stored = pd.DataFrame(cursor.fetchall(), columns=columns).astype(float)
+        recomputed = expected[aggregate.table][columns].astype(float)
+        pd.testing.assert_frame_equal(
+            stored.sort_values(aggregate.keys).reset_index(drop=True),
+            recomputed.sort_values(aggregate.keys).reset_index(drop=True),
+        )
+
+def test_batches_merge_into_the_aggregates(warehouse):
+    load_batch(warehouse, 1_500, seed=11)
+    cursor = warehouse.connection.cursor()
+    assert_aggregates_match_the_facts(cursor)
+    # The second batch lands partly on the groups of the first
+    load_batch(warehouse, 1_500, seed=12)
+    cursor.execute("SELECT SUM(posting_count) FROM AggJobPostingDaily")
+    assert cursor.fetchone()[0] == len(read_fact_rows(cursor, "1 = 1"))
+    assert_aggregates_match_the_facts(cursor)
+
+def test_retracted_fact_rows_leave_the_aggregates(warehouse):
+    load_batch(warehouse, 2_000, seed=11)
+    cursor = warehouse.connection.cursor()
+    removed = read_fact_rows(cursor, "time_id % 3 = 0")
+    assert not removed.empty
+    cursor.execute("DELETE FROM FactJobPosting WHERE time_id % 3 = 0")
+    assert retract_aggregates(cursor, removed) > 0
+    assert_aggregates_match_the_facts(cursor)
+
+class OddTimePartitions(MonthlyPartitions):
+    """SQLite has no partitions: the facts with an odd time_id stand in for one expired partition."""
+
+    def __init__(self, fail=False):
+        super().__init__("FactJobPosting")
+        self.fail = fail
+        self.counted_at_drop = None
+
+    def expired(self, cursor, retention_months, today=None):
+        return [Partition("p_odd", None)]
+
+    def rows(self, cursor, partition, columns):
+        return read_fact_rows(cursor, "time_id % 2 = 1")[columns]
+
+    def delete_rows(self, cursor, partition):
+        cursor.execute("DELETE FROM FactJobPosting WHERE time_id % 2 = 1")
+        return cursor.rowcount
+
+    def drop(self, cursor, partitions):
+        cursor.execute("SELECT SUM(posting_count) FROM AggJobPostingDaily")
+        self.counted_at_drop = cursor.fetchone()[0]
+        if self.fail:
+            raise Error(msg="Lock wait timeout exceeded")
+
+@pytest.fixture
+def retention(warehouse):
+    warehouse.config["etl"]["summary_path"] = None
+    warehouse.config["etl"]["partitioning"].update(retention_months=12, retention_mode="drop")
+    warehouse.summary_cache = warehouse.load_summary_cache()
+    warehouse.summary_cache.put({"total_postings": 0}, warehouse.summary_cache.run_id)
+    load_batch(warehouse, 1_000, seed=13)
+    return warehouse
+
+def test_expired_partitions_are_retracted_before_they_are_dropped(retention):
+    retention.partitions = OddTimePartitions()
+    cursor = retention.connection.cursor()
+    remaining = len(read_fact_rows(cursor, "time_id % 2 = 0"))
+    retention.apply_retention()
+    assert retention.partitions.counted_at_drop == remaining
+    assert_aggregates_match_the_facts(cursor)
+    assert retention.summary_cache.get() is None
+
+def test_a_failed_drop_leaves_the_rows_retracted(retention):
+    retention.partitions = OddTimePartitions(fail=True)
+    with pytest.raises(Error):
+        retention.apply_retention()
+    # The deletes and the retraction were committed before the drop: the run's rollback keeps them
+    retention.connection.rollback()
+    cursor = retention.connection.cursor()
+    assert read_fact_rows(cursor, "time_id % 2 = 1").empty
+    assert_aggregates_match_the_facts(cursor)
+    assert retention.summary_cache.get() is None
@@ -0,0 +1,91 @@
+# test_cleaning_rules.py
+import pandas as pd
+import pytest
+
+from helpers.cleaning_rules import (
+    CleaningRules, NormalizationCache, clean_label, compile_rules, detect_date_format, map_categories, parse_dates
+)
+
+US_FORMATS = ["%m/%d/%Y", "%m/%d/%Y %H:%M:%S", "%d/%m/%Y"]
+
+@pytest.mark.parametrize("use_cache", [False, True])
+def test_map_categories_cleans_each_label_once(use_cache):
+    calls = []
+
+    def cleaner(value):
+        calls.append(value)
+        return clean_label(value, {"Bachelor's Degree": "Bachelor"})
+
+    values = pd.Series([" Bachelor's Degree", "Master", " Bachelor's Degree", None], dtype="category")
+    cache = NormalizationCache(100) if use_cache else None
+    cleaned = map_categories(values, cleaner, cache)
+    assert cleaned.astype(object).tolist() == ["Bachelor", "Master", "Bachelor", ""]
+    # Once per category, plus once for the missing value
+    assert len(calls) == 3
+    map_categories(values, cleaner, cache)
+    assert len(calls) == (3 if use_cache else 6)
+
+def test_normalization_cache_evicts_the_least_recently_used():
+    cache = NormalizationCache(2)
+    cache.lookup(str.upper, "a")
+    cache.lookup(str.upper, "b")
+    cache.lookup(str.upper, "a")
+    cache.lookup(str.upper, "c")
+    assert cache.stats() == {"hits": 1, "misses": 3, "size": 2}
+    # "b" was evicted, "a" was kept
+    assert cache.lookup(str.upper, "a") == "A"
+    cache.lookup(str.upper, "b")
+    assert cache.stats()["misses"] == 4
+
+def test_date_format_is_detected_from_the_column():
+    assert detect_date_format(pd.Series(["03/25/2024", "12/01/2024"]), US_FORMATS) == "%m/%d/%Y"
+    # No month 25: only the day-first format parses every value
+    assert detect_date_format(pd.Series(["25/03/2024", "01/12/2024"]), ["%m/%d/%Y", "%d/%m/%Y"]) == "%d/%m/%Y"
+    assert detect_date_format(pd.Series(["next week"]), US_FORMATS) is None
+
+def test_values_the_detected_format_rejects_are_retried_with_the_others():
+    parsed = parse_dates(pd.Series(["03/25/2024", "03/26/2024", "03/27/2024 10:30:00"]), US_FORMATS)
+    assert parsed.tolist() == [
+        pd.Timestamp("2024-03-25"), pd.Timestamp("2024-03-26"), pd.Timestamp("2024-03-27 10:30:00")
+    ]
+
+def test_values_no_format_parses_fall_back_to_inference():
+    values = pd.Series(["03/25/2024", "2024-03-26", "March 27, 2024", "not a date", None])
+    assert parse_dates(values, US_FORMATS).tolist() == [
+        pd.Timestamp("2024-03-25"), pd.Timestamp("2024-03-26"), pd.Timestamp("2024-03-27"), pd.NaT, pd.NaT
+    ]
+
+def test_columns_in_no_configured_format_are_inferred():
+    values = pd.Series(["2024-03-25", "26 Mar 2024"])
+    assert parse_dates(values, US_FORMATS).tolist() == [pd.Timestamp("2024-03-25"), pd.Timestamp("2024-03-26")]
+
+def test_compiled_rules_match_the_config(config):
+    rules = compile_rules(config)
+    assert rules is compile_rules(config)
+    assert rules.standardize_company("ABC Trading Co., Ltd (Cambodia)") == "Abc Trading"
+    # The first listed keyword found wins, as the sequential checks did
+    assert rules.standardize_job_title("Senior UI/UX Developer") == ("Senior UI/UX Developer", "UI/UX Designer")
+    assert rules.normalize_experience("Senior Level (5+ years)") == "Senior Level"
+    assert rules.normalize_experience("No experience required") == "Entry Level"
+    assert rules.normalize_education("Bachelor's Degree") == "Bachelor"
+    assert rules.normalize_education("") == "Not Specified"
+
+def test_rules_default_to_the_builtin_tables():
+    rules = CleaningRules()
+    assert rules.standardize_company("Wing Bank Plc.") == "Wing Bank"
+    assert rules.normalize_experience("junior officer") == "Junior Level (1–2 years)"
+
+def test_a_given_date_format_does_not_depend_on_the_other_values():
+    # Detected from the values, 1/5/2026 is in January next to 2/3/2026 but in May next to 25/3/2026
+    assert parse_dates(pd.Series(["1/5/2026", "2/3/2026"]), US_FORMATS)[0] == pd.Timestamp("2026-01-05")
+    assert parse_dates(pd.Series(["1/5/2026", "25/3/2026"]), US_FORMATS)[0] == pd.Timestamp("2026-05-01")
+    parsed = parse_dates(pd.Series(["1/5/2026", "25/3/2026"]), US_FORMATS, "%m/%d/%Y")
+    assert parsed.tolist() == [pd.Timestamp("2026-01-05"), pd.Timestamp("2026-03-25")]
+
+def test_rules_detect_a_format_for_the_whole_source(config):
+    rules = CleaningRules(config["cleaning_rules"])
+    assert rules.detect_date_format(pd.Series(["25/3/2026"])) == "%d/%m/%Y"
+    # Nothing parses: the configured order decides
+    assert rules.detect_date_format(pd.Series(["next week"])) == "%m/%d/%Y"
+    pinned = CleaningRules(dict(config["cleaning_rules"], date_format="%d/%m/%Y"))
+    assert pinned.detect_date_format(pd.Series(["1/5/2026"])) == "%d/%m/%Y"
@@ -0,0 +1,116 @@
+# test_data_quality.py
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bench_pipeline import make_etl
+from etl_job_postings import QUALITY_COLUMNS
+from helpers.data_quality import REASON_COLUMN, QualityGate, blank_mask, write_quarantine
+from synthetic_data import generate_postings
+
+GATE_CONFIG = {
+    "required_fields": ["job_title", "company_name", "industry", "location"],
+    "date_validation": True,
+    "salary_validation": True,
+    "min_salary": 100,
+    "max_salary": 50000,
+}
+
+def chunk(**overrides):
+    row = {
+        "Job Title": "Accountant",
+        "Company Name": "ABA Bank",
+        "Industry": "Banking",
+        "Location": "Phnom Penh",
+        "Posting Date": date(2024, 3, 1),
+        "salary_min": 800.0,
+        "salary_max": 1200.0,
+    }
+    row.update(overrides)
+    return pd.DataFrame([row])
+
+@pytest.fixture
+def gate():
+    return QualityGate(GATE_CONFIG, QUALITY_COLUMNS)
+
+def test_valid_rows_pass(gate):
+    passed, rejected = gate.check(chunk())
+    assert len(passed) == 1 and rejected.empty
+    assert REASON_COLUMN in rejected
+
+@pytest.mark.parametrize("overrides, reasons", [
+    ({"Company Name": "  "}, "missing_company_name"),
+    ({"Industry": None}, "missing_industry"),
+    ({"Posting Date": None}, "missing_posting_date"),
+    ({"Posting Date": date.today() + timedelta(days=2)}, "future_posting_date"),
+    ({"salary_min": 50.0}, "salary_below_min"),
+    ({"salary_max": 90000.0}, "salary_above_max"),
+    ({"salary_min": 1500.0}, "salary_min_above_max"),
+    ({"Location": "", "salary_max": 90000.0}, "missing_location;salary_above_max"),
+])
+def test_rejected_rows_carry_every_failed_rule(gate, overrides, reasons):
+    passed, rejected = gate.check(chunk(**overrides))
+    assert passed.empty
+    assert rejected[REASON_COLUMN].tolist() == [reasons]
+
+def test_undisclosed_salaries_pass(gate):
+    passed, _ = gate.check(chunk(salary_min=np.nan, salary_max=np.nan))
+    assert len(passed) == 1
+
+def test_counts_accumulate_per_rule(gate):
+    df = pd.concat([chunk(), chunk(Industry=""), chunk(Industry="", salary_min=1500.0)], ignore_index=True)
+    passed, rejected = gate.check(df)
+    assert passed.index.tolist() == [0]
+    assert rejected.index.tolist() == [1, 2]
+    gate.check(chunk(salary_min=1500.0))
+    assert gate.rejected == 3
+    assert gate.counts["missing_industry"] == 2
+    assert gate.counts["salary_min_above_max"] == 2
+    assert gate.report() == "missing_industry=2, salary_min_above_max=2"
+
+def test_disabled_rules_are_not_checked():
+    gate = QualityGate({"required_fields": ["job_title"]}, QUALITY_COLUMNS)
+    passed, rejected = gate.check(chunk(salary_min=1500.0, **{"Posting Date": None, "Industry": ""}))
+    assert len(passed) == 1 and rejected.empty
+
+def test_blank_mask_checks_categoricals_per_category():
+    values = pd.Series(["Banking", " ", None, "Banking"], dtype="category")
+    assert blank_mask(values).tolist() == [False, True, True, False]
+    assert blank_mask(values.astype(object)).tolist() == [False, True, True, False]
+
+def test_quarantine_file_gets_one_header(tmp_path):
+    path = str(tmp_path / "quarantine" / "run.csv")
+    rows = pd.DataFrame({"source_row": [3], "reasons": ["missing_industry"]})
+    write_quarantine(path, rows)
+    write_quarantine(path, rows.assign(source_row=7))
+    assert pd.read_csv(path)["source_row"].tolist() == [3, 7]
+
+def test_near_duplicates_are_merged_among_rows_passing_the_gate(etl, config):
+    df = pd.DataFrame([
+        ("Senior Accountant", "ABA Bank", "Phnom Penh", "2024-03-01", 800.0, 1200.0),
+        ("Senior Accountant", "ABA Bank", "Phnom Penh", "2024-03-02", 800.0, 1200.0),
+    ], columns=["Job Title", "Company Name", "Location", "Posting Date", "salary_min", "salary_max"])
+    # The earlier posting lacks its industry, so the gate rejects it
+    df["Industry"] = ["", "Banking"]
+    passed, rejected = QualityGate(config["data_quality"], QUALITY_COLUMNS).check(df)
+    assert rejected.index.tolist() == [0]
+    assert etl.merge_near_duplicates(passed).index.tolist() == [1]
+    # Merged before the gate, the rejected row would have stood in for the valid re-post
+    assert etl.merge_near_duplicates(df).index.tolist() == [0]
+
+def test_rows_with_unresolved_keys_are_quarantined_with_their_source(tmp_path):
+    etl = make_etl("sqlite", ":memory:")
+    etl.metrics = etl.new_instrumentation()
+    etl.config["data_quality"]["quarantine_path"] = str(tmp_path)
+    etl.quality_gate = etl.new_quality_gate()
+    cleaned = etl.clean_data(generate_postings(3, seed=8))
+    cleaned.loc[1, "Company Name"] = None
+    try:
+        loaded = etl.load_warehouse(cleaned, str(tmp_path / "jobs.csv"))
+    finally:
+        etl.connection.close()
+    assert len(loaded) == 2
+    quarantined = pd.read_csv(tmp_path / f"{etl.metrics.run_id}.csv")
+    assert quarantined[["source_file", "source_row"]].values.tolist() == [["jobs.csv", 1]]
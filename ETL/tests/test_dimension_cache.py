@@ -0,0 +1,116 @@
+# test_dimension_cache.py
+import pandas as pd
+import pytest
+
+from bench_pipeline import make_etl
+from etl_job_postings import FACT_DIMENSIONS
+from helpers.dimension_cache import MISSING_KEY, DimensionKeyCache, plan_remap
+from synthetic_data import generate_postings
+
+@pytest.fixture
+def warehouse():
+    """A JobETL on an empty in-memory SQLite copy of the schema (benchmarks/sqlite_backend.py)."""
+    etl = make_etl("sqlite", ":memory:")
+    etl.metrics = etl.new_instrumentation()
+    yield etl
+    etl.connection.close()
+
+@pytest.fixture
+def cursor(warehouse):
+    cursor = warehouse.connection.cursor()
+    yield cursor
+    cursor.close()
+
+def test_new_members_are_inserted_once_and_then_served_from_the_cache(cursor):
+    cache = DimensionKeyCache()
+    frame = pd.DataFrame({"industry_name": ["Banking", "Retail", "Banking", None]})
+    ids, inserted = cache.resolve(cursor, "industry", frame)
+    assert inserted == 2
+    assert ids[0] == ids[2] != ids[1] and ids[3] == MISSING_KEY
+
+    again, inserted = cache.resolve(cursor, "industry", frame.iloc[::-1])
+    assert inserted == 0
+    assert again.tolist() == ids[::-1].tolist()
+
+def test_preload_reads_existing_members(cursor):
+    DimensionKeyCache().resolve(cursor, "company", pd.DataFrame({"company_name": ["ABA Bank"]}))
+    cache = DimensionKeyCache()
+    cache.preload(cursor)
+    ids, inserted = cache.resolve(cursor, "company", pd.DataFrame({"company_name": ["ABA Bank"]}))
+    assert inserted == 0 and ids[0] != MISSING_KEY
+
+def test_spellings_that_collate_equal_resolve_to_one_member(cursor):
+    cache = DimensionKeyCache()
+    frame = pd.DataFrame({"company_name": ["Café Amazon", "Cafe Amazon", "CAFÉ AMAZON", None]})
+    ids, inserted = cache.resolve(cursor, "company", frame)
+    assert inserted == 1
+    assert len(set(ids[:3])) == 1 and ids[3] == MISSING_KEY
+
+def test_postings_folding_to_one_fact_key_are_loaded_once(warehouse, cursor):
+    warehouse.config["etl"]["maintain_aggregates"] = True
+    raw = pd.concat([generate_postings(1, seed=4)] * 3, ignore_index=True)
+    raw["Company Name"] = ["Café Co", "CAFE CO", "cafe co"]
+    first = warehouse.drop_seen_postings(warehouse.clean_data(raw.iloc[:1]))
+    warehouse.load_warehouse(first)
+    warehouse.connection.commit()
+    warehouse.seen_index.add(first["posting_fingerprint"].to_numpy())
+
+    # The seen index tells the spellings apart; the unique fact key does not
+    later = warehouse.drop_seen_postings(warehouse.clean_data(raw.iloc[1:]))
+    assert len(later) == 2
+    warehouse.load_warehouse(later)
+    warehouse.connection.commit()
+    cursor.execute("SELECT COUNT(*) FROM FactJobPosting")
+    assert cursor.fetchone()[0] == 1
+    cursor.execute("SELECT SUM(posting_count) FROM AggJobPostingDaily")
+    assert cursor.fetchone()[0] == 1
+
+def test_plan_remap_merges_members_into_the_lowest_id():
+    rows = [
+        (1, "Accountant", "Full-time", "Senior Level (5+ years)", "Bachelor's Degree"),
+        (2, "Accountant", "Full-time", "Senior Level", "Bachelor"),
+        (3, "Driver", "Full-time", "No experience", "High School"),
+        (4, "Accountant", "Full-time", "senior level", "bachelor"),
+    ]
+    mapping = {"Senior Level (5+ years)": "Senior Level", "Bachelor's Degree": "Bachelor", "No experience": "Entry Level"}
+
+    def remap(values):
+        return values[:2] + tuple(mapping.get(value, value) for value in values[2:])
+
+    updates, merged = plan_remap(rows, remap)
+    assert updates == {
+        1: ("Accountant", "Full-time", "Senior Level", "Bachelor"),
+        3: ("Driver", "Full-time", "Entry Level", "High School"),
+    }
+    assert merged == {2: 1, 4: 1}
+    # Remapping again changes nothing
+    assert plan_remap([(1,) + updates[1], (3,) + updates[3]], remap) == ({}, {})
+
+def test_remap_job_levels_matches_a_load_with_the_mappings(warehouse, cursor):
+    raw = generate_postings(1_500, seed=3)
+    mappings = {key: warehouse.config["cleaning_rules"][key] for key in ("experience_mapping", "education_mapping")}
+    # A warehouse loaded before the mappings applied
+    warehouse.config["cleaning_rules"].update(experience_mapping={}, education_mapping={})
+    warehouse.cleaners = warehouse.label_cleaners()
+    df = warehouse.drop_seen_postings(warehouse.merge_near_duplicates(warehouse.clean_data(raw)))
+    warehouse.load_warehouse(df)
+    warehouse.connection.commit()
+    cursor.execute("SELECT COUNT(*) FROM FactJobPosting")
+    facts = cursor.fetchone()[0]
+
+    warehouse.config["cleaning_rules"].update(mappings)
+    warehouse.cleaners = warehouse.label_cleaners()
+    assert warehouse.remap_job_levels() > 0
+    raw_levels = set(mappings["experience_mapping"]) - set(mappings["experience_mapping"].values())
+    cursor.execute("SELECT DISTINCT experience_level FROM DimJob")
+    assert not {row[0] for row in cursor.fetchall()} & raw_levels
+    cursor.execute("SELECT COUNT(*), (SELECT SUM(posting_count) FROM AggJobPostingDaily) FROM FactJobPosting")
+    assert cursor.fetchone() == (facts, facts)
+    assert warehouse.remap_job_levels() == 0
+
+    # The same postings cleaned with the mappings resolve to the remapped members
+    warehouse.preload_dimensions()
+    columns = FACT_DIMENSIONS["job"][1]
+    df = warehouse.merge_near_duplicates(warehouse.clean_data(raw))
+    _, inserted = warehouse.dimension_cache.resolve(cursor, "job", df[columns])
+    assert inserted == 0
@@ -0,0 +1,107 @@
+# test_near_duplicates.py
+import pandas as pd
+import pytest
+
+from etl_job_postings import DEDUP_COLUMNS
+from helpers.dedup import NearDuplicateIndex, find_near_duplicates, shingle_similarity, title_shingles
+
+FIELDS = dict(DEDUP_COLUMNS)
+SALARY = ("salary_min", "salary_max")
+
+def postings(*rows):
+    return pd.DataFrame(
+        rows, columns=["Job Title", "Company Name", "Location", "Posting Date", "salary_min", "salary_max"]
+    )
+
+def test_title_similarity():
+    assert shingle_similarity(title_shingles("Senior Accountant"), title_shingles("Senior  Accountant!")) == 1.0
+    assert shingle_similarity(title_shingles("Senior Accountant"), title_shingles("Driver")) < 0.2
+
+def test_repost_with_similar_title_is_merged_keeping_the_earliest():
+    df = postings(
+        ("Senior Accountants", "ABA Bank", "Phnom Penh", "2024-03-04", 800.0, 1200.0),
+        ("Senior Accountant", "ABA Bank", "Phnom Penh", "2024-03-01", 800.0, 1200.0),
+    )
+    assert find_near_duplicates(df, FIELDS, 0.8, 7).tolist() == [True, False]
+
+@pytest.mark.parametrize("other", [
+    # Another company, location or salary range is another job
+    ("Senior Accountant", "Wing Bank", "Phnom Penh", "2024-03-02", 800.0, 1200.0),
+    ("Senior Accountant", "ABA Bank", "Siem Reap", "2024-03-02", 800.0, 1200.0),
+    ("Senior Accountant", "ABA Bank", "Phnom Penh", "2024-03-02", 1500.0, 2000.0),
+    # Outside the time window
+    ("Senior Accountant", "ABA Bank", "Phnom Penh", "2024-04-02", 800.0, 1200.0),
+    # A different title
+    ("Sales Manager", "ABA Bank", "Phnom Penh", "2024-03-02", 800.0, 1200.0),
+])
+def test_distinct_postings_are_kept(other):
+    df = postings(("Senior Accountant", "ABA Bank", "Phnom Penh", "2024-03-01", 800.0, 1200.0), other)
+    assert not find_near_duplicates(df, FIELDS, 0.8, 7, SALARY).any()
+
+def test_salary_only_blocks_when_matched():
+    df = postings(
+        ("Senior Accountant", "ABA Bank", "Phnom Penh", "2024-03-01", 800.0, 1200.0),
+        ("Senior Accountant", "ABA Bank", "Phnom Penh", "2024-03-02", 1500.0, 2000.0),
+    )
+    assert find_near_duplicates(df, FIELDS, 0.8, 7).tolist() == [False, True]
+    assert find_near_duplicates(df, FIELDS, 0.8, 7, SALARY).tolist() == [False, False]
+
+def test_generic_companies_are_never_merged():
+    df = postings(
+        ("Sales Executive", "Private Company", "Phnom Penh", "2024-03-01", None, None),
+        ("Sales Executive", "private company ", "Phnom Penh", "2024-03-02", None, None),
+        ("Sales Executive", "Smart Axiata", "Phnom Penh", "2024-03-01", None, None),
+        ("Sales Executive", "Smart Axiata", "Phnom Penh", "2024-03-02", None, None),
+    )
+    duplicate = find_near_duplicates(df, FIELDS, 0.9, 7, SALARY, ["Private Company"])
+    assert duplicate.tolist() == [False, False, False, True]
+
+@pytest.fixture
+def index(tmp_path):
+    return NearDuplicateIndex(str(tmp_path / "near_duplicates.json"), FIELDS, 7, SALARY)
+
+def test_reposts_of_postings_loaded_earlier_are_found_through_the_index(index):
+    index.add(postings(("Senior Accountant", "ABA Bank", "Phnom Penh", "2024-03-04", 800.0, 1200.0)))
+    later = postings(
+        # A re-post, and one dated before the loaded posting
+        ("Senior Accountants", "ABA Bank", "Phnom Penh", "2024-03-08", 800.0, 1200.0),
+        ("Senior  Accountant", "ABA Bank", "Phnom Penh", "2024-03-01", 800.0, 1200.0),
+        # Outside the window, at another salary, or another job
+        ("Senior Accountant", "ABA Bank", "Phnom Penh", "2024-03-12", 800.0, 1200.0),
+        ("Senior Accountant", "ABA Bank", "Phnom Penh", "2024-03-05", 1500.0, 2000.0),
+        ("Driver", "ABA Bank", "Phnom Penh", "2024-03-05", 800.0, 1200.0),
+    )
+    assert find_near_duplicates(later, FIELDS, 0.8, 7, SALARY, index=index).tolist() == [
+        True, True, False, False, False
+    ]
+    # A single row is checked against the index too; without it there is nothing to compare with
+    assert find_near_duplicates(later.iloc[:1], FIELDS, 0.8, 7, SALARY, index=index).tolist() == [True]
+    assert find_near_duplicates(later.iloc[:1], FIELDS, 0.8, 7, SALARY).tolist() == [False]
+
+def test_index_is_persisted_and_pruned_by_the_window(index):
+    index.add(postings(
+        ("Senior Accountant", "ABA Bank", "Phnom Penh", "2024-03-01", 800.0, 1200.0),
+        ("Driver", "Grab", "Siem Reap", "2024-03-02", None, None),
+    ))
+    index.add(postings(("Cashier", "Chip Mong", "Phnom Penh", "2024-03-09", None, None)))
+    # 2024-03-01 is more than 7 days before the newest posting
+    assert len(index) == 2
+    index.save()
+
+    reopened = NearDuplicateIndex(index.path, FIELDS, 7, SALARY)
+    assert len(reopened) == 2
+    repost = postings(("Drivers", "grab ", "Siem Reap", "2024-03-03", None, None))
+    assert find_near_duplicates(repost, FIELDS, 0.8, 7, SALARY, index=reopened).tolist() == [True]
+    # Entries keyed without the salary do not apply when salaries must match, and vice versa
+    assert len(NearDuplicateIndex(index.path, FIELDS, 7)) == 0
+
+def test_pipeline_merges_reposts_across_chunks(etl, tmp_path):
+    etl.config["deduplication"]["near_duplicate_index_path"] = str(tmp_path / "near_duplicates.json")
+    etl.near_duplicate_index = etl.load_near_duplicate_index()
+    first = postings(("Senior Accountant", "ABA Bank", "Phnom Penh", "2024-03-01", 800.0, 1200.0))
+    etl.near_duplicate_index.add(etl.merge_near_duplicates(first))
+    second = postings(
+        ("Senior Accountants", "ABA Bank", "Phnom Penh", "2024-03-04", 800.0, 1200.0),
+        ("Sales Manager", "ABA Bank", "Phnom Penh", "2024-03-04", 800.0, 1200.0),
+    )
+    assert etl.merge_near_duplicates(second)["Job Title"].tolist() == ["Sales Manager"]
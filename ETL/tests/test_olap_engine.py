@@ -0,0 +1,96 @@
+# test_olap_engine.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from bench_pipeline import make_etl
+from etl_job_postings import FACT_DIMENSIONS
+from helpers.olap_engine import REPORTS, OlapEngine, mysql_week
+from synthetic_data import generate_postings
+
+@pytest.fixture(scope="module")
+def raw():
+    return generate_postings(2_000, seed=11)
+
+@pytest.fixture
+def loaded(raw):
+    """A JobETL on an in-memory SQLite copy of the schema holding ``raw``, and the rows it loaded."""
+    etl = make_etl("sqlite", ":memory:")
+    etl.metrics = etl.new_instrumentation()
+    cleaned = etl.drop_seen_postings(etl.clean_data(raw))
+    etl.load_warehouse(cleaned)
+    etl.connection.commit()
+    yield etl, cleaned
+    etl.connection.close()
+
+def fetch(etl, query):
+    cursor = etl.connection.cursor()
+    cursor.execute(query)
+    rows = cursor.fetchall()
+    cursor.close()
+    return rows
+
+def test_reports_match_the_warehouse_sql(loaded):
+    etl, _ = loaded
+    engine = OlapEngine.from_connection(etl.connection)
+    assert len(engine) == fetch(etl, "SELECT COUNT(*) FROM FactJobPosting")[0][0]
+
+    expected = dict(fetch(etl, """
+        SELECT i.industry_name, COUNT(*) FROM FactJobPosting f
+        JOIN DimIndustry i ON f.industry_id = i.industry_id GROUP BY i.industry_name
+    """))
+    result = engine.query(**REPORTS["industry_demand"])
+    assert dict(zip(result["industry"], result["count"])) == expected
+    assert result["count"].is_monotonic_decreasing
+
+    expected = {
+        city: (count, salary_min)
+        for city, count, salary_min in fetch(etl, """
+            SELECT l.city, COUNT(*),
+                   AVG(CASE WHEN f.salary_min IS NOT NULL AND f.salary_max IS NOT NULL THEN f.salary_min END)
+            FROM FactJobPosting f JOIN DimLocation l ON f.location_id = l.location_id GROUP BY l.city
+        """)
+    }
+    result = engine.query(["city"], ["count", "avg_salary_min"])
+    for city, count, salary_min in result.itertuples(index=False):
+        assert expected[city][0] == count
+        assert salary_min == pytest.approx(expected[city][1])
+
+def test_frame_and_warehouse_engines_agree(loaded):
+    etl, cleaned = loaded
+    from_db = OlapEngine.from_connection(etl.connection)
+    from_frame = OlapEngine.from_frame(cleaned, FACT_DIMENSIONS)
+    for by in (["industry"], ["year", "month"], ["agency", "experience_level"]):
+        db = from_db.query(by, ["count", "salary_count"], order_by=by, ascending=True)
+        frame = from_frame.query(by, ["count", "salary_count"], order_by=by, ascending=True)
+        pd.testing.assert_frame_equal(db, frame, check_dtype=False)
+
+def test_filters_and_date_range(raw, etl):
+    cleaned = etl.clean_data(raw)
+    engine = OlapEngine.from_frame(cleaned, FACT_DIMENSIONS)
+    dates = pd.to_datetime(cleaned["Posting Date"])
+    industry = cleaned["Industry"].astype(str).value_counts().index[0]
+
+    result = engine.query(where={"industry": industry}, date_from="2025-06-01", date_to="2025-09-01")
+    expected = (
+        (cleaned["Industry"].astype(str) == industry) & (dates >= "2025-06-01") & (dates < "2025-09-01")
+    ).sum()
+    assert result["count"].tolist() == [expected]
+    # Repeating a level matches any of its values
+    cities = cleaned["Location"].astype(str).unique()[:2].tolist()
+    result = engine.query(where={"city": cities})
+    assert result["count"].tolist() == [cleaned["Location"].astype(str).isin(cities).sum()]
+
+def test_snapshot_round_trip(tmp_path, raw, etl):
+    engine = OlapEngine.from_frame(etl.clean_data(raw), FACT_DIMENSIONS)
+    path = str(tmp_path / "snapshot.npz")
+    engine.save(path)
+    restored = OlapEngine.load(path)
+    assert len(restored) == len(engine)
+    assert restored.summary() == engine.summary()
+    pd.testing.assert_frame_equal(restored.query(**REPORTS["salary_trend"]), engine.query(**REPORTS["salary_trend"]))
+
+def test_mysql_week_numbering():
+    dates = np.array(["2024-01-01", "2024-12-30", "2021-01-03", "2021-01-04", "2020-12-31"], dtype="datetime64[D]")
+    # SELECT WEEK(d, 1) in MySQL
+    assert mysql_week(dates).tolist() == [1, 53, 0, 1, 53]
@@ -0,0 +1,68 @@
+# test_parallel.py
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import pytest
+
+from helpers.cleaning_rules import transform_dataframe
+from helpers.parallel import (
+    MIN_PARTITION_SIZE, partition_frame, resolve_partition_size, transform_dataframe_parallel
+)
+from synthetic_data import generate_postings
+
+ROWS = 3_000
+
+@pytest.fixture(scope="module")
+def raw():
+    return generate_postings(ROWS, seed=7)
+
+def test_partition_size_defaults_to_an_even_split():
+    assert resolve_partition_size(None, 10_000, 4) == 2_500
+    assert resolve_partition_size(None, 10_001, 4) == 2_501
+    # Small chunks are not scattered into tiny partitions
+    assert resolve_partition_size(None, 1_500, 4) == MIN_PARTITION_SIZE
+    assert resolve_partition_size(700, 10_000, 4) == 700
+
+def test_partitions_cover_the_frame_in_order():
+    df = pd.DataFrame({"value": range(10)})
+    parts = partition_frame(df, 4)
+    assert [len(part) for part in parts] == [4, 4, 2]
+    assert pd.concat(parts).index.tolist() == list(range(10))
+
+def test_parallel_clean_data_matches_serial(etl, raw):
+    serial = etl.clean_data(raw)
+    etl.config["etl"]["parallel"].update(enabled=True, workers=2, partition_size=None)
+    parallel = etl.clean_data(raw)
+    assert etl.executor is not None
+    pd.testing.assert_frame_equal(
+        parallel.astype({column: object for column in parallel.select_dtypes("category")}),
+        serial.astype({column: object for column in serial.select_dtypes("category")}),
+    )
+
+def test_parallel_transform_matches_serial(config, raw):
+    serial = transform_dataframe(raw, config)
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        parallel = transform_dataframe_parallel(raw, config, workers=2, partition_size=1_000, executor=executor)
+    # Near-duplicates are merged across partitions too
+    assert parallel.attrs.get("near_duplicates_merged") == serial.attrs.get("near_duplicates_merged")
+    pd.testing.assert_frame_equal(parallel.reset_index(drop=True), serial.reset_index(drop=True), check_categorical=False)
+
+@pytest.fixture
+def ambiguous(raw):
+    """Postings whose first partition alone reads month-first and whose last alone reads day-first."""
+    df = raw.iloc[:2_000].copy()
+    df["Posting Date"] = ["1/5/2026"] * 1_000 + ["25/3/2026", "1/5/2026"] * 500
+    return df
+
+def test_parallel_clean_data_parses_ambiguous_dates_as_serial(etl, ambiguous):
+    serial = etl.clean_data(ambiguous)
+    etl.config["etl"]["parallel"].update(enabled=True, workers=2, partition_size=1_000)
+    parallel = etl.clean_data(ambiguous)
+    assert parallel["Posting Date"].tolist() == serial["Posting Date"].tolist()
+    assert parallel["Posting Date"].nunique() == 2
+
+def test_parallel_transform_parses_ambiguous_dates_as_serial(config, ambiguous):
+    serial = transform_dataframe(ambiguous, config)
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        parallel = transform_dataframe_parallel(ambiguous, config, workers=2, partition_size=1_000, executor=executor)
+    pd.testing.assert_frame_equal(parallel.reset_index(drop=True), serial.reset_index(drop=True), check_categorical=False)
@@ -0,0 +1,34 @@
+# test_salary_parsing.py
+import pandas as pd
+import pytest
+
+@pytest.mark.parametrize("text, expected", [
+    ("USD 800 – 1,200", (800.0, 1200.0)),
+    ("USD 1,200 - 1,500", (1200.0, 1500.0)),
+    ("USD 300 - 500", (300.0, 500.0)),
+    ("300-500 USD", (300.0, 500.0)),
+    # Four-digit amounts without a thousands comma
+    ("USD 900 - 1200", (900.0, 1200.0)),
+    ("USD 1200 - 1500", (1200.0, 1500.0)),
+    ("1500-2500 USD", (1500.0, 2500.0)),
+    ("Negotiable", (None, None)),
+    ("Not disclosed", (None, None)),
+])
+def test_extract_salary(etl, text, expected):
+    assert etl.extract_salary(text) == expected
+
+def test_extract_salary_columns_matches_extract_salary(etl):
+    salary = pd.Series(
+        ["USD 900 - 1200", "USD 1,200 - 1,500", "1500-2500 USD", "USD 9999 - 10,000", "Negotiable", None]
+    )
+    expected = pd.DataFrame(
+        [etl.extract_salary(text) for text in salary], columns=["salary_min", "salary_max"], dtype=float
+    )
+    pd.testing.assert_frame_equal(etl.extract_salary_columns(salary), expected)
+
+@pytest.mark.parametrize("low, high", [(1000, 1999), (2500, 4000), (9000, 9999)])
+def test_four_digit_range_round_trips(etl, low, high):
+    text = f"USD {low} - {high}"
+    assert etl.extract_salary(text) == (float(low), float(high))
+    columns = etl.extract_salary_columns(pd.Series([text]))
+    assert columns.iloc[0].tolist() == [float(low), float(high)]
@@ -0,0 +1,50 @@
+# test_seen_index.py
+import os
+
+import numpy as np
+import pandas as pd
+
+from helpers.cleaning_rules import dedup_keys, fingerprint_keys, hash_keys, hash_record
+from helpers.dedup import SeenHashIndex
+
+def test_seen_index_buffers_until_save(tmp_path):
+    path = os.path.join(tmp_path, "seen.npy")
+    index = SeenHashIndex(path)
+    index.add(np.array([30, 10], dtype=np.uint64))
+    assert index.contains(np.array([10, 20, 30], dtype=np.uint64)).tolist() == [True, False, True]
+    # Nothing is persisted before save(), so a failed run marks nothing as seen
+    assert len(SeenHashIndex(path)) == 0
+
+    index.save()
+    reopened = SeenHashIndex(path)
+    assert len(reopened) == 2
+    reopened.add(np.array([20], dtype=np.uint64))
+    assert reopened.contains(np.array([10, 20, 30, 40], dtype=np.uint64)).tolist() == [True, True, True, False]
+    reopened.save()
+    assert np.load(path).tolist() == [10, 20, 30]
+
+def test_seen_index_on_empty_and_max_values(tmp_path):
+    index = SeenHashIndex(os.path.join(tmp_path, "seen.npy"))
+    assert index.contains(np.array([0], dtype=np.uint64)).tolist() == [False]
+    largest = np.iinfo(np.uint64).max
+    index.add(np.array([largest], dtype=np.uint64))
+    index.save()
+    # searchsorted past the end must not read out of bounds
+    assert SeenHashIndex(index.path).contains(np.array([largest, 5], dtype=np.uint64)).tolist() == [True, False]
+
+def test_vectorized_keys_match_hash_record():
+    columns = pd.DataFrame({
+        "job_title": ["Senior  Accountant", "Driver", None],
+        "company_name": ["ABA Bank ", "Grab", "Grab"],
+        "posting_date": pd.to_datetime(["2024-03-01", "2024-03-02", None]),
+    })
+    keys = dedup_keys(columns)
+    expected = [
+        hash_record(("Senior  Accountant", "ABA Bank ", "2024-03-01")),
+        hash_record(("Driver", "Grab", "2024-03-02")),
+        hash_record(("", "Grab", "")),
+    ]
+    assert hash_keys(keys).tolist() == expected
+    fingerprints = fingerprint_keys(keys)
+    assert fingerprints.dtype == np.uint64
+    assert fingerprints.tolist() == fingerprint_keys(keys.iloc[::-1]).tolist()[::-1]
@@ -0,0 +1,53 @@
+# test_staging_cache.py
+import pandas as pd
+import pytest
+
+from bench_pipeline import make_etl
+from helpers.staging_cache import StagingCache
+from synthetic_data import generate_postings
+
+@pytest.fixture
+def pipeline(tmp_path):
+    """A JobETL loading into a SQLite file, with its staging cache, quarantine and metrics under tmp_path."""
+    etl = make_etl("sqlite", str(tmp_path / "warehouse.db"))
+    etl.config["etl"]["instrumentation"]["metrics_path"] = None
+    etl.config["etl"]["summary_path"] = None
+    etl.config["data_quality"]["quarantine_path"] = str(tmp_path / "quarantine")
+    etl.summary_cache = etl.load_summary_cache()
+    etl.staging_cache = StagingCache(str(tmp_path / "cache"))
+    yield etl
+    etl.shutdown_executors()
+
+def count_facts(etl):
+    connection = etl.pool.get_connection()
+    cursor = connection.cursor()
+    cursor.execute("SELECT COUNT(*) FROM FactJobPosting")
+    count = cursor.fetchone()[0]
+    connection.close()
+    return count
+
+def test_reads_of_the_cache_hold_only_the_loaded_rows(pipeline, tmp_path):
+    postings = generate_postings(300, seed=5)
+    # Quarantined by the quality gate, and repeats dropped by the seen index
+    postings.loc[:9, "Job Title"] = ""
+    postings = pd.concat([postings, postings.iloc[10:40]], ignore_index=True)
+    source = str(tmp_path / "jobs.csv")
+    postings.to_csv(source, index=False)
+
+    pipeline.run_etl_pipeline(sources=[source], summary=False)
+    entry, = pipeline.staging_cache.entries()
+    cached = sum(chunk["rows"] for chunk in entry.chunks.values())
+    loaded = pipeline.staging_cache.read(columns=["Job Title", "Company Name"])
+    assert len(loaded) == count_facts(pipeline) < cached - 40
+    assert (loaded["Job Title"].astype(str) != "").all()
+
+def test_unloaded_chunks_are_left_out_of_reads(pipeline, tmp_path):
+    source = str(tmp_path / "jobs.csv")
+    generate_postings(50, seed=6).to_csv(source, index=False)
+    entry = pipeline.staging_cache.open(source, "settings")
+    entry.write_chunk(1, pipeline.clean_data(pd.read_csv(source)), 50)
+    entry.finish()
+    assert pipeline.staging_cache.read().empty
+
+    entry.mark_loaded(1, range(0, 50, 2))
+    assert sorted(pipeline.staging_cache.read(columns=["source_row"])["source_row"]) == list(range(0, 50, 2))
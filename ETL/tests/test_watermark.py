@@ -0,0 +1,112 @@
+# test_watermark.py
+import pandas as pd
+
+from bench_pipeline import make_etl
+from helpers.watermark import WatermarkStore
+from synthetic_data import generate_postings
+
+HEADER = "Job Title,Company Name\n"
+ROWS = "Accountant,ABA Bank\nDriver,Grab\n"
+COLUMNS = ["Job Title", "Company Name"]
+
+def write(path, text, mode="w"):
+    with open(path, mode, encoding="utf-8") as handle:
+        handle.write(text)
+
+def test_appended_rows_are_read_from_the_saved_offset(tmp_path):
+    source = str(tmp_path / "jobs.csv")
+    write(source, HEADER + ROWS)
+    store = WatermarkStore(str(tmp_path / "watermarks.json"))
+    plan = store.plan(source)
+    assert (plan.start, plan.end, plan.columns) == (0, len(HEADER + ROWS), None)
+    store.advance(source, plan.end, COLUMNS, None)
+    store.save()
+
+    # A row still being written is left for the next run
+    write(source, "Cashier,Chip Mong\nSales", mode="a")
+    plan = WatermarkStore(store.path).plan(source)
+    assert plan.start == len(HEADER + ROWS)
+    assert plan.end == plan.start + len("Cashier,Chip Mong\n")
+    assert plan.columns == COLUMNS and plan.loaded_until is None
+
+def test_rewritten_files_are_reread_past_the_loaded_timestamp(tmp_path):
+    source = str(tmp_path / "jobs.csv")
+    write(source, HEADER + ROWS)
+    store = WatermarkStore(str(tmp_path / "watermarks.json"))
+    store.advance(source, store.plan(source).end, COLUMNS, pd.Timestamp("2024-03-01 10:00"))
+    store.save()
+
+    write(source, HEADER + "Cashier,Chip Mong\n" + ROWS)
+    plan = WatermarkStore(store.path).plan(source)
+    assert plan.start == 0
+    assert str(plan.loaded_until) == "2024-03-01 10:00:00"
+
+def test_unsaved_marks_are_not_persisted(tmp_path):
+    source = str(tmp_path / "jobs.csv")
+    write(source, HEADER + ROWS)
+    store = WatermarkStore(str(tmp_path / "watermarks.json"))
+    store.advance(source, store.plan(source).end, COLUMNS, None)
+    assert store.pending(source)["offset"] == len(HEADER + ROWS)
+    assert WatermarkStore(store.path).plan(source).start == 0
+
+def test_appended_rows_are_numbered_as_in_the_whole_file(tmp_path):
+    source = str(tmp_path / "jobs.csv")
+    write(source, HEADER + ROWS)
+    store = WatermarkStore(str(tmp_path / "watermarks.json"))
+    plan = store.plan(source)
+    assert plan.start_row == 0
+    store.advance(source, plan.end, COLUMNS, None, rows=2)
+    store.save()
+    write(source, "Cashier,Chip Mong\n", mode="a")
+    assert WatermarkStore(store.path).plan(source).start_row == 2
+
+def test_marks_without_rows_count_the_lines(tmp_path):
+    source = str(tmp_path / "jobs.csv")
+    write(source, HEADER + ROWS)
+    store = WatermarkStore(str(tmp_path / "watermarks.json"))
+    store.advance(source, store.plan(source).end, COLUMNS, None)
+    store.save()
+    write(source, "Cashier,Chip Mong\n", mode="a")
+    assert WatermarkStore(store.path).plan(source).start_row == 2
+
+def read_posting_dates(source, watermarks):
+    etl = make_etl("sqlite", ":memory:")
+    etl.metrics = etl.new_instrumentation()
+    etl.staging_cache = None
+    etl.watermarks = watermarks
+    etl.config["etl"].update(streaming=True, batch_size=2, source_workers=1)
+    etl.config["etl"]["parallel"]["enabled"] = False
+    try:
+        chunks = [df_clean for _, _, df_clean, _ in etl.read_sources(source, [source])]
+    finally:
+        etl.connection.close()
+    return [str(date) for chunk in chunks for date in chunk["Posting Date"]]
+
+def test_a_sources_date_format_is_kept_across_chunks_and_runs(tmp_path):
+    source = str(tmp_path / "jobs.csv")
+    postings = generate_postings(4, seed=1)
+    postings["Posting Date"] = ["1/5/2026", "2/3/2026", "25/3/2026", "1/5/2026"]
+    postings.to_csv(source, index=False)
+    store = WatermarkStore(str(tmp_path / "watermarks.json"))
+    # The second chunk alone would be read day-first
+    assert read_posting_dates(source, store) == ["2026-01-05", "2026-02-03", "2026-03-25", "2026-01-05"]
+    store.save()
+
+    postings.iloc[2:].to_csv(source, mode="a", header=False, index=False)
+    assert read_posting_dates(source, WatermarkStore(store.path)) == ["2026-03-25", "2026-01-05"]
+
+def test_sources_without_a_timestamp_column_resume_from_the_offset(tmp_path, caplog):
+    source = str(tmp_path / "jobs.csv")
+    write(source, HEADER + ROWS)
+    etl = make_etl("sqlite", ":memory:")
+    etl.watermarks = WatermarkStore(str(tmp_path / "watermarks.json"))
+    try:
+        assert sum(len(chunk) for chunk in etl.extract(source)) == 2
+        assert "rewrite detection is disabled" in caplog.text
+        assert etl.watermarks.pending(source)["max_timestamp"] is None
+        etl.watermarks.save()
+        write(source, "Cashier,Chip Mong\n", mode="a")
+        chunks = list(etl.extract(source))
+    finally:
+        etl.connection.close()
+    assert [chunk["Job Title"].tolist() for chunk in chunks] == [["Cashier"]]